@@ -0,0 +1,106 @@
+"""
+Backend Benchmark
+
+Collects a synthetic fleet through each retrieval backend (SSH CLI, NETCONF,
+HTTP) against local stand-in servers, using the same FetchEngine and worker pool
+size as the collector, and reports throughput and per-device latency.
+
+Example:
+  python scripts/bench_backends.py --devices 500 --workers 32 --delay 0.05
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+# Add project root to sys.path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.config.schema import (  # noqa: E402
+    AppConfig,
+    BackendsConfig,
+    CollectorConfig,
+    HTTPConfig,
+    NetconfConfig,
+    SSHConfig,
+)
+from src.models.inventory import DeviceRecord  # noqa: E402
+from src.services.backends import FetchEngine  # noqa: E402
+from src.utils.standin_servers import (  # noqa: E402
+    StandinHTTPServer,
+    StandinSSHServer,
+)
+
+
+def _config_text(lines: int) -> str:
+    return "".join(
+        f"interface GigabitEthernet0/{i}\n description port {i}\n shutdown\n!\n"
+        for i in range(lines // 4)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Retrieval backend benchmark")
+    parser.add_argument("--devices", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--lines", type=int, default=2000, help="Config size")
+    parser.add_argument(
+        "--delay", type=float, default=0.0, help="Emulated device latency (s)"
+    )
+    args = parser.parse_args()
+
+    os.environ.setdefault("SSH_USERNAME", "admin")
+    os.environ.setdefault("SSH_PASSWORD", "admin")
+    text = _config_text(args.lines)
+    xml = f"<native>{text}</native>"
+
+    with (
+        StandinSSHServer({"show running-config": text}, xml, delay=args.delay) as ssh,
+        StandinHTTPServer({"/restconf/data": text}, delay=args.delay) as http,
+    ):
+        engine = FetchEngine(
+            AppConfig(
+                ssh=SSHConfig(port=ssh.port),
+                collector=CollectorConfig(workers=args.workers),
+                backends=BackendsConfig(
+                    by_type={"netconf": "netconf", "http": "http"},
+                    netconf=NetconfConfig(port=ssh.port),
+                    http=HTTPConfig(scheme="http", port=http.port),
+                ),
+            )
+        )
+        print(
+            f"{args.devices} devices, {len(text) / 1e3:.0f} kB config, "
+            f"{args.workers} workers, {args.delay * 1000:.0f} ms device latency"
+        )
+
+        for backend in ("ssh", "netconf", "http"):
+            devices = [
+                DeviceRecord(f"dev{i:05d}", ip="127.0.0.1", type=backend)
+                for i in range(args.devices)
+            ]
+            latencies: List[float] = []
+
+            def fetch(device: DeviceRecord) -> None:
+                started = time.perf_counter()
+                engine.fetch(device)
+                latencies.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.workers) as pool:
+                list(pool.map(fetch, devices))
+            elapsed = time.perf_counter() - started
+            print(
+                f"{backend:<8} {elapsed:6.2f}s  {args.devices / elapsed:7.1f} dev/s  "
+                f"p50 {statistics.median(latencies) * 1000:6.1f} ms  "
+                f"p95 {statistics.quantiles(latencies, n=20)[-1] * 1000:6.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
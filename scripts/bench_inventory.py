@@ -0,0 +1,87 @@
+"""
+Inventory Benchmark
+
+Compares load time and memory of the compact Inventory against a list of Pydantic
+Device models for a synthetic fleet. "Inventory (snapshot)" is the steady-state
+case where the parsed-inventory snapshot from a previous run is already on disk.
+
+Example:
+  python scripts/bench_inventory.py --devices 100000
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Tuple
+
+import yaml
+
+# Add project root to sys.path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.utils.device_loader import load_device_list, load_inventory  # noqa: E402
+
+
+def _write_fleet(path: Path, count: int) -> None:
+    devices = [
+        {
+            "hostname": f"dev{i:06d}.site{i % 300:03d}.example.net",
+            "ip": f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}",
+            "location": f"SITE{i % 300:03d}",
+            "type": ("core-router", "edge-router", "switch", "firewall")[i % 4],
+        }
+        for i in range(count)
+    ]
+    path.write_text(yaml.safe_dump({"devices": devices}, sort_keys=False))
+
+
+def _measure(loader: Callable[[str], Any], path: str) -> Tuple[float, int]:
+    # Time and memory are measured in separate passes: tracemalloc slows
+    # allocation-heavy code by an order of magnitude.
+    gc.collect()
+    start = time.perf_counter()
+    result = loader(path)
+    elapsed = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = loader(path)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inventory load benchmark")
+    parser.add_argument("--devices", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "devices.yaml"
+        _write_fleet(path, args.devices)
+        print(f"{args.devices} devices, {path.stat().st_size / 1e6:.1f} MB YAML")
+
+        cache_dir = str(Path(tmp) / "cache")
+        load_inventory(str(path), cache_dir=cache_dir)  # warm the snapshot
+
+        for name, loader in (
+            ("List[Device]", load_device_list),
+            ("Inventory", lambda p: load_inventory(p, cache_dir=None)),
+            ("Inventory (snapshot)", lambda p: load_inventory(p, cache_dir=cache_dir)),
+        ):
+            elapsed, retained = _measure(loader, str(path))
+            print(
+                f"{name:<21} load {elapsed:6.2f}s  "
+                f"retained {retained / 1e6:7.1f} MB  "
+                f"({retained / args.devices:.0f} B/device)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Profile Comparison
+
+Compares two `--profile` results (directories under report_dir, or .pstats
+files) and prints the functions whose self time changed most, plus the sample
+share of each thread group.
+
+Example:
+  python scripts/compare_profiles.py reports/run_A.profile reports/run_B.profile
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict
+
+# Add project root to sys.path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.utils.profiler import compare_profiles  # noqa: E402
+
+
+def _thread_shares(path: str) -> Dict[str, float]:
+    meta = Path(path) / "profile.json"
+    if not meta.is_file():
+        return {}
+    samples: Dict[str, int] = json.loads(meta.read_text())["samples"]
+    total = sum(samples.values()) or 1
+    return {group: count / total for group, count in samples.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two run profiles")
+    parser.add_argument("before", help="Baseline profile directory or .pstats file")
+    parser.add_argument("after", help="New profile directory or .pstats file")
+    parser.add_argument("--top", type=int, default=20, help="Functions to show")
+    args = parser.parse_args()
+
+    print(f"{'before':>10} {'after':>10} {'delta':>10}  self time (s)")
+    for row in compare_profiles(args.before, args.after, args.top):
+        print(
+            f"{row.before.self_s:10.3f} {row.after.self_s:10.3f} "
+            f"{row.delta_s:+10.3f}  {row.function}"
+        )
+
+    before, after = _thread_shares(args.before), _thread_shares(args.after)
+    if before or after:
+        print(f"\n{'before':>10} {'after':>10}  thread group (share of samples)")
+        for group in sorted(set(before) | set(after)):
+            print(f"{before.get(group, 0):10.1%} {after.get(group, 0):10.1%}  {group}")
+
+
+if __name__ == "__main__":
+    main()
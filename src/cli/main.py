@@ -16,12 +16,26 @@ Dependencies:
 Notes:
   - Use --devices-file to provide the input device list (YAML format).
   - Use --diagnose to run validation checks without making SSH connections.
+  - Use --preflight to probe every device (DNS, TCP, SSH banner/KEX, and with
+    --auth-probe, login) in parallel and print a readiness table.
+  - Use --compact to apply retention and pack old months into archives
+    (incremental; bound each pass with --max-months).
+  - Use --catalog-sync, --snapshot DATE, or --history HOST to maintain and query
+    the config catalog.
+  - Use --profile [sample|trace] to profile a collection run; results are saved
+    next to the run report.
+  - Use --run-job JOBFILE to run a command job (show commands / config snippets
+    per device type) on the inventory; --canary N overrides its canary size.
+  - Use --record FILE to save every device's fetch result and timing, and
+    --replay FILE [--replay-speed X] to run the pipeline on a recording offline
+    (--devices-file is optional with --replay; it then replays every device;
+    --record cannot be combined with it).
+  - Service modules are imported inside main() only after argument parsing, so
+    `--help` and argument errors never pay for pydantic, paramiko, or logging setup.
 """
 
 import argparse
 
-from src.services.ssh_collector import collect_device_configs, run_diagnostics
-
 
 def parse_args() -> argparse.Namespace:
     """
@@ -34,7 +48,6 @@ def parse_args() -> argparse.Namespace:
 
     parser.add_argument(
         "--devices-file",
-        required=True,
         help="Path to the YAML file containing the list of devices",
     )
     parser.add_argument(
@@ -47,21 +60,163 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Validate environment, config, and device file (no SSH execution)",
     )
+    parser.add_argument(
+        "--preflight",
+        action="store_true",
+        help="Probe DNS, TCP, and SSH banner/KEX for every device in parallel",
+    )
+    parser.add_argument(
+        "--auth-probe",
+        action="store_true",
+        help="With --preflight: also authenticate (no commands are run)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="sample",
+        choices=("sample", "trace"),
+        help="Profile the collection run (default: sample; trace = cProfile)",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="FILE",
+        help="Record every device's fetch result and timing to a capture file",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="FILE",
+        help="Replay a capture file through the pipeline instead of using SSH",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=None,
+        help="With --replay: 1.0 = recorded timing, 2.0 = twice as fast "
+        "(default: no delays)",
+    )
+    parser.add_argument(
+        "--run-job",
+        metavar="JOBFILE",
+        help="Run a command job (YAML) on every device, canary devices first",
+    )
+    parser.add_argument(
+        "--canary",
+        type=int,
+        default=None,
+        help="With --run-job: number of canary devices (overrides the job file)",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Apply retention and archive old months in the output directory",
+    )
+    parser.add_argument(
+        "--max-months",
+        type=int,
+        default=None,
+        help="With --compact: archive at most this many months in this pass",
+    )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--catalog-sync",
+        action="store_true",
+        help="Reconcile the config catalog with the output directory",
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="DATE",
+        help="Print every device's newest config on or before DATE (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--history",
+        metavar="HOSTNAME",
+        help="Print the newest catalogued configs of one device",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="With --history: number of versions to print",
+    )
+
+    args = parser.parse_args()
+    catalog_mode = args.catalog_sync or args.snapshot or args.history
+    if args.replay and (args.preflight or args.run_job or args.diagnose):
+        parser.error(
+            "--replay cannot be used with --preflight, --run-job or --diagnose"
+        )
+    if args.replay and args.record:
+        parser.error("--record cannot be used with --replay")
+    needs_devices = not (args.compact or catalog_mode or args.replay)
+    if needs_devices and not args.devices_file:
+        parser.error("--devices-file is required")
+    return args
 
 
 def main() -> None:
     """
-    Main CLI dispatcher that invokes diagnostics or config collection based on arguments.
+    Main CLI dispatcher that invokes diagnostics or config collection based on
+    arguments.
     """
     args = parse_args()
 
+    # Deferred imports: keep `--help` and argument errors free of service imports.
+    if args.compact:
+        from src.services import retention
+
+        retention.run_compaction(max_months=args.max_months, dry_run=args.dry_run)
+        return
+
+    if args.catalog_sync or args.snapshot or args.history:
+        from src.services import catalog
+
+        catalog.run_catalog(
+            sync=args.catalog_sync,
+            snapshot=args.snapshot,
+            history=args.history,
+            limit=args.limit,
+        )
+        return
+
+    if args.run_job:
+        from src.services import command_jobs
+
+        command_jobs.run_job(
+            job_file=args.run_job,
+            devices_file=args.devices_file,
+            canary=args.canary,
+            dry_run=args.dry_run,
+        )
+        return
+
+    if args.preflight:
+        from src.services import preflight
+
+        preflight.run_preflight(devices_file=args.devices_file, auth=args.auth_probe)
+        return
+
+    from src.services import ssh_collector
+
     if args.diagnose:
-        run_diagnostics(devices_file=args.devices_file)
+        ssh_collector.run_diagnostics(devices_file=args.devices_file)
+    elif args.profile:
+        from src.services import profiling
+
+        profiling.run_profiled(
+            devices_file=args.devices_file,
+            dry_run=args.dry_run,
+            mode=args.profile,
+            record=args.record,
+            replay=args.replay,
+            replay_speed=args.replay_speed,
+        )
     else:
-        collect_device_configs(
-            devices_file_path=args.devices_file, dry_run=args.dry_run
+        ssh_collector.collect_device_configs(
+            devices_file_path=args.devices_file,
+            dry_run=args.dry_run,
+            record=args.record,
+            replay=args.replay,
+            replay_speed=args.replay_speed,
         )
 
 
@@ -5,6 +5,21 @@ Defines the Pydantic schema used to validate and structure values loaded from se
 
 Contents:
   - SSHConfig: SSH-specific parameters.
+  - NetconfConfig: NETCONF-over-SSH backend parameters.
+  - HTTPConfig: HTTP/REST backend parameters.
+  - BackendsConfig: Per-device-type backend selection.
+  - CollectorConfig: Collection concurrency and retry settings.
+  - WriterConfig: Output writer durability and bundling settings.
+  - ComplianceConfig: Post-collection policy stage settings.
+  - RetentionConfig: Grandfather-father-son retention policy.
+  - StorageConfig: Output layout, archive location, and retention.
+  - CatalogConfig: Persistent index of stored configs.
+  - PreflightConfig: Parallel pre-flight reachability checks.
+  - EventSinkConfig: One per-device event delivery target.
+  - EventsConfig: Per-device event stream settings.
+  - ProfilingConfig: `--profile` sampling and reporting settings.
+  - JobsConfig: Command job output settings.
+  - CoordinatorConfig: Cross-job fetch sharing and concurrency caps.
   - AppConfig: Root container for application settings.
 
 Dependencies:
@@ -15,6 +30,8 @@ Notes:
   - Used by config.py to construct validated settings from YAML input.
 """
 
+from typing import Dict, List, Literal, Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -25,12 +42,353 @@ class SSHConfig(BaseModel):
     Attributes:
       timeout (int): SSH connection timeout in seconds.
       command (str): Command to run on the remote device.
+      port (int): SSH port.
     """
 
     timeout: int = Field(default=10, description="SSH connection timeout in seconds")
     command: str = Field(
         default="show running-config", description="Command to run on remote host"
     )
+    port: int = Field(default=22, ge=1, le=65535, description="SSH port")
+
+
+class NetconfConfig(BaseModel):
+    """
+    Schema for the NETCONF-over-SSH backend.
+
+    Attributes:
+      port (int): NETCONF SSH port.
+      timeout (float): Connect and read timeout in seconds.
+      source (str): Datastore to read.
+    """
+
+    port: int = Field(default=830, ge=1, le=65535, description="NETCONF SSH port")
+    timeout: float = Field(default=30, gt=0, description="Timeout in seconds")
+    source: str = Field(default="running", description="Datastore to read")
+
+
+class HTTPConfig(BaseModel):
+    """
+    Schema for the HTTP/REST (e.g. RESTCONF) backend.
+
+    Attributes:
+      scheme (str): "https" or "http".
+      port (Optional[int]): Port (default: scheme default).
+      path (str): Path returning the full configuration.
+      accept (str): Accept header.
+      verify_tls (bool): Verify server certificates.
+      timeout (float): Connect and read timeout in seconds.
+    """
+
+    scheme: Literal["https", "http"] = Field(default="https", description="Scheme")
+    port: Optional[int] = Field(default=None, ge=1, le=65535, description="Port")
+    path: str = Field(default="/restconf/data", description="Config resource path")
+    accept: str = Field(
+        default="application/yang-data+json", description="Accept header"
+    )
+    verify_tls: bool = Field(default=True, description="Verify TLS certificates")
+    timeout: float = Field(default=30, gt=0, description="Timeout in seconds")
+
+
+class BackendsConfig(BaseModel):
+    """
+    Schema for selecting the retrieval backend per device type.
+
+    Attributes:
+      default (str): Backend for devices whose type is not listed.
+      by_type (Dict[str, str]): Device.type -> "ssh", "netconf", or "http".
+      netconf (NetconfConfig): NETCONF backend settings.
+      http (HTTPConfig): HTTP backend settings.
+    """
+
+    default: Literal["ssh", "netconf", "http"] = Field(
+        default="ssh", description="Backend for unlisted device types"
+    )
+    by_type: Dict[str, Literal["ssh", "netconf", "http"]] = Field(
+        default_factory=dict, description="Backend per device type"
+    )
+    netconf: NetconfConfig = Field(
+        default_factory=NetconfConfig, description="NETCONF backend block"
+    )
+    http: HTTPConfig = Field(
+        default_factory=HTTPConfig, description="HTTP backend block"
+    )
+
+
+class CollectorConfig(BaseModel):
+    """
+    Schema for collection concurrency and retry settings.
+
+    Attributes:
+      workers (int): Number of devices collected in parallel.
+      retries (int): Attempts per device, including the first.
+      retry_wait_min (float): Minimum backoff between attempts, in seconds.
+      retry_wait_max (float): Maximum backoff between attempts, in seconds.
+      max_rate (Optional[float]): Most connection attempts per second across all
+        workers (None for no limit).
+    """
+
+    workers: int = Field(
+        default=8, ge=1, description="Number of devices collected in parallel"
+    )
+    retries: int = Field(default=3, ge=1, description="Attempts per device")
+    retry_wait_min: float = Field(default=2, ge=0, description="Min backoff (s)")
+    retry_wait_max: float = Field(default=10, ge=0, description="Max backoff (s)")
+    max_rate: Optional[float] = Field(
+        default=None, gt=0, description="Connection attempts per second"
+    )
+
+
+class InventoryConfig(BaseModel):
+    """
+    Schema for loading the device inventory.
+
+    Attributes:
+      cache_dir (Optional[str]): Directory for parsed-inventory snapshots, keyed
+        by the YAML's content hash (None: always parse the YAML).
+    """
+
+    cache_dir: Optional[str] = Field(
+        default=None, description="Parsed inventory cache (None: disabled)"
+    )
+
+
+class WriterConfig(BaseModel):
+    """
+    Schema for the output writer stage.
+
+    Attributes:
+      fsync (bool): Flush configs and directory entries to stable storage.
+      batch_size (int): Maximum configs written per directory fsync.
+      queue_size (int): Completed configs allowed to wait for the writer.
+      bundle (Optional[str]): Write each run into one "tar" or "zip" archive.
+      fsync_workers (int): File fsyncs run concurrently within a batch.
+    """
+
+    fsync: bool = Field(default=True, description="fsync files and directories")
+    batch_size: int = Field(
+        default=64, ge=1, description="Maximum configs written per directory fsync"
+    )
+    queue_size: int = Field(
+        default=256, ge=1, description="Completed configs waiting for the writer"
+    )
+    bundle: Optional[Literal["tar", "zip"]] = Field(
+        default=None, description="Bundle each run into one archive file"
+    )
+    fsync_workers: int = Field(
+        default=8, ge=1, description="Concurrent file fsyncs per batch"
+    )
+
+
+class ComplianceConfig(BaseModel):
+    """
+    Schema for the post-collection compliance stage.
+
+    Attributes:
+      enabled (bool): Evaluate rules after each collection run.
+      rules_file (str): YAML file with a top-level `rules:` list.
+      cache_dir (str): Directory for results cached by config hash.
+      workers (Optional[int]): Evaluation processes (default: CPU count).
+      cache_max_entries (int): Cached config hashes kept (least recently used
+        are dropped).
+    """
+
+    enabled: bool = Field(default=False, description="Run the compliance stage")
+    rules_file: str = Field(
+        default="src/config/compliance.yaml", description="Compliance rules YAML"
+    )
+    cache_dir: str = Field(
+        default=".cache/compliance", description="Compliance result cache"
+    )
+    workers: Optional[int] = Field(
+        default=None, ge=1, description="Evaluation processes (default: CPU count)"
+    )
+    cache_max_entries: int = Field(
+        default=100_000, ge=1, description="Cached config hashes kept (LRU)"
+    )
+
+
+class RetentionConfig(BaseModel):
+    """
+    Schema for the retention policy applied per device.
+
+    Attributes:
+      keep_daily_days (int): Keep every config younger than this many days.
+      keep_weekly_weeks (int): Then keep the newest config per ISO week for this
+        many weeks.
+      keep_monthly_months (Optional[int]): Then keep the newest config per month
+        for this many months (None keeps monthly configs forever).
+    """
+
+    keep_daily_days: int = Field(default=30, ge=1, description="Daily window (days)")
+    keep_weekly_weeks: int = Field(
+        default=52, ge=0, description="Weekly window (weeks)"
+    )
+    keep_monthly_months: Optional[int] = Field(
+        default=None, ge=0, description="Monthly window (months, None = forever)"
+    )
+
+
+class StorageConfig(BaseModel):
+    """
+    Schema for the on-disk layout of collected configs.
+
+    Attributes:
+      layout (str): "flat", "date" (YYYY/MM/DD/), or "host" (<hash>/<hostname>/).
+      archive_dir (str): Monthly archive directory, relative to output_dir.
+      compress_level (int): Deflate level used for monthly archives.
+      retention (RetentionConfig): Retention policy.
+    """
+
+    layout: Literal["flat", "date", "host"] = Field(
+        default="flat", description="Output directory sharding scheme"
+    )
+    archive_dir: str = Field(
+        default="archive", description="Monthly archive directory under output_dir"
+    )
+    compress_level: int = Field(
+        default=6, ge=0, le=9, description="Deflate level for monthly archives"
+    )
+    retention: RetentionConfig = Field(
+        default_factory=RetentionConfig, description="Retention policy"
+    )
+
+
+class CatalogConfig(BaseModel):
+    """
+    Schema for the SQLite catalog of stored configs.
+
+    Attributes:
+      enabled (bool): Record each run's configs in the catalog.
+      path (str): Catalog database file.
+    """
+
+    enabled: bool = Field(default=False, description="Catalog each run's configs")
+    path: str = Field(
+        default="reports/catalog.sqlite3", description="Catalog database file"
+    )
+
+
+class PreflightConfig(BaseModel):
+    """
+    Schema for the parallel pre-flight checks.
+
+    Attributes:
+      workers (int): Devices probed concurrently.
+      timeout (float): Per-stage timeout in seconds.
+      port (Optional[int]): Port override (default: the port of the device's
+        retrieval backend, as the collector connects).
+      kex (bool): Complete SSH key exchange, not just read the banner.
+      auth (bool): Also run the auth-only probe (same as `--auth-probe`).
+    """
+
+    workers: int = Field(default=256, ge=1, description="Concurrent probes")
+    timeout: float = Field(default=3.0, gt=0, description="Per-stage timeout (s)")
+    port: Optional[int] = Field(
+        default=None, ge=1, le=65535, description="Port override"
+    )
+    kex: bool = Field(default=True, description="Run SSH key exchange")
+    auth: bool = Field(default=False, description="Run the auth-only probe")
+
+
+class EventSinkConfig(BaseModel):
+    """
+    Schema for one per-device event delivery target.
+
+    Attributes:
+      type (str): "jsonl" (file), "unix" (Unix stream socket), or "webhook" (HTTP POST).
+      target (str): File path, socket path, or URL.
+      timeout (float): Connect/send timeout in seconds (unix and webhook).
+    """
+
+    type: Literal["jsonl", "unix", "webhook"] = Field(..., description="Sink type")
+    target: str = Field(..., description="File path, socket path, or URL")
+    timeout: float = Field(default=5.0, gt=0, description="Send timeout (s)")
+
+
+class EventsConfig(BaseModel):
+    """
+    Schema for the per-device event stream.
+
+    Attributes:
+      enabled (bool): Emit an event as each device completes.
+      buffer_size (int): Events held for delivery before new ones are dropped.
+      batch_size (int): Most events handed to a sink per send.
+      diff_lines (int): Unified diff lines (and changed sections) included in
+        `changed` events.
+      parse_cache_dir (Optional[str]): Cache of parsed configs used to find
+        changed sections (None: no cache).
+      on_replay (bool): Also emit events for `--replay` runs.
+      sinks (List[EventSinkConfig]): Delivery targets.
+    """
+
+    enabled: bool = Field(default=False, description="Emit per-device events")
+    buffer_size: int = Field(default=4096, ge=1, description="Pending event limit")
+    batch_size: int = Field(default=256, ge=1, description="Events per sink send")
+    diff_lines: int = Field(default=20, ge=0, description="Diff lines per event")
+    parse_cache_dir: Optional[str] = Field(
+        default=".cache/parse", description="Parsed config cache (None: disabled)"
+    )
+    on_replay: bool = Field(default=False, description="Emit events on replays")
+    sinks: List[EventSinkConfig] = Field(
+        default_factory=list, description="Delivery targets"
+    )
+
+
+class ProfilingConfig(BaseModel):
+    """
+    Schema for `--profile` runs.
+
+    Attributes:
+      interval (float): Stack sampling interval in seconds.
+      top (int): Hotspots logged at the end of a profiled run.
+    """
+
+    interval: float = Field(default=0.005, gt=0, description="Sampling interval (s)")
+    top: int = Field(default=15, ge=0, description="Hotspots logged per run")
+
+
+class JobsConfig(BaseModel):
+    """
+    Schema for command jobs (`--run-job`).
+
+    Attributes:
+      output_dir (str): Root directory for job outputs (one subdirectory per job).
+    """
+
+    output_dir: str = Field(default="jobs", description="Job output root")
+
+
+class CoordinatorConfig(BaseModel):
+    """
+    Schema for coordinating collection jobs that overlap on one host.
+
+    Attributes:
+      enabled (bool): Route every fetch through the shared job coordinator.
+      path (str): Shared state file, common to all jobs.
+      max_devices (int): Fetches in flight across all jobs.
+      max_per_site (Optional[int]): Fetches in flight per location (None: no cap).
+      share_seconds (float): How long a finished fetch is reused by other jobs.
+      poll_interval (float): Seconds between checks while waiting for a slot.
+      wait_timeout (float): Longest a device waits for a slot or for another
+        job's fetch before it fails.
+    """
+
+    enabled: bool = Field(default=False, description="Coordinate overlapping jobs")
+    path: str = Field(
+        default="reports/coordinator.sqlite3", description="Shared state file"
+    )
+    max_devices: int = Field(default=32, ge=1, description="Global in-flight cap")
+    max_per_site: Optional[int] = Field(
+        default=None, ge=1, description="In-flight cap per location"
+    )
+    share_seconds: float = Field(
+        default=60, ge=0, description="Result reuse window (s)"
+    )
+    poll_interval: float = Field(default=0.05, gt=0, description="Wait poll (s)")
+    wait_timeout: float = Field(
+        default=600, gt=0, description="Longest wait per device (s)"
+    )
 
 
 class AppConfig(BaseModel):
@@ -40,11 +398,63 @@ class AppConfig(BaseModel):
     Attributes:
       env (str): Runtime environment (e.g., dev, prod).
       output_dir (str): Directory to save collected .cfg files.
+      report_dir (str): Directory to save per-run reports (.json.gz).
       ssh (SSHConfig): Nested SSH configuration block.
+      collector (CollectorConfig): Collection concurrency block.
+      inventory (InventoryConfig): Inventory loading block.
+      writer (WriterConfig): Output writer block.
+      compliance (ComplianceConfig): Compliance stage block.
+      storage (StorageConfig): Output layout and retention block.
+      catalog (CatalogConfig): Config catalog block.
+      preflight (PreflightConfig): Pre-flight checks block.
+      backends (BackendsConfig): Retrieval backend selection block.
+      events (EventsConfig): Per-device event stream block.
+      profiling (ProfilingConfig): Profiler block.
+      jobs (JobsConfig): Command job block.
+      coordinator (CoordinatorConfig): Overlapping job coordination block.
     """
 
     env: str = Field(default="dev", description="Application environment")
     output_dir: str = Field(
         default="configs", description="Directory to save .cfg files"
     )
+    report_dir: str = Field(
+        default="reports", description="Directory to save per-run reports"
+    )
     ssh: SSHConfig = Field(..., description="SSH connection config block")
+    collector: CollectorConfig = Field(
+        default_factory=CollectorConfig, description="Collection concurrency block"
+    )
+    inventory: InventoryConfig = Field(
+        default_factory=InventoryConfig, description="Inventory loading block"
+    )
+    writer: WriterConfig = Field(
+        default_factory=WriterConfig, description="Output writer block"
+    )
+    compliance: ComplianceConfig = Field(
+        default_factory=ComplianceConfig, description="Compliance stage block"
+    )
+    storage: StorageConfig = Field(
+        default_factory=StorageConfig, description="Output layout and retention"
+    )
+    catalog: CatalogConfig = Field(
+        default_factory=CatalogConfig, description="Config catalog block"
+    )
+    preflight: PreflightConfig = Field(
+        default_factory=PreflightConfig, description="Pre-flight checks block"
+    )
+    backends: BackendsConfig = Field(
+        default_factory=BackendsConfig, description="Retrieval backend block"
+    )
+    events: EventsConfig = Field(
+        default_factory=EventsConfig, description="Per-device event stream block"
+    )
+    profiling: ProfilingConfig = Field(
+        default_factory=ProfilingConfig, description="Profiler block"
+    )
+    jobs: JobsConfig = Field(
+        default_factory=JobsConfig, description="Command job block"
+    )
+    coordinator: CoordinatorConfig = Field(
+        default_factory=CoordinatorConfig, description="Job coordination block"
+    )
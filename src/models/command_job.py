@@ -0,0 +1,124 @@
+"""
+Command Job Model
+
+Defines the schema for command jobs declared in YAML: which commands (and config
+snippets) to run on which device types, and how to stage the rollout.
+
+Contents:
+  - CommandSet: Exec commands and an optional config snippet.
+  - CommandJob: One job definition.
+  - load_job(): Reads and validates a job file.
+
+Dependencies:
+  - pydantic.BaseModel
+  - yaml
+
+Notes:
+  - Devices use `by_type[device.type]`, falling back to `default`; devices with
+    neither are skipped.
+  - The first `canary` devices run first; the rest start only if at most
+    `canary_max_failures` of them failed.
+  - Devices rarely report a useful exit status (IOS exec returns 0 on
+    `% Invalid input`, config sessions often none), so a command also fails
+    when any line of its output matches one of `error_patterns`.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern
+
+import yaml
+from pydantic import BaseModel, Field, field_validator
+
+# IOS-style rejections of a command or config line.
+DEFAULT_ERROR_PATTERNS = [r"^\s*%\s*(Invalid|Incomplete|Ambiguous)"]
+
+
+class CommandSet(BaseModel):
+    """
+    Commands for one device type.
+
+    Args:
+      commands (List[str]): Exec commands, run in order on separate channels.
+      config (List[str]): Config snippet typed into one interactive session
+        after the commands (include the enter/leave config mode lines). It is
+        re-sent in full if the attempt is retried, so keep it idempotent.
+    """
+
+    commands: List[str] = Field(default_factory=list)
+    config: List[str] = Field(default_factory=list)
+
+
+class CommandJob(BaseModel):
+    """
+    Represents a command job file.
+
+    Args:
+      name (str): Job name (letters, digits, '.', '_', '-'); used for the output
+        directory and run id.
+      default (Optional[CommandSet]): Commands for types not in `by_type`.
+      by_type (Dict[str, CommandSet]): Commands per Device.type.
+      canary (int): Devices run first, before the rest of the fleet.
+      canary_max_failures (int): Canary failures tolerated before aborting.
+      timeout (float): Read timeout per command or config session, in seconds.
+      error_patterns (List[str]): Regexes matched against each output line; a
+        match fails the command (and the device). Empty: exit status only.
+    """
+
+    name: str = Field(..., pattern=r"^[\w.-]+$")
+    default: Optional[CommandSet] = None
+    by_type: Dict[str, CommandSet] = Field(default_factory=dict)
+    canary: int = Field(default=0, ge=0)
+    canary_max_failures: int = Field(default=0, ge=0)
+    timeout: float = Field(default=60, gt=0)
+    error_patterns: List[str] = Field(
+        default_factory=lambda: list(DEFAULT_ERROR_PATTERNS)
+    )
+
+    @field_validator("error_patterns")
+    @classmethod
+    def _compiles(cls, patterns: List[str]) -> List[str]:
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+            except re.error as exc:
+                raise ValueError(f"Invalid error pattern {pattern!r}: {exc}") from exc
+        return patterns
+
+    def error_regex(self) -> Optional[Pattern[str]]:
+        """
+        Returns one multi-line regex matching any error pattern, or None.
+        """
+        if not self.error_patterns:
+            return None
+        return re.compile(
+            "|".join(f"(?:{pattern})" for pattern in self.error_patterns), re.M
+        )
+
+    def command_set(self, device_type: Optional[str]) -> Optional[CommandSet]:
+        """
+        Returns the commands for a device type, or None if it has none.
+        """
+        return self.by_type.get(device_type or "", self.default)
+
+
+def load_job(yaml_path: str) -> CommandJob:
+    """
+    Loads a command job from YAML.
+
+    Args:
+      yaml_path (str): Path to the job file.
+
+    Returns:
+      CommandJob: Validated job.
+
+    Raises:
+      FileNotFoundError: If the file does not exist.
+      ValidationError: If the job fails validation.
+    """
+    file_path = Path(yaml_path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"Job file not found: {yaml_path}")
+    with file_path.open("r") as f:
+        raw = yaml.safe_load(f) or {}
+    return CommandJob(**raw)
@@ -0,0 +1,62 @@
+"""
+Compliance Model
+
+Defines the schema for compliance rules declared in YAML and the violations they
+produce.
+
+Contents:
+  - ComplianceRule: One required/forbidden line or per-block policy check.
+  - Violation: A single rule violation found in a config.
+
+Dependencies:
+  - pydantic.BaseModel
+  - typing
+
+Notes:
+  - Patterns are Python regular expressions applied to one config line at a time.
+    Inline flags such as "(?i)" are allowed only at the start of a pattern.
+  - A rule with `block` set applies only inside top-level blocks (e.g. `interface ...`)
+    whose header line matches `block`; `pattern` is then matched against the
+    indented child lines of each such block.
+"""
+
+from typing import Literal, NamedTuple, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ComplianceRule(BaseModel):
+    """
+    Represents a single compliance rule from the rules YAML.
+
+    Args:
+      id (str): Unique rule identifier reported in violations.
+      description (str): Human-readable explanation of the policy.
+      kind (str): "required" (must match) or "forbidden" (must not match).
+      pattern (str): Regex matched against individual config lines.
+      block (Optional[str]): Regex selecting block header lines; scopes the rule
+        to the child lines of every matching block.
+      ignore_case (bool): Match `pattern` and `block` case-insensitively.
+    """
+
+    id: str
+    description: str = ""
+    kind: Literal["required", "forbidden"]
+    pattern: str
+    block: Optional[str] = None
+    ignore_case: bool = Field(default=False)
+
+
+class Violation(NamedTuple):
+    """
+    A single compliance violation.
+
+    Attributes:
+      rule_id (str): Violated rule.
+      block (Optional[str]): Header of the offending block, for block rules.
+      line (Optional[str]): Offending line, for forbidden rules.
+    """
+
+    rule_id: str
+    block: Optional[str] = None
+    line: Optional[str] = None
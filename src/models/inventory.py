@@ -0,0 +1,236 @@
+"""
+Inventory Model
+
+Defines a memory-compact, column-oriented store for large device inventories.
+
+Contents:
+  - DeviceRecord: Lightweight tuple view of one device.
+  - Inventory: Columnar device store with bulk validation and a Device view.
+
+Dependencies:
+  - array
+  - pydantic.TypeAdapter
+  - src.models.device_model.Device
+
+Notes:
+  - Hostnames and IPs are kept as plain lists; `location` and `type` are interned
+    into small value tables and stored as one unsigned int code per device
+    (`array('I')`, 4 bytes per device) instead of one Pydantic model (and its
+    __dict__) per device.
+  - Entries are validated in one TypeAdapter call over the whole list (pydantic-core,
+    in Rust) with the same field rules as `Device`, rather than one model per entry.
+  - Iteration yields DeviceRecord tuples exposing the same attribute names as
+    `Device`, so service code can consume either.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from typing_extensions import NotRequired, TypedDict
+
+from src.models.device_model import Device
+
+
+class DeviceRecord(NamedTuple):
+    """
+    Read-only, tuple-backed view of one inventory entry.
+
+    Attributes mirror `Device`: hostname, ip, location, type.
+    """
+
+    hostname: str
+    ip: Optional[str] = None
+    location: Optional[str] = None
+    type: Optional[str] = None
+
+
+class _DeviceEntry(TypedDict):
+    hostname: str
+    ip: NotRequired[Optional[str]]
+    location: NotRequired[Optional[str]]
+    type: NotRequired[Optional[str]]
+
+
+_entries_adapter: Any = None
+
+
+def _validate_entries(entries: Sequence[Dict[str, Any]]) -> List[_DeviceEntry]:
+    """
+    Validates all raw entries in a single pydantic-core call.
+
+    Raises:
+      ValidationError: If any entry fails validation (errors carry the list index).
+    """
+    global _entries_adapter
+    if _entries_adapter is None:
+        from pydantic import TypeAdapter
+
+        _entries_adapter = TypeAdapter(List[_DeviceEntry])
+    validated: List[_DeviceEntry] = _entries_adapter.validate_python(entries)
+    return validated
+
+
+class _Interned:
+    """
+    Value table for a low-cardinality string column.
+    """
+
+    __slots__ = ("values", "_lookup")
+
+    def __init__(self) -> None:
+        self.values: List[Optional[str]] = [None]
+        self._lookup: Dict[Optional[str], int] = {None: 0}
+
+    def code(self, value: Optional[str]) -> int:
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class Inventory:
+    """
+    Columnar inventory of devices.
+
+    Example:
+      inventory = Inventory.from_entries([{"hostname": "r1", "type": "core"}])
+      for device in inventory:          # DeviceRecord
+          print(device.hostname, device.type)
+      inventory.device(0)                # Device (Pydantic) view
+    """
+
+    __slots__ = (
+        "hostnames",
+        "ips",
+        "_locations",
+        "_types",
+        "_loc_codes",
+        "_type_codes",
+    )
+
+    def __init__(self) -> None:
+        self.hostnames: List[str] = []
+        self.ips: List[Optional[str]] = []
+        self._locations = _Interned()
+        self._types = _Interned()
+        self._loc_codes = array("I")
+        self._type_codes = array("I")
+
+    @classmethod
+    def from_entries(cls, entries: Sequence[Dict[str, Any]]) -> "Inventory":
+        """
+        Builds an inventory from raw YAML entries after bulk validation.
+
+        Args:
+          entries (Sequence[Dict[str, Any]]): Raw `devices:` list items.
+
+        Returns:
+          Inventory: The validated inventory.
+
+        Raises:
+          ValidationError: If any entry fails validation.
+        """
+        inventory = cls()
+        for entry in _validate_entries(entries):
+            inventory.append(
+                entry["hostname"],
+                entry.get("ip"),
+                entry.get("location"),
+                entry.get("type"),
+            )
+        return inventory
+
+    def append(
+        self,
+        hostname: str,
+        ip: Optional[str] = None,
+        location: Optional[str] = None,
+        type: Optional[str] = None,
+    ) -> None:
+        """
+        Adds one (already validated) device.
+        """
+        self.hostnames.append(hostname)
+        self.ips.append(ip)
+        self._loc_codes.append(self._locations.code(location))
+        self._type_codes.append(self._types.code(type))
+
+    def __len__(self) -> int:
+        return len(self.hostnames)
+
+    def __getitem__(self, index: int) -> DeviceRecord:
+        return DeviceRecord(
+            self.hostnames[index],
+            self.ips[index],
+            self._locations.values[self._loc_codes[index]],
+            self._types.values[self._type_codes[index]],
+        )
+
+    def __iter__(self) -> Iterator[DeviceRecord]:
+        locations = self._locations.values
+        types = self._types.values
+        for hostname, ip, loc, typ in zip(
+            self.hostnames, self.ips, self._loc_codes, self._type_codes
+        ):
+            yield DeviceRecord(hostname, ip, locations[loc], types[typ])
+
+    @property
+    def locations(self) -> List[str]:
+        """
+        Distinct non-empty locations in the inventory.
+        """
+        return [v for v in self._locations.values if v is not None]
+
+    @property
+    def types(self) -> List[str]:
+        """
+        Distinct non-empty device types in the inventory.
+        """
+        return [v for v in self._types.values if v is not None]
+
+    def to_columns(self) -> Dict[str, Any]:
+        """
+        Returns the inventory as builtin-typed columns (marshal/JSON friendly).
+        """
+        return {
+            "hostnames": self.hostnames,
+            "ips": self.ips,
+            "locations": self._locations.values,
+            "types": self._types.values,
+            "location_codes": self._loc_codes.tobytes(),
+            "type_codes": self._type_codes.tobytes(),
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Any]) -> "Inventory":
+        """
+        Rebuilds an inventory from `to_columns()` output without re-validation.
+        """
+        inventory = cls()
+        inventory.hostnames = columns["hostnames"]
+        inventory.ips = columns["ips"]
+        for table, values in (
+            (inventory._locations, columns["locations"]),
+            (inventory._types, columns["types"]),
+        ):
+            table.values = values
+            table._lookup = {v: i for i, v in enumerate(values)}
+        inventory._loc_codes.frombytes(columns["location_codes"])
+        inventory._type_codes.frombytes(columns["type_codes"])
+        return inventory
+
+    def device(self, index: int) -> Device:
+        """
+        Returns the Pydantic `Device` view of one entry (API compatibility).
+        """
+        return Device(**self[index]._asdict())
+
+    def devices(self) -> List[Device]:
+        """
+        Materializes every entry as a `Device` model.
+
+        Notes:
+          - Costs one Pydantic object per device; prefer iterating the inventory.
+        """
+        return [Device(**record._asdict()) for record in self]
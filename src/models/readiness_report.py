@@ -0,0 +1,212 @@
+"""
+Readiness Report Model
+
+Defines the per-device result table produced by the pre-flight checks.
+
+Contents:
+  - ProbeStage: Names of the pre-flight stages, in execution order.
+  - DeviceReadiness: Outcome of all stages for one device.
+  - ReadinessReport: Table of DeviceReadiness rows with summaries and persistence.
+
+Dependencies:
+  - gzip
+  - json
+
+Notes:
+  - A device is ready when every enabled stage passed; `failed_stage` names the
+    first stage that did not, and later stages are not attempted.
+  - Reports are saved as gzip-compressed JSON, column-oriented like RunReport.
+"""
+
+import gzip
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+
+class ProbeStage:
+    """
+    Pre-flight stage names, in execution order.
+
+    PROBE is not a stage: it marks a device whose probe failed unexpectedly.
+    """
+
+    DNS = "dns"
+    TCP = "tcp"
+    BANNER = "banner"
+    KEX = "kex"
+    AUTH = "auth"
+    PROBE = "probe"
+
+    ORDER = (DNS, TCP, BANNER, KEX, AUTH, PROBE)
+
+
+class DeviceReadiness(NamedTuple):
+    """
+    Pre-flight outcome for one device.
+
+    Attributes:
+      hostname (str): Device hostname.
+      location (Optional[str]): Device location.
+      type (Optional[str]): Device type.
+      address (Optional[str]): Resolved IP address.
+      failed_stage (Optional[str]): First failing ProbeStage, None when ready.
+      error (Optional[str]): Failure detail ("ExceptionClass: message").
+      banner (Optional[str]): Remote SSH identification string.
+      host_key (Optional[str]): Host key type offered during key exchange.
+      dns_ms (float): Name resolution time.
+      tcp_ms (float): TCP connect time.
+      ssh_ms (float): Banner plus key exchange time.
+      auth_ms (float): Authentication time (auth probe only).
+    """
+
+    hostname: str
+    location: Optional[str] = None
+    type: Optional[str] = None
+    address: Optional[str] = None
+    failed_stage: Optional[str] = None
+    error: Optional[str] = None
+    banner: Optional[str] = None
+    host_key: Optional[str] = None
+    dns_ms: float = 0.0
+    tcp_ms: float = 0.0
+    ssh_ms: float = 0.0
+    auth_ms: float = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """
+        True when every enabled stage passed.
+        """
+        return self.failed_stage is None
+
+
+class ReadinessReport:
+    """
+    Per-device readiness table for one pre-flight run.
+
+    Args:
+      run_id (str): Unique identifier (also the saved file name).
+      started_at (str): ISO-8601 start timestamp.
+      stages (List[str]): Stages that were enabled for this run.
+    """
+
+    def __init__(self, run_id: str, started_at: str, stages: List[str]) -> None:
+        self.run_id = run_id
+        self.started_at = started_at
+        self.finished_at: Optional[str] = None
+        self.stages = stages
+        self.rows: List[DeviceReadiness] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[DeviceReadiness]:
+        return iter(self.rows)
+
+    def add(self, row: DeviceReadiness) -> None:
+        """
+        Appends one device result.
+        """
+        self.rows.append(row)
+
+    def finish(self, finished_at: str) -> None:
+        """
+        Records the run end timestamp.
+        """
+        self.finished_at = finished_at
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Returns {"ready": n, <stage>: failures at that stage, ...}.
+        """
+        return dict(Counter(row.failed_stage or "ready" for row in self.rows))
+
+    def not_ready(self) -> List[DeviceReadiness]:
+        """
+        Returns rows that failed a stage, sorted by stage order then hostname.
+        """
+        order = {stage: i for i, stage in enumerate(ProbeStage.ORDER)}
+        return sorted(
+            (row for row in self.rows if not row.ready),
+            key=lambda row: (order.get(row.failed_stage or "", 0), row.hostname),
+        )
+
+    def format_table(self, rows: Optional[List[DeviceReadiness]] = None) -> str:
+        """
+        Renders rows (default: all, sorted by hostname) as a fixed-width table.
+        """
+        rows = sorted(self.rows) if rows is None else rows
+        header = ("HOSTNAME", "ADDRESS", "STATUS", "MS", "DETAIL")
+        lines = [header]
+        for row in rows:
+            total_ms = row.dns_ms + row.tcp_ms + row.ssh_ms + row.auth_ms
+            lines.append(
+                (
+                    row.hostname,
+                    row.address or "-",
+                    "ready" if row.ready else f"{row.failed_stage} failed",
+                    f"{total_ms:.0f}",
+                    (row.error if not row.ready else row.banner) or "",
+                )
+            )
+        widths = [max(len(line[i]) for line in lines) for i in range(len(header) - 1)]
+        return "\n".join(
+            "  ".join(v.ljust(w) for v, w in zip(line, widths)) + "  " + line[-1]
+            for line in lines
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the JSON-serializable columnar representation.
+        """
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "stages": self.stages,
+            "summary": self.counts(),
+            "columns": {
+                name: [getattr(row, name) for row in self.rows]
+                for name in DeviceReadiness._fields
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReadinessReport":
+        """
+        Rebuilds a report from `to_dict()` output.
+        """
+        report = cls(data["run_id"], data["started_at"], data["stages"])
+        report.finished_at = data.get("finished_at")
+        columns = data["columns"]
+        report.rows = [
+            DeviceReadiness(*values)
+            for values in zip(*(columns[name] for name in DeviceReadiness._fields))
+        ]
+        return report
+
+    def save(self, report_dir: str) -> Path:
+        """
+        Writes the report atomically as `<report_dir>/<run_id>.json.gz`.
+        """
+        out_dir = Path(report_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / f"{self.run_id}.json.gz"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+
+        payload = json.dumps(self.to_dict(), separators=(",", ":")).encode()
+        with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "ReadinessReport":
+        """
+        Loads a report written by `save()`.
+        """
+        with gzip.open(path, "rb") as f:
+            return cls.from_dict(json.loads(f.read()))
@@ -0,0 +1,337 @@
+"""
+Run Report Model
+
+Defines a compact, columnar record of one collection run.
+
+Contents:
+  - DeviceStatus: Status values recorded per device.
+  - RunReport: Column-oriented per-device results with aggregation and
+    (de)serialization.
+  - new_run_id(): Unique, time-ordered identifier for a run.
+
+Dependencies:
+  - gzip
+  - json
+  - collections.Counter
+
+Notes:
+  - Each attribute is stored as one list (column) instead of one object per device.
+    Low-cardinality string columns (location, type, backend, status, error_class) are
+    dictionary-encoded as small integer codes, which keeps 50k-device reports small
+    and makes group-by aggregation a single pass over two integer lists.
+  - Reports are written as gzip-compressed JSON (`.json.gz`) so they load with the
+    standard library and stay readable by orchestration tooling.
+  - Run ids carry a random suffix, so jobs started in the same second never
+    share a report, bundle, or temporary file.
+"""
+
+import gzip
+import json
+import os
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def new_run_id(prefix: str, started: datetime) -> str:
+    """
+    Returns `<prefix>_<YYYYMMDDTHHMMSSZ>_<8 hex digits>` for a run started at
+    `started` (UTC).
+    """
+    return f"{prefix}_{started.strftime('%Y%m%dT%H%M%SZ')}_{uuid.uuid4().hex[:8]}"
+
+
+class DeviceStatus:
+    """
+    Status values recorded per device in a RunReport.
+    """
+
+    SUCCESS = "success"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+COLUMNS = (
+    "hostname",
+    "location",
+    "type",
+    "backend",
+    "status",
+    "error_class",
+    "attempts",
+    "fetch_ms",
+    "total_ms",
+    "bytes",
+    "config_hash",
+    "output_path",
+)
+
+# Columns stored as dictionary-encoded integer codes; the rest are plain lists.
+_CATEGORICAL = ("location", "type", "backend", "status", "error_class")
+
+
+class _Categorical:
+    """
+    Dictionary-encoded string column: distinct values plus one code per row.
+    """
+
+    __slots__ = ("values", "codes", "_lookup")
+
+    def __init__(
+        self,
+        values: Optional[List[Optional[str]]] = None,
+        codes: Optional[List[int]] = None,
+    ) -> None:
+        self.values: List[Optional[str]] = values or []
+        self.codes: List[int] = codes or []
+        self._lookup: Dict[Optional[str], int] = {
+            v: i for i, v in enumerate(self.values)
+        }
+
+    def append(self, value: Optional[str]) -> None:
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        return self.values[self.codes[row]]
+
+
+class RunReport:
+    """
+    Columnar per-device results for one collection run.
+
+    Attributes:
+      run_id (str): Unique run identifier (e.g. run_20250518T000000Z_1f2e3d4c).
+      started_at (str): ISO-8601 UTC start timestamp.
+      finished_at (Optional[str]): ISO-8601 UTC end timestamp, set by `finish()`.
+      dry_run (bool): Whether the run skipped SSH and file output.
+
+    Example:
+      report = RunReport("run_1", "2025-05-18T00:00:00+00:00")
+      report.add("router1", status=DeviceStatus.SUCCESS, location="DFW")
+      report.summarize(by="location")  # {"DFW": {"success": 1}}
+    """
+
+    __slots__ = ("run_id", "started_at", "finished_at", "dry_run", "_columns")
+
+    def __init__(self, run_id: str, started_at: str, dry_run: bool = False) -> None:
+        self.run_id = run_id
+        self.started_at = started_at
+        self.finished_at: Optional[str] = None
+        self.dry_run = dry_run
+        self._columns: Dict[str, Any] = {name: _Categorical() for name in _CATEGORICAL}
+        self._columns.update({n: [] for n in COLUMNS if n not in _CATEGORICAL})
+
+    def __len__(self) -> int:
+        return len(self._columns["hostname"])
+
+    def add(
+        self,
+        hostname: str,
+        status: str,
+        location: Optional[str] = None,
+        type: Optional[str] = None,
+        error_class: Optional[str] = None,
+        backend: Optional[str] = None,
+        attempts: int = 0,
+        fetch_ms: float = 0.0,
+        total_ms: float = 0.0,
+        bytes: int = 0,
+        config_hash: Optional[str] = None,
+        output_path: Optional[str] = None,
+    ) -> None:
+        """
+        Appends one device result.
+
+        Args:
+          hostname (str): Device hostname.
+          status (str): One of the DeviceStatus values.
+          location (Optional[str]): Device location.
+          type (Optional[str]): Device type.
+          error_class (Optional[str]): Exception class name for failures.
+          backend (Optional[str]): Retrieval backend used (ssh, netconf, http).
+          attempts (int): Connection attempts made (including retries).
+          fetch_ms (float): Time spent fetching the config, in milliseconds.
+          total_ms (float): Fetch plus write time, in milliseconds.
+          bytes (int): Size of the stored config.
+          config_hash (Optional[str]): SHA-256 hex digest of the stored config.
+          output_path (Optional[str]): Where the config was written.
+        """
+        columns = self._columns
+        columns["hostname"].append(hostname)
+        columns["location"].append(location)
+        columns["type"].append(type)
+        columns["backend"].append(backend)
+        columns["status"].append(status)
+        columns["error_class"].append(error_class)
+        columns["attempts"].append(attempts)
+        columns["fetch_ms"].append(round(fetch_ms, 1))
+        columns["total_ms"].append(round(total_ms, 1))
+        columns["bytes"].append(bytes)
+        columns["config_hash"].append(config_hash)
+        columns["output_path"].append(output_path)
+
+    def finish(self, finished_at: str) -> None:
+        """
+        Records the run end timestamp.
+        """
+        self.finished_at = finished_at
+
+    def column(self, name: str) -> List[Any]:
+        """
+        Returns the decoded values of one column.
+
+        Args:
+          name (str): Column name (see COLUMNS).
+
+        Returns:
+          List[Any]: One value per device, in insertion order.
+        """
+        col = self._columns[name]
+        if isinstance(col, _Categorical):
+            return [col.values[c] for c in col.codes]
+        return list(col)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """
+        Returns one device's values as a dict (negative indexes count from the end).
+        """
+        if index < 0:
+            index += len(self)
+        return {name: self._columns[name][index] for name in COLUMNS}
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields one dict per device (convenience view; prefer `column()` for bulk work).
+        """
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Returns the number of devices per status.
+        """
+        status = self._columns["status"]
+        return {status.values[c]: n for c, n in Counter(status.codes).items()}
+
+    def summarize(self, by: str) -> Dict[Optional[str], Dict[str, int]]:
+        """
+        Aggregates status counts per value of a categorical column.
+
+        Args:
+          by (str): "location", "type", "backend", or "error_class".
+
+        Returns:
+          Dict[Optional[str], Dict[str, int]]: {group: {status: count}}.
+
+        Raises:
+          ValueError: If `by` is not a categorical column.
+        """
+        if by not in _CATEGORICAL:
+            raise ValueError(f"Cannot aggregate by column: {by}")
+        group = self._columns[by]
+        status = self._columns["status"]
+
+        result: Dict[Optional[str], Dict[str, int]] = {}
+        for (g, s), n in Counter(zip(group.codes, status.codes)).items():
+            result.setdefault(group.values[g], {})[status.values[s]] = n
+        return result
+
+    def failed_hosts(self) -> List[str]:
+        """
+        Returns hostnames whose status is DeviceStatus.FAILED.
+        """
+        status = self._columns["status"]
+        hostnames = self._columns["hostname"]
+        return [
+            hostnames[i] for i in range(len(self)) if status[i] == DeviceStatus.FAILED
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the JSON-serializable columnar representation.
+        """
+        columns: Dict[str, Any] = {}
+        for name in COLUMNS:
+            col = self._columns[name]
+            if isinstance(col, _Categorical):
+                columns[name] = {"values": col.values, "codes": col.codes}
+            else:
+                columns[name] = col
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "dry_run": self.dry_run,
+            "summary": self.counts(),
+            "columns": columns,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunReport":
+        """
+        Rebuilds a RunReport from `to_dict()` output.
+
+        Notes:
+          - Columns added after a report was written (e.g. `backend`) load as
+            all-None.
+        """
+        report = cls(data["run_id"], data["started_at"], dry_run=data["dry_run"])
+        report.finished_at = data.get("finished_at")
+        rows = len(data["columns"]["hostname"])
+        for name in COLUMNS:
+            raw = data["columns"].get(name)
+            if raw is None:
+                raw = {"values": [None], "codes": [0] * rows}
+                if name not in _CATEGORICAL:
+                    raw = [None] * rows
+            if name in _CATEGORICAL:
+                report._columns[name] = _Categorical(raw["values"], raw["codes"])
+            else:
+                report._columns[name] = raw
+        return report
+
+    def save(self, report_dir: str) -> Path:
+        """
+        Writes the report atomically as `<report_dir>/<run_id>.json.gz`.
+
+        Args:
+          report_dir (str): Destination directory (created if missing).
+
+        Returns:
+          Path: Path of the written report.
+        """
+        out_dir = Path(report_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / f"{self.run_id}.json.gz"
+
+        payload = json.dumps(self.to_dict(), separators=(",", ":")).encode()
+        # A unique temp name: concurrent savers never write into one file.
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "RunReport":
+        """
+        Loads a report written by `save()`.
+
+        Args:
+          path (str): Path to a `.json.gz` report.
+
+        Returns:
+          RunReport: The decoded report.
+        """
+        with gzip.open(path, "rb") as f:
+            return cls.from_dict(json.loads(f.read()))
@@ -0,0 +1,459 @@
+"""
+Retrieval Backends Service
+
+Selects how each device's configuration is retrieved (SSH CLI, NETCONF over SSH,
+or HTTP/REST) and runs every backend through one shared retry and metrics layer.
+
+Contents:
+  - Backend: Base class for one retrieval protocol.
+  - SSHBackend / NetconfBackend / HTTPBackend: Protocol implementations.
+  - RateLimiter: Spaces out connection attempts across worker threads.
+  - FetchOutcome: Retrieved text plus attempts and backend name.
+  - CommandOutcome: Command results plus attempts (command jobs).
+  - BackendFetchError: Final failure after retries, with attempts and backend name.
+  - FetchEngine: Per-device backend selection plus shared rate limit and retry
+    policy, for config retrieval and command jobs.
+
+Dependencies:
+  - tenacity (imported on first fetch)
+  - src.utils.ssh_utils / src.utils.netconf_utils / src.utils.http_utils
+  - src.config.schema
+
+Notes:
+  - The backend is chosen by `Device.type` via `backends.by_type`, falling back
+    to `backends.default`; NETCONF and HTTP fetch the whole datastore in one
+    structured request, so map device types that support them there.
+  - Devices are contacted at `ip` when set, otherwise at `hostname`.
+  - Concurrency is owned by the caller (the collector's worker pool); the engine
+    is thread-safe and holds no per-device state.
+  - Credentials are read from the environment on the first fetch; when they are
+    missing, every fetch fails with BackendFetchError (0 attempts).
+  - Each backend decides which errors are transient (`is_retryable`);
+    authentication failures, 4xx responses, and <rpc-error> replies fail at once.
+  - With `collector.max_rate` set, every attempt (including retries) waits for
+    a slot, so at most that many connections per second are opened in total.
+  - Command jobs always run over SSH, whatever the device's retrieval backend.
+"""
+
+import threading
+import time
+from typing import (
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+    TypeVar,
+)
+
+from src.config.schema import AppConfig
+from src.models.inventory import DeviceRecord
+from src.utils.env_utils import get_env_var
+
+if TYPE_CHECKING:
+    from src.utils.ssh_utils import CommandResult
+
+Credentials = Tuple[Optional[str], Optional[str]]
+T = TypeVar("T")
+
+
+class Backend:
+    """
+    One retrieval protocol. Subclasses implement a single attempt in fetch_once().
+
+    Attributes:
+      name (str): Backend name used in settings and run reports.
+    """
+
+    name = "base"
+
+    def fetch_once(self, target: str) -> str:
+        """
+        Makes one retrieval attempt against `target` (IP or hostname).
+        """
+        raise NotImplementedError
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        """
+        Returns True if `exc` is transient and worth another attempt.
+        """
+        return isinstance(exc, OSError)
+
+
+def _is_transient_ssh_error(exc: BaseException) -> bool:
+    import paramiko
+
+    if isinstance(exc, paramiko.AuthenticationException):
+        return False
+    return isinstance(exc, (paramiko.SSHException, OSError, EOFError))
+
+
+class SSHBackend(Backend):
+    """
+    Interactive SSH: runs `ssh.command` and returns its text output.
+    """
+
+    name = "ssh"
+
+    def __init__(self, config: AppConfig, credentials: Credentials) -> None:
+        self.settings = config.ssh
+        self.credentials = credentials
+
+    def fetch_once(self, target: str) -> str:
+        from src.utils import ssh_utils
+
+        return ssh_utils.run_command(
+            target,
+            command=self.settings.command,
+            port=self.settings.port,
+            timeout=self.settings.timeout,
+            username=self.credentials[0],
+            password=self.credentials[1],
+        )
+
+    def run_commands(
+        self,
+        target: str,
+        commands: Sequence[str],
+        config_lines: Sequence[str] = (),
+        command_timeout: float = 60,
+    ) -> "List[CommandResult]":
+        """
+        Runs exec commands (and optionally a config snippet) over one connection.
+        """
+        from src.utils import ssh_utils
+
+        return ssh_utils.run_commands(
+            target,
+            commands,
+            config_lines,
+            port=self.settings.port,
+            timeout=self.settings.timeout,
+            command_timeout=command_timeout,
+            username=self.credentials[0],
+            password=self.credentials[1],
+        )
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        return _is_transient_ssh_error(exc)
+
+
+class NetconfBackend(Backend):
+    """
+    NETCONF over SSH: one <get-config> for the whole datastore, returned as XML.
+    """
+
+    name = "netconf"
+
+    def __init__(self, config: AppConfig, credentials: Credentials) -> None:
+        self.settings = config.backends.netconf
+        self.credentials = credentials
+
+    def fetch_once(self, target: str) -> str:
+        from src.utils import netconf_utils
+
+        settings = self.settings
+        return netconf_utils.get_config(
+            target,
+            port=settings.port,
+            timeout=settings.timeout,
+            username=self.credentials[0],
+            password=self.credentials[1],
+            source=settings.source,
+        )
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        return _is_transient_ssh_error(exc)
+
+
+class HTTPBackend(Backend):
+    """
+    HTTP/REST (e.g. RESTCONF): one GET for the whole configuration tree.
+    """
+
+    name = "http"
+
+    def __init__(self, config: AppConfig, credentials: Credentials) -> None:
+        self.settings = config.backends.http
+        self.credentials = credentials
+
+    def fetch_once(self, target: str) -> str:
+        from src.utils import http_utils
+
+        settings = self.settings
+        return http_utils.get_config(
+            http_utils.build_url(target, settings.scheme, settings.port, settings.path),
+            timeout=settings.timeout,
+            username=self.credentials[0],
+            password=self.credentials[1],
+            accept=settings.accept,
+            verify_tls=settings.verify_tls,
+        )
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        from src.utils.http_utils import HTTPStatusError
+
+        if isinstance(exc, HTTPStatusError):
+            return exc.status == 429 or exc.status >= 500
+        return isinstance(exc, OSError)
+
+
+BACKENDS = {cls.name: cls for cls in (SSHBackend, NetconfBackend, HTTPBackend)}
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces acquisitions at least 1/rate seconds apart.
+
+    Args:
+      rate (float): Acquisitions per second.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Blocks until the caller's slot.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class FetchOutcome(NamedTuple):
+    """
+    Result of a successful fetch.
+
+    Attributes:
+      text (str): Retrieved configuration.
+      attempts (int): Attempts used, including the successful one.
+      backend (str): Backend name.
+    """
+
+    text: str
+    attempts: int
+    backend: str
+
+
+class CommandOutcome(NamedTuple):
+    """
+    Result of a command job on one device.
+
+    Attributes:
+      results (List[CommandResult]): One entry per command, in order.
+      attempts (int): Attempts used, including the successful one.
+      backend (str): Backend name ("ssh").
+    """
+
+    results: "List[CommandResult]"
+    attempts: int
+    backend: str
+
+
+class BackendFetchError(Exception):
+    """
+    Raised when a device could not be fetched within the retry policy.
+
+    Attributes:
+      cause (Exception): Last error raised by the backend.
+      attempts (int): Attempts made.
+      backend (str): Backend name.
+    """
+
+    def __init__(self, cause: Exception, attempts: int, backend: str) -> None:
+        super().__init__(str(cause))
+        self.cause = cause
+        self.attempts = attempts
+        self.backend = backend
+
+
+class FetchEngine:
+    """
+    Selects a backend per device and fetches with the shared retry policy.
+
+    Args:
+      config (AppConfig): Application settings (`backends`, `collector` retry
+        settings, and per-protocol blocks).
+
+    Example:
+      engine = FetchEngine(config)
+      outcome = engine.fetch(device)   # FetchOutcome(text, attempts, backend)
+    """
+
+    def __init__(self, config: AppConfig) -> None:
+        self.config = config
+        self._backends: Dict[str, Backend] = {}
+        self._credentials: Optional[Credentials] = None
+        rate = config.collector.max_rate
+        self._limiter = RateLimiter(rate) if rate else None
+
+    def credentials(self) -> Credentials:
+        """
+        Returns (username, password) from the environment, loaded once.
+        """
+        if self._credentials is None:
+            self._credentials = (
+                get_env_var("SSH_USERNAME", required=True),
+                get_env_var("SSH_PASSWORD", required=True),
+            )
+        return self._credentials
+
+    def backend_name(self, device: DeviceRecord) -> str:
+        """
+        Returns the backend name configured for a device's type.
+        """
+        settings = self.config.backends
+        return settings.by_type.get(device.type or "", settings.default)
+
+    def backend_for(self, device: DeviceRecord) -> Backend:
+        """
+        Returns the (shared) backend instance for a device.
+        """
+        return self._backend(self.backend_name(device))
+
+    def endpoint(self, device: DeviceRecord) -> Tuple[str, int]:
+        """
+        Returns the (target, port) a fetch of `device` connects to.
+        """
+        name = self.backend_name(device)
+        if name == "ssh":
+            port = self.config.ssh.port
+        elif name == "netconf":
+            port = self.config.backends.netconf.port
+        else:
+            http = self.config.backends.http
+            port = http.port or (443 if http.scheme == "https" else 80)
+        return device.ip or device.hostname, port
+
+    def fetch_key(self, device: DeviceRecord) -> str:
+        """
+        Returns what a fetch of `device` retrieves, e.g. "ssh:show running-config";
+        equal keys for the same device mean interchangeable results.
+        """
+        name = self.backend_name(device)
+        detail = {
+            "ssh": self.config.ssh.command,
+            "netconf": self.config.backends.netconf.source,
+            "http": self.config.backends.http.path,
+        }[name]
+        return f"{name}:{detail}"
+
+    def _backend(self, name: str) -> Backend:
+        backend = self._backends.get(name)
+        if backend is None:
+            backend = BACKENDS[name](self.config, self.credentials())
+            self._backends[name] = backend
+        return backend
+
+    def _resolve(self, name: str) -> Backend:
+        """
+        Returns the backend `name`, reporting setup errors (e.g. missing
+        credentials) as a failed fetch of the device.
+        """
+        try:
+            return self._backend(name)
+        except Exception as exc:
+            raise BackendFetchError(exc, 0, name) from exc
+
+    def fetch(self, device: DeviceRecord) -> FetchOutcome:
+        """
+        Fetches one device's configuration, retrying transient errors.
+
+        Args:
+          device (DeviceRecord): Inventory entry.
+
+        Returns:
+          FetchOutcome: Text, attempts, and backend name.
+
+        Raises:
+          BackendFetchError: After the last attempt, or at once for
+            non-retryable errors.
+        """
+        backend = self._resolve(self.backend_name(device))
+        target = device.ip or device.hostname
+        text, attempts = self._call(backend, lambda: backend.fetch_once(target))
+        return FetchOutcome(text, attempts, backend.name)
+
+    def run_commands(
+        self,
+        device: DeviceRecord,
+        commands: Sequence[str],
+        config_lines: Sequence[str] = (),
+        command_timeout: float = 60,
+    ) -> CommandOutcome:
+        """
+        Runs a command set on one device over SSH, retrying transient errors.
+
+        Args:
+          device (DeviceRecord): Inventory entry.
+          commands (Sequence[str]): Exec commands, run in order.
+          config_lines (Sequence[str]): Config snippet sent in one interactive
+            session after the commands; it is re-sent in full on retry, so it
+            must be idempotent.
+          command_timeout (float): Read timeout per command, in seconds.
+
+        Returns:
+          CommandOutcome: Per-command results, attempts, and backend name.
+
+        Raises:
+          BackendFetchError: After the last attempt, or at once for
+            non-retryable errors.
+        """
+        backend = self._resolve(SSHBackend.name)
+        assert isinstance(backend, SSHBackend)
+        target = device.ip or device.hostname
+        results, attempts = self._call(
+            backend,
+            lambda: backend.run_commands(
+                target, commands, config_lines, command_timeout
+            ),
+        )
+        return CommandOutcome(results, attempts, backend.name)
+
+    def _call(self, backend: Backend, attempt_once: Callable[[], T]) -> Tuple[T, int]:
+        """
+        Runs `attempt_once` under the rate limit and retry policy.
+
+        Returns:
+          Tuple[T, int]: The result and the number of attempts used.
+
+        Raises:
+          BackendFetchError: Wrapping the last error.
+        """
+        from tenacity import (
+            retry_if_exception,
+            Retrying,
+            stop_after_attempt,
+            wait_exponential,
+        )
+
+        settings = self.config.collector
+        attempts = 0
+        try:
+            for attempt in Retrying(
+                stop=stop_after_attempt(settings.retries),
+                wait=wait_exponential(
+                    multiplier=1,
+                    min=settings.retry_wait_min,
+                    max=settings.retry_wait_max,
+                ),
+                retry=retry_if_exception(backend.is_retryable),
+                reraise=True,
+            ):
+                with attempt:
+                    attempts = attempt.retry_state.attempt_number
+                    if self._limiter is not None:
+                        self._limiter.acquire()
+                    result = attempt_once()
+        except Exception as exc:
+            raise BackendFetchError(exc, attempts, backend.name) from exc
+        return result, attempts
@@ -0,0 +1,407 @@
+"""
+Config Catalog Service
+
+Maintains a persistent SQLite index of every stored config (host, date, hash,
+size, location) so fleet snapshots and per-device histories are answered from an
+index instead of scanning the output directory.
+
+Contents:
+  - CatalogEntry: One catalogued config.
+  - SyncResult: Counters describing one reconciliation pass.
+  - ConfigCatalog: SQLite-backed catalog with record/sync/snapshot/history.
+  - record_run(): Adds a run's successful configs to the catalog.
+  - normalize_date(): Accepts YYYY-MM-DD or YYYYMMDD.
+  - run_catalog(): CLI entry point (sync, snapshot, history) using settings.yaml.
+
+Dependencies:
+  - sqlite3
+  - src.utils.file_utils
+  - src.models.run_report
+
+Notes:
+  - Rows are keyed by (host, YYYYMMDD) in a WITHOUT ROWID table, so a history is
+    one index range scan and a snapshot is one index seek per host.
+  - The collector records each run's writes as it finishes (`catalog.enabled`);
+    sync() reconciles with the output directory after compaction, manual edits,
+    or when building the catalog for existing data.
+  - sync() hashes only configs the catalog has never seen; configs that merely
+    moved (e.g. into a monthly archive) keep their recorded hash. Pass
+    verify=True to re-hash everything.
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.config.config import load_config
+from src.models.run_report import DeviceStatus, RunReport
+from src.utils.file_utils import iter_stored_configs, read_config
+from src.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (
+    id INTEGER PRIMARY KEY,
+    hostname TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS configs (
+    host_id INTEGER NOT NULL REFERENCES hosts(id),
+    date_stamp INTEGER NOT NULL,
+    collected_at TEXT,
+    config_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    location TEXT NOT NULL,
+    PRIMARY KEY (host_id, date_stamp)
+) WITHOUT ROWID;
+"""
+
+_SELECT = """
+SELECT h.hostname, c.date_stamp, c.collected_at, c.config_hash, c.size, c.location
+FROM hosts h JOIN configs c ON c.host_id = h.id
+"""
+
+_UPSERT = """
+INSERT INTO configs (host_id, date_stamp, collected_at, config_hash, size, location)
+VALUES ((SELECT id FROM hosts WHERE hostname = ?), ?, ?, ?, ?, ?)
+ON CONFLICT (host_id, date_stamp) DO UPDATE SET
+    collected_at = COALESCE(excluded.collected_at, collected_at),
+    config_hash = excluded.config_hash,
+    size = excluded.size,
+    location = excluded.location
+"""
+
+
+class CatalogEntry(NamedTuple):
+    """
+    One catalogued config.
+
+    Attributes:
+      hostname (str): Device hostname.
+      date_stamp (str): Collection date (YYYYMMDD).
+      collected_at (Optional[str]): ISO-8601 run start, when recorded by a run.
+      config_hash (str): SHA-256 of the config text.
+      size (int): Config size in bytes (uncompressed).
+      location (str): Path, or `<archive>#<member>` (see read_config()).
+    """
+
+    hostname: str
+    date_stamp: str
+    collected_at: Optional[str]
+    config_hash: str
+    size: int
+    location: str
+
+
+class SyncResult(NamedTuple):
+    """
+    Counters describing one sync() pass.
+
+    Attributes:
+      added (int): Configs newly catalogued (hashed).
+      moved (int): Configs whose location changed.
+      removed (int): Catalog rows whose config no longer exists.
+      rehashed (int): Existing configs re-hashed (verify=True).
+    """
+
+    added: int
+    moved: int
+    removed: int
+    rehashed: int
+
+
+def normalize_date(value: str) -> str:
+    """
+    Returns a YYYYMMDD stamp from "YYYY-MM-DD" or "YYYYMMDD".
+
+    Raises:
+      ValueError: If the value is not a date in either format.
+    """
+    stamp = value.replace("-", "")
+    if len(stamp) != 8 or not stamp.isdigit():
+        raise ValueError(f"Invalid date (expected YYYY-MM-DD): {value}")
+    return stamp
+
+
+def _entry(row: Sequence) -> CatalogEntry:
+    return CatalogEntry(row[0], str(row[1]), row[2], row[3], row[4], row[5])
+
+
+def _hash_config(location: str) -> Tuple[str, int]:
+    data = read_config(location).encode()
+    return hashlib.sha256(data).hexdigest(), len(data)
+
+
+class ConfigCatalog:
+    """
+    SQLite-backed catalog of stored configs.
+
+    Args:
+      db_path (str): Catalog database file (created on first use).
+
+    Example:
+      with ConfigCatalog("reports/catalog.sqlite3") as catalog:
+          catalog.sync("configs")
+          catalog.snapshot("2026-03-01")   # every device as of that day
+          catalog.history("router1", 20)    # last 20 versions, newest first
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> "ConfigCatalog":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        self._conn.close()
+
+    def __len__(self) -> int:
+        count: int = self._conn.execute("SELECT COUNT(*) FROM configs").fetchone()[0]
+        return count
+
+    def _add_hosts(self, hostnames: Iterable[str]) -> None:
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO hosts (hostname) VALUES (?)",
+            ((h,) for h in hostnames),
+        )
+
+    def record(self, entries: Iterable[CatalogEntry]) -> int:
+        """
+        Adds or replaces entries in one transaction.
+
+        Returns:
+          int: Number of entries written.
+        """
+        entries = list(entries)
+        with self._conn:
+            self._add_hosts({e.hostname for e in entries})
+            self._conn.executemany(
+                _UPSERT,
+                (
+                    (
+                        e.hostname,
+                        int(e.date_stamp),
+                        e.collected_at,
+                        e.config_hash,
+                        e.size,
+                        e.location,
+                    )
+                    for e in entries
+                ),
+            )
+        return len(entries)
+
+    def sync(
+        self, output_dir: str, archive_dir: str = "archive", verify: bool = False
+    ) -> SyncResult:
+        """
+        Reconciles the catalog with the configs currently stored in output_dir.
+
+        Args:
+          output_dir (str): Root output directory.
+          archive_dir (str): Monthly archive directory, relative to output_dir.
+          verify (bool): Re-hash configs that are already catalogued.
+
+        Returns:
+          SyncResult: What changed.
+        """
+        conn = self._conn
+        with conn:
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS disk ("
+                "hostname TEXT NOT NULL, date_stamp INTEGER NOT NULL, "
+                "location TEXT NOT NULL, "
+                "PRIMARY KEY (hostname, date_stamp, location)) WITHOUT ROWID"
+            )
+            conn.execute("DELETE FROM disk")
+            conn.executemany(
+                "INSERT OR IGNORE INTO disk VALUES (?, ?, ?)",
+                (
+                    (s.hostname, int(s.date_stamp), s.location)
+                    for s in iter_stored_configs(output_dir, archive_dir)
+                ),
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO hosts (hostname) "
+                "SELECT DISTINCT hostname FROM disk"
+            )
+            on_disk = (
+                "FROM disk d JOIN hosts h ON h.hostname = d.hostname "
+                "WHERE h.id = configs.host_id AND d.date_stamp = configs.date_stamp"
+            )
+
+            removed = conn.execute(
+                f"DELETE FROM configs WHERE NOT EXISTS (SELECT 1 {on_disk})"
+            ).rowcount
+            # A (host, day) stored more than once (e.g. loose and bundled) keeps
+            # its recorded location while that copy exists.
+            moved = conn.execute(
+                f"UPDATE configs SET location = (SELECT MIN(d.location) {on_disk}) "
+                f"WHERE NOT EXISTS (SELECT 1 {on_disk} "
+                "AND d.location = configs.location)"
+            ).rowcount
+
+            to_hash = conn.execute(
+                "SELECT d.hostname, d.date_stamp, "
+                "COALESCE(MIN(c.location), MIN(d.location)) FROM disk d "
+                "JOIN hosts h ON h.hostname = d.hostname "
+                "LEFT JOIN configs c ON c.host_id = h.id "
+                "AND c.date_stamp = d.date_stamp "
+                + ("" if verify else "WHERE c.host_id IS NULL ")
+                + "GROUP BY d.hostname, d.date_stamp"
+            ).fetchall()
+            known = len(self) if verify else 0
+
+            def hashed() -> Iterator[Tuple[object, ...]]:
+                for hostname, stamp, location in to_hash:
+                    try:
+                        config_hash, size = _hash_config(location)
+                    except (OSError, ValueError, KeyError) as exc:
+                        logger.warning(f"⚠️  Cannot read {location}: {exc}")
+                        continue
+                    yield (hostname, stamp, None, config_hash, size, location)
+
+            conn.executemany(_UPSERT, hashed())
+            conn.execute("DELETE FROM disk")
+
+        result = SyncResult(
+            added=len(to_hash) - known,
+            moved=moved,
+            removed=removed,
+            rehashed=known,
+        )
+        logger.info(
+            f"Catalog sync: {result.added} added, {result.moved} moved, "
+            f"{result.removed} removed, {result.rehashed} re-hashed"
+        )
+        return result
+
+    def snapshot(
+        self, as_of: str, hostnames: Optional[Iterable[str]] = None
+    ) -> List[CatalogEntry]:
+        """
+        Returns each device's newest config collected on or before a date.
+
+        Args:
+          as_of (str): Date (YYYY-MM-DD or YYYYMMDD), inclusive.
+          hostnames (Optional[Iterable[str]]): Restrict to these devices.
+
+        Returns:
+          List[CatalogEntry]: One entry per device with a config by then, sorted
+          by hostname.
+        """
+        stamp = int(normalize_date(as_of))
+        query = (
+            _SELECT + "AND c.date_stamp = (SELECT MAX(date_stamp) FROM configs "
+            "WHERE host_id = h.id AND date_stamp <= ?)"
+        )
+        params: List[object] = [stamp]
+        if hostnames is not None:
+            names = list(hostnames)
+            query += f" WHERE h.hostname IN ({','.join('?' * len(names))})"
+            params.extend(names)
+        query += " ORDER BY h.hostname"
+        return [_entry(row) for row in self._conn.execute(query, params)]
+
+    def history(self, hostname: str, limit: Optional[int] = 20) -> List[CatalogEntry]:
+        """
+        Returns a device's catalogued configs, newest first.
+
+        Args:
+          hostname (str): Device hostname.
+          limit (Optional[int]): Maximum entries (None for all).
+
+        Returns:
+          List[CatalogEntry]: Entries in descending date order.
+        """
+        query = _SELECT + "WHERE h.hostname = ? ORDER BY c.date_stamp DESC"
+        params: List[object] = [hostname]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [_entry(row) for row in self._conn.execute(query, params)]
+
+    def hostnames(self) -> List[str]:
+        """
+        Returns every catalogued hostname, sorted.
+        """
+        rows = self._conn.execute(
+            "SELECT hostname FROM hosts h WHERE EXISTS "
+            "(SELECT 1 FROM configs WHERE host_id = h.id) ORDER BY hostname"
+        )
+        return [row[0] for row in rows]
+
+
+def record_run(catalog: ConfigCatalog, report: RunReport, date_stamp: str) -> int:
+    """
+    Catalogs the successful configs of a run.
+
+    Args:
+      catalog (ConfigCatalog): Target catalog.
+      report (RunReport): Finished run report.
+      date_stamp (str): Run date (YYYYMMDD) used in config filenames.
+
+    Returns:
+      int: Number of configs recorded.
+    """
+    return catalog.record(
+        CatalogEntry(
+            row["hostname"],
+            date_stamp,
+            report.started_at,
+            row["config_hash"],
+            row["bytes"],
+            row["output_path"],
+        )
+        for row in report.rows()
+        if row["status"] == DeviceStatus.SUCCESS and row["output_path"]
+    )
+
+
+def run_catalog(
+    sync: bool = False,
+    snapshot: Optional[str] = None,
+    history: Optional[str] = None,
+    limit: Optional[int] = 20,
+) -> List[CatalogEntry]:
+    """
+    Syncs and/or queries the configured catalog and prints matching entries.
+
+    Args:
+      sync (bool): Reconcile the catalog with output_dir first.
+      snapshot (Optional[str]): Print every device's config as of this date.
+      history (Optional[str]): Print this device's newest `limit` configs.
+      limit (Optional[int]): History length.
+
+    Returns:
+      List[CatalogEntry]: Printed entries.
+
+    Notes:
+      - Entries are printed to stdout as tab-separated
+        `hostname date hash size location` lines for use in scripts.
+    """
+    config = load_config()
+    with ConfigCatalog(config.catalog.path) as catalog:
+        if sync:
+            catalog.sync(config.output_dir, config.storage.archive_dir)
+        if snapshot is not None:
+            entries = catalog.snapshot(snapshot)
+        elif history is not None:
+            entries = catalog.history(history, limit)
+        else:
+            entries = []
+    for e in entries:
+        print(f"{e.hostname}\t{e.date_stamp}\t{e.config_hash}\t{e.size}\t{e.location}")
+    return entries
@@ -0,0 +1,362 @@
+"""
+Command Jobs Service
+
+Runs a command job (show commands and/or small config snippets per device type)
+across the inventory, with a canary stage, and stores every device's output.
+
+Contents:
+  - run_job(): Runs a job file against the inventory and returns its RunReport.
+
+Dependencies:
+  - src.models.command_job
+  - src.services.backends (shared rate limit and retry policy)
+  - src.utils.file_utils.ConfigWriter
+  - src.models.run_report
+
+Notes:
+  - Devices are run by `collector.workers` threads through FetchEngine, so
+    `collector.max_rate`, `collector.retries`, and backoff apply as for
+    collection. Commands always go over SSH.
+  - Stage 1 runs the first `canary` devices (job file, or `--canary`); stage 2
+    runs the rest only if at most `canary_max_failures` canaries failed. When
+    the canary fails, the remaining devices are reported as skipped.
+  - Each device's output is stored as
+    <jobs.output_dir>/<job name>/[<shard>/]<hostname>_<YYYYMMDDTHHMMSSZ>.txt
+    (same layout and bundling as configs), one `### <command> (exit N)` section
+    per command; the run report (`job_<name>_<ts>_<id>.json.gz`) records status,
+    attempts, timings, size, hash, and location per device.
+  - A device whose commands all ran but any exited non-zero, or printed a line
+    matching the job's `error_patterns` (e.g. `% Invalid input` in a config
+    session), is stored and reported as failed with error class `CommandError`;
+    such devices count against the canary.
+"""
+
+import hashlib
+import time
+from concurrent.futures import as_completed, Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from src.config.config import load_config
+from src.models.command_job import CommandJob, CommandSet, load_job
+from src.models.inventory import DeviceRecord
+from src.models.run_report import DeviceStatus, new_run_id, RunReport
+from src.services.backends import BackendFetchError, FetchEngine
+from src.utils.device_loader import load_inventory
+from src.utils.file_utils import ConfigWriter
+from src.utils.logger_utils import get_logger
+from src.utils.ssh_utils import CommandResult, CONFIG_SESSION
+
+logger = get_logger(__name__)
+
+Target = Tuple[DeviceRecord, CommandSet]
+
+
+class _DeviceRun(NamedTuple):
+    """
+    Worker output for one device.
+    """
+
+    started: float
+    seconds: float
+    attempts: int
+    backend: str
+    error: Optional[Exception] = None
+    failed_commands: Tuple[str, ...] = ()
+    size: Optional[int] = None
+    output_hash: Optional[str] = None
+    write: "Optional[Future[str]]" = None
+
+
+def _format_output(results: Sequence[CommandResult]) -> str:
+    sections = []
+    for result in results:
+        title = "config" if result.command == CONFIG_SESSION else result.command
+        output = result.output if result.output.endswith("\n") else result.output + "\n"
+        sections.append(f"### {title} (exit {result.exit_status})\n{output}")
+    return "".join(sections)
+
+
+def _run_device(
+    device: DeviceRecord,
+    command_set: CommandSet,
+    job: CommandJob,
+    engine: FetchEngine,
+    writer: ConfigWriter,
+    stamp: str,
+) -> _DeviceRun:
+    """
+    Worker task: runs the command set on one device and queues its output.
+    """
+    logger.info(f"Running {job.name} on {device.hostname}...")
+    started = time.perf_counter()
+    try:
+        outcome = engine.run_commands(
+            device, command_set.commands, command_set.config, job.timeout
+        )
+    except BackendFetchError as exc:
+        return _DeviceRun(
+            started, time.perf_counter() - started, exc.attempts, exc.backend, exc.cause
+        )
+    seconds = time.perf_counter() - started
+
+    text = _format_output(outcome.results)
+    data = text.encode()
+    errors = job.error_regex()
+    failed = tuple(
+        result.command
+        for result in outcome.results
+        if result.exit_status not in (0, -1)
+        or (errors is not None and errors.search(result.output))
+    )
+    return _DeviceRun(
+        started,
+        seconds,
+        outcome.attempts,
+        outcome.backend,
+        failed_commands=failed,
+        size=len(data),
+        output_hash=hashlib.sha256(data).hexdigest(),
+        write=writer.submit(device.hostname, text, stamp),
+    )
+
+
+def _record(
+    report: RunReport, device: DeviceRecord, future: "Future[_DeviceRun]"
+) -> bool:
+    """
+    Adds one device's outcome to the report; returns True on success.
+    """
+    hostname = device.hostname
+    try:
+        run = future.result()
+    except Exception as exc:
+        # E.g. the writer stage failed: this device fails, the job goes on.
+        logger.exception(f"❌ {hostname}: {exc}")
+        report.add(
+            hostname,
+            DeviceStatus.FAILED,
+            location=device.location,
+            type=device.type,
+            error_class=type(exc).__name__,
+        )
+        return False
+
+    if run.error is not None:
+        logger.error(f"❌ {hostname}: {run.error}", exc_info=run.error)
+        report.add(
+            hostname,
+            DeviceStatus.FAILED,
+            location=device.location,
+            type=device.type,
+            error_class=type(run.error).__name__,
+            backend=run.backend,
+            attempts=run.attempts,
+            fetch_ms=run.seconds * 1000,
+            total_ms=run.seconds * 1000,
+        )
+        return False
+
+    assert run.write is not None
+    try:
+        output_path = run.write.result()
+    except Exception as exc:
+        logger.exception(f"❌ Failed to write output for {hostname}: {exc}")
+        report.add(
+            hostname,
+            DeviceStatus.FAILED,
+            location=device.location,
+            type=device.type,
+            error_class=type(exc).__name__,
+            backend=run.backend,
+            attempts=run.attempts,
+            fetch_ms=run.seconds * 1000,
+            total_ms=(time.perf_counter() - run.started) * 1000,
+        )
+        return False
+
+    ok = not run.failed_commands
+    if ok:
+        logger.info(f"✅ {hostname}: output saved")
+    else:
+        logger.error(f"❌ {hostname}: failed: {', '.join(run.failed_commands)}")
+    report.add(
+        hostname,
+        DeviceStatus.SUCCESS if ok else DeviceStatus.FAILED,
+        location=device.location,
+        type=device.type,
+        error_class=None if ok else "CommandError",
+        backend=run.backend,
+        attempts=run.attempts,
+        fetch_ms=run.seconds * 1000,
+        total_ms=(time.perf_counter() - run.started) * 1000,
+        bytes=run.size or 0,
+        config_hash=run.output_hash,
+        output_path=output_path,
+    )
+    return ok
+
+
+def _failed(future: "Future[_DeviceRun]") -> bool:
+    """
+    Returns True if the device's commands failed (without waiting for its write).
+    """
+    try:
+        run = future.result()
+    except Exception:
+        return True
+    return run.error is not None or bool(run.failed_commands)
+
+
+def _run_stage(
+    targets: Sequence[Target],
+    job: CommandJob,
+    engine: FetchEngine,
+    writer: ConfigWriter,
+    pool: ThreadPoolExecutor,
+    report: RunReport,
+    stamp: str,
+    deferred: "List[Tuple[DeviceRecord, Future[_DeviceRun]]]",
+) -> int:
+    """
+    Runs one stage to completion and returns its number of failed devices.
+
+    In bundle mode, outputs are only in place once the writer has closed, so
+    devices are appended to `deferred` and recorded after that; their failure
+    count then covers the commands but not the write.
+    """
+    pending = {
+        pool.submit(
+            _run_device, device, command_set, job, engine, writer, stamp
+        ): device
+        for device, command_set in targets
+    }
+    failures = 0
+    for future in as_completed(pending):
+        if writer.bundle is not None:
+            deferred.append((pending[future], future))
+            failures += _failed(future)
+        elif not _record(report, pending[future], future):
+            failures += 1
+    return failures
+
+
+def run_job(
+    job_file: str,
+    devices_file: str,
+    canary: Optional[int] = None,
+    dry_run: bool = False,
+) -> RunReport:
+    """
+    Runs a command job against every device in the inventory.
+
+    Args:
+      job_file (str): Path to the job YAML (see src.models.command_job).
+      devices_file (str): Path to devices.yaml.
+      canary (Optional[int]): Canary size, overriding the job file.
+      dry_run (bool): Log what would run; connect to nothing.
+
+    Returns:
+      RunReport: One row per device; also saved under `report_dir`.
+
+    Raises:
+      FileNotFoundError: If the job or device file is missing.
+    """
+    config = load_config()
+    job = load_job(job_file)
+    devices = load_inventory(devices_file, config.inventory.cache_dir)
+
+    started = datetime.now(timezone.utc)
+    stamp = started.strftime("%Y%m%dT%H%M%SZ")
+    report = RunReport(
+        new_run_id(f"job_{job.name}", started), started.isoformat(), dry_run
+    )
+
+    targets: List[Target] = []
+    for device in devices:
+        command_set = job.command_set(device.type)
+        if command_set is None or not (command_set.commands or command_set.config):
+            report.add(
+                device.hostname,
+                DeviceStatus.SKIPPED,
+                location=device.location,
+                type=device.type,
+            )
+        else:
+            targets.append((device, command_set))
+
+    canary_size = min(job.canary if canary is None else canary, len(targets))
+    logger.info(
+        f"=== Job {job.name}: {len(targets)} device(s), canary {canary_size} ==="
+    )
+
+    if dry_run:
+        for device, command_set in targets:
+            lines = command_set.commands + [f"(config) {c}" for c in command_set.config]
+            logger.info(f"[DRY-RUN] {device.hostname}: {'; '.join(lines)}")
+            report.add(
+                device.hostname,
+                DeviceStatus.SKIPPED,
+                location=device.location,
+                type=device.type,
+            )
+    else:
+        writer = ConfigWriter(
+            str(Path(config.jobs.output_dir) / job.name),
+            fsync=config.writer.fsync,
+            batch_size=config.writer.batch_size,
+            queue_size=config.writer.queue_size,
+            bundle=config.writer.bundle,
+            fsync_workers=config.writer.fsync_workers,
+            run_name=report.run_id,
+            layout=config.storage.layout,
+            extension=".txt",
+        )
+        engine = FetchEngine(config)
+        deferred: "List[Tuple[DeviceRecord, Future[_DeviceRun]]]" = []
+        try:
+            with ThreadPoolExecutor(
+                max_workers=config.collector.workers, thread_name_prefix="job"
+            ) as pool:
+                stage = (job, engine, writer, pool, report, stamp, deferred)
+                rest = targets[canary_size:]
+                if canary_size:
+                    failures = _run_stage(targets[:canary_size], *stage)
+                    if failures > job.canary_max_failures:
+                        logger.error(
+                            f"❌ Canary failed ({failures}/{canary_size} device(s)); "
+                            f"skipping the remaining {len(rest)}"
+                        )
+                        for device, _ in rest:
+                            report.add(
+                                device.hostname,
+                                DeviceStatus.SKIPPED,
+                                location=device.location,
+                                type=device.type,
+                                error_class="CanaryFailed",
+                            )
+                        rest = []
+                    else:
+                        logger.info(f"✅ Canary passed ({failures} failure(s))")
+                _run_stage(rest, *stage)
+        finally:
+            try:
+                writer.close()
+            except Exception as exc:
+                logger.exception(f"❌ Failed to finalize output: {exc}")
+        for device, future in deferred:
+            _record(report, device, future)
+
+    report.finish(datetime.now(timezone.utc).isoformat())
+    counts = report.counts()
+    logger.info(f"=== Job {job.name} Summary ===")
+    logger.info(f"Total devices: {len(devices)}")
+    logger.info(f"Successes:     {counts.get(DeviceStatus.SUCCESS, 0)}")
+    logger.info(f"Failures:      {counts.get(DeviceStatus.FAILED, 0)}")
+    logger.info(f"Skipped:       {counts.get(DeviceStatus.SKIPPED, 0)}")
+    try:
+        logger.info(f"Run report:    {report.save(config.report_dir)}")
+    except OSError as exc:
+        logger.error(f"❌ Failed to write run report: {exc}")
+    return report
@@ -0,0 +1,421 @@
+"""
+Compliance Service
+
+Evaluates YAML-declared policy rules against collected configs at fleet scale.
+
+Contents:
+  - load_rules(): Loads and validates rules from a YAML file.
+  - RuleSet: Rules compiled into one combined matcher; evaluates a config in one scan.
+  - ComplianceCache: On-disk results keyed by config hash and rule-set fingerprint.
+  - evaluate_configs(): Evaluates many stored configs in parallel with caching.
+  - run_compliance_stage(): Post-collection stage driven by a RunReport.
+  - save_results(): Writes per-host violations as gzip JSON.
+
+Dependencies:
+  - re
+  - yaml
+  - concurrent.futures.ProcessPoolExecutor
+  - src.models.compliance_model
+  - src.models.run_report
+  - src.utils.file_utils
+
+Notes:
+  - All rule patterns (line rules, block headers, and block child patterns) are
+    joined into a single alternation regex. Each config is scanned once by that
+    regex in C; only the few lines it hits are checked against individual rules,
+    so cost no longer grows as rules x lines in Python.
+  - Results are cached by (rule-set fingerprint, config SHA-256). Unchanged configs
+    are never re-read or re-evaluated; editing any rule invalidates the cache.
+    The cache keeps at most `cache_max_entries` hashes, least recently used first out.
+  - A pattern may start with inline flags such as "(?i)"; they apply to that
+    rule only.
+  - Evaluation is CPU-bound, so it runs in a process pool.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+import yaml
+
+from src.models.compliance_model import ComplianceRule, Violation
+from src.models.run_report import DeviceStatus, RunReport
+from src.utils.file_utils import read_config
+from src.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Below this many configs a process pool costs more than it saves.
+_PARALLEL_THRESHOLD = 64
+
+_TOP_LEVEL = re.compile(r"^(?=\S)", re.MULTILINE)
+
+# Inline global flags, e.g. "(?i)"; valid only at the start of a whole pattern.
+_GLOBAL_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+
+
+def _scoped(pattern: str, ignore_case: bool) -> str:
+    """
+    Wraps a rule pattern in a group for a combined alternation. Leading inline
+    flags such as "(?i)" become the group's own flags, so they keep applying to
+    this rule only instead of breaking the combined regex.
+    """
+    flags = "i" if ignore_case else ""
+    while m := _GLOBAL_FLAGS.match(pattern):
+        flags += m.group(1)
+        pattern = pattern[m.end() :]
+    flags = "".join(dict.fromkeys(flags))
+    return f"(?{flags}:{pattern})" if flags else f"(?:{pattern})"
+
+
+def load_rules(yaml_path: str) -> List[ComplianceRule]:
+    """
+    Loads compliance rules from a YAML file with a top-level `rules:` list.
+
+    Args:
+      yaml_path (str): Path to the rules YAML.
+
+    Returns:
+      List[ComplianceRule]: Validated rules.
+
+    Raises:
+      FileNotFoundError: If the file does not exist.
+      ValidationError: If any rule fails validation.
+      ValueError: If rule ids are not unique.
+    """
+    file_path = Path(yaml_path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"Rules file not found: {yaml_path}")
+
+    with file_path.open("r") as f:
+        raw = yaml.safe_load(f) or {}
+
+    rules = [ComplianceRule(**entry) for entry in raw.get("rules", [])]
+    ids = [rule.id for rule in rules]
+    if len(ids) != len(set(ids)):
+        raise ValueError("Compliance rule ids must be unique")
+    return rules
+
+
+class RuleSet:
+    """
+    A list of rules compiled for single-pass evaluation.
+
+    Args:
+      rules (Sequence[ComplianceRule]): Rules to compile.
+
+    Attributes:
+      fingerprint (str): Stable hash of the rule definitions (cache namespace).
+
+    Example:
+      ruleset = RuleSet(load_rules("src/config/compliance.yaml"))
+      violations = ruleset.evaluate(config_text)
+    """
+
+    def __init__(self, rules: Sequence[ComplianceRule]) -> None:
+        self.rules = list(rules)
+        self.fingerprint = hashlib.sha256(
+            json.dumps([r.model_dump() for r in self.rules], sort_keys=True).encode()
+        ).hexdigest()
+
+        # Per-rule matchers applied only to candidate lines.
+        self._line: List[Tuple[int, Pattern[str]]] = []
+        self._header: List[Tuple[int, Pattern[str]]] = []
+        self._child: List[Tuple[int, Pattern[str]]] = []
+        alternatives: List[str] = []
+
+        for index, rule in enumerate(self.rules):
+            flags = re.IGNORECASE if rule.ignore_case else 0
+            if rule.block is None:
+                self._line.append((index, re.compile(rule.pattern, flags)))
+            else:
+                self._header.append((index, re.compile(rule.block, flags)))
+                self._child.append((index, re.compile(rule.pattern, flags)))
+                alternatives.append(_scoped(rule.block, rule.ignore_case))
+            alternatives.append(_scoped(rule.pattern, rule.ignore_case))
+
+        self._combined: Optional[Pattern[str]] = (
+            re.compile("|".join(alternatives), re.MULTILINE) if alternatives else None
+        )
+        # Per-category prefilters: a candidate line is only checked against the
+        # individual rules of a category when that category's union matches.
+        self._any_line = self._union(self._line)
+        self._any_header = self._union(self._header)
+        self._any_child = self._union(self._child)
+
+    @staticmethod
+    def _union(matchers: List[Tuple[int, Pattern[str]]]) -> Optional[Pattern[str]]:
+        if not matchers:
+            return None
+        return re.compile(
+            "|".join(
+                _scoped(rx.pattern, bool(rx.flags & re.IGNORECASE))
+                for _, rx in matchers
+            )
+        )
+
+    def evaluate(self, text: str) -> List[Violation]:
+        """
+        Evaluates every rule against one config in a single combined scan.
+
+        Args:
+          text (str): Raw configuration text.
+
+        Returns:
+          List[Violation]: Violations in rule order (empty when compliant).
+        """
+        if self._combined is None:
+            return []
+
+        line_hits: Dict[int, List[str]] = {}
+        # rule index -> {block header offset: header text}
+        headers: Dict[int, Dict[int, str]] = {}
+        # rule index -> {block header offset: [matching child lines]}
+        children: Dict[int, Dict[int, List[str]]] = {}
+        top_level: Optional[List[int]] = None
+
+        search = self._combined.search
+        pos = 0
+        end = len(text)
+        while pos <= end:
+            m = search(text, pos)
+            if m is None:
+                break
+            start = text.rfind("\n", 0, m.start()) + 1
+            stop = text.find("\n", start)
+            if stop == -1:
+                stop = end
+            line = text[start:stop]
+            pos = stop + 1
+
+            if self._any_line and self._any_line.search(line):
+                for index, rx in self._line:
+                    if rx.search(line):
+                        line_hits.setdefault(index, []).append(line)
+
+            if not line or not line[0].isspace():
+                if self._any_header and self._any_header.search(line):
+                    for index, rx in self._header:
+                        if rx.search(line):
+                            headers.setdefault(index, {})[start] = line
+                continue
+
+            if not (self._any_child and self._any_child.search(line)):
+                continue
+            matched = [index for index, rx in self._child if rx.search(line)]
+            if not matched:
+                continue
+            if top_level is None:
+                top_level = [t.start() for t in _TOP_LEVEL.finditer(text)]
+            i = bisect_right(top_level, start) - 1
+            if i < 0:
+                continue
+            for index in matched:
+                children.setdefault(index, {}).setdefault(top_level[i], []).append(line)
+
+        violations: List[Violation] = []
+        for index, rule in enumerate(self.rules):
+            if rule.block is None:
+                hits = line_hits.get(index, [])
+                if rule.kind == "required" and not hits:
+                    violations.append(Violation(rule.id))
+                elif rule.kind == "forbidden":
+                    violations.extend(Violation(rule.id, line=h) for h in hits)
+                continue
+
+            rule_children = children.get(index, {})
+            for offset, header in headers.get(index, {}).items():
+                found = rule_children.get(offset, [])
+                if rule.kind == "required" and not found:
+                    violations.append(Violation(rule.id, block=header))
+                elif rule.kind == "forbidden":
+                    violations.extend(
+                        Violation(rule.id, block=header, line=h) for h in found
+                    )
+        return violations
+
+
+class ComplianceCache:
+    """
+    Persistent cache of evaluation results keyed by config hash.
+
+    One gzip JSON file is kept per rule-set fingerprint, so a rule change simply
+    starts a new, empty namespace. Entries are kept in least-recently-used order;
+    beyond `max_entries` the oldest are dropped, so hashes of configs that have
+    since changed do not accumulate forever.
+
+    Args:
+      cache_dir (str): Directory holding the cache files.
+      fingerprint (str): RuleSet fingerprint.
+      max_entries (int): Maximum number of cached config hashes.
+    """
+
+    def __init__(
+        self, cache_dir: str, fingerprint: str, max_entries: int = 100_000
+    ) -> None:
+        self.path = Path(cache_dir) / f"{fingerprint[:16]}.json.gz"
+        self.max_entries = max(1, max_entries)
+        self._entries: Dict[str, List[List[Optional[str]]]] = {}
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with gzip.open(self.path, "rb") as f:
+                    self._entries = json.loads(f.read())
+            except (OSError, ValueError) as exc:
+                logger.warning(f"⚠️  Ignoring unreadable compliance cache: {exc}")
+
+    def get(self, config_hash: str) -> Optional[List[Violation]]:
+        entry = self._entries.pop(config_hash, None)
+        if entry is None:
+            return None
+        self._entries[config_hash] = entry  # most recently used
+        self._dirty = True
+        return [Violation(rule_id=str(v[0]), block=v[1], line=v[2]) for v in entry]
+
+    def put(self, config_hash: str, violations: List[Violation]) -> None:
+        self._entries.pop(config_hash, None)
+        self._entries[config_hash] = [list(v) for v in violations]
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._dirty = True
+
+    def save(self) -> None:
+        """
+        Atomically writes the cache if anything changed.
+        """
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(json.dumps(self._entries, separators=(",", ":")).encode())
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+# Process-pool worker state, installed once per worker by _init_worker().
+_worker_ruleset: Optional[RuleSet] = None
+
+
+def _init_worker(rules: List[ComplianceRule]) -> None:
+    global _worker_ruleset
+    _worker_ruleset = RuleSet(rules)
+
+
+def _evaluate_location(location: str) -> List[Violation]:
+    assert _worker_ruleset is not None
+    return _worker_ruleset.evaluate(read_config(location))
+
+
+def evaluate_configs(
+    ruleset: RuleSet,
+    items: Iterable[Tuple[str, str, str]],
+    cache: Optional[ComplianceCache] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, List[Violation]]:
+    """
+    Evaluates many stored configs, skipping those already cached.
+
+    Args:
+      ruleset (RuleSet): Compiled rules.
+      items (Iterable[Tuple[str, str, str]]): (hostname, config_hash, location).
+      cache (Optional[ComplianceCache]): Result cache; updated in place.
+      workers (Optional[int]): Process count (default: CPU count).
+
+    Returns:
+      Dict[str, List[Violation]]: Violations per hostname.
+    """
+    results: Dict[str, List[Violation]] = {}
+    todo: List[Tuple[str, str, str]] = []
+    for hostname, config_hash, location in items:
+        cached = cache.get(config_hash) if cache else None
+        if cached is not None:
+            results[hostname] = cached
+        else:
+            todo.append((hostname, config_hash, location))
+
+    if len(todo) < _PARALLEL_THRESHOLD or workers == 1:
+        evaluated = [ruleset.evaluate(read_config(loc)) for _, _, loc in todo]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(ruleset.rules,)
+        ) as pool:
+            evaluated = list(
+                pool.map(_evaluate_location, [loc for _, _, loc in todo], chunksize=32)
+            )
+
+    for (hostname, config_hash, _), violations in zip(todo, evaluated):
+        results[hostname] = violations
+        if cache:
+            cache.put(config_hash, violations)
+
+    logger.info(
+        f"Compliance: evaluated {len(todo)} config(s), "
+        f"{len(results) - len(todo)} served from cache"
+    )
+    return results
+
+
+def run_compliance_stage(
+    report: RunReport,
+    rules_file: str,
+    cache_dir: str,
+    workers: Optional[int] = None,
+    cache_max_entries: int = 100_000,
+) -> Dict[str, List[Violation]]:
+    """
+    Evaluates every successfully collected config of a run.
+
+    Args:
+      report (RunReport): Report of the run whose configs are checked.
+      rules_file (str): Path to the rules YAML.
+      cache_dir (str): Directory for the result cache.
+      workers (Optional[int]): Process count (default: CPU count).
+      cache_max_entries (int): Cap on cached config hashes (least recently used
+        are dropped).
+
+    Returns:
+      Dict[str, List[Violation]]: Violations per hostname.
+    """
+    ruleset = RuleSet(load_rules(rules_file))
+    cache = ComplianceCache(cache_dir, ruleset.fingerprint, cache_max_entries)
+
+    items = [
+        (row["hostname"], row["config_hash"], row["output_path"])
+        for row in report.rows()
+        if row["status"] == DeviceStatus.SUCCESS
+    ]
+    results = evaluate_configs(ruleset, items, cache=cache, workers=workers)
+    cache.save()
+
+    failing = sum(1 for v in results.values() if v)
+    logger.info(
+        f"Compliance: {len(results) - failing} compliant, {failing} non-compliant"
+    )
+    return results
+
+
+def save_results(results: Dict[str, List[Violation]], path: Path) -> Path:
+    """
+    Writes compliance results as gzip JSON: {hostname: [[rule_id, block, line], ...]}.
+
+    Args:
+      results (Dict[str, List[Violation]]): Output of evaluate_configs().
+      path (Path): Destination file.
+
+    Returns:
+      Path: The written path.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    payload = {host: [list(v) for v in vs] for host, vs in results.items()}
+    with gzip.open(tmp_path, "wb") as f:
+        f.write(json.dumps(payload, separators=(",", ":")).encode())
+    os.replace(tmp_path, path)
+    return path
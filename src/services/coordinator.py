@@ -0,0 +1,396 @@
+"""
+Job Coordinator Service
+
+Coordinates collection jobs that run at the same time on one host (e.g. the
+weekly full backup, ad-hoc per-site pulls, and compliance re-collections), so
+together they fetch each device once and stay within fleet-wide limits.
+
+Contents:
+  - JobCoordinator: Shared-state admission control and result sharing for one job.
+  - open_coordinator(): Creates and registers a JobCoordinator from settings.
+
+Dependencies:
+  - sqlite3
+  - zlib
+  - src.services.backends (FetchOutcome, BackendFetchError)
+
+Notes:
+  - State lives in one SQLite file (`coordinator.path`) shared by every process;
+    each decision is one `BEGIN IMMEDIATE` transaction, so SQLite's file lock
+    serializes jobs across processes and threads.
+  - Dedupe: a fetch is identified by (hostname, FetchEngine.fetch_key()). While
+    one job fetches a device, other jobs wait for it and reuse its config
+    instead of connecting; results stay shareable for `share_seconds`.
+    Failures are not shared: the next job waiting for the device fetches it itself.
+  - Caps: at most `max_devices` fetches are in flight across all jobs, and at
+    most `max_per_site` per location (devices without a location are capped
+    only globally). Each process applies its own settings, so jobs sharing a
+    state file should share these values.
+  - Fair share: each active job (fetching or waiting for a slot) may hold
+    max_devices // active_jobs slots (at least one); a job may go over its
+    share only while no other job is waiting for a slot.
+  - Jobs whose process has exited are reaped (their in-flight slots released)
+    by the next job that checks, so a killed run never blocks the others.
+  - A shared result is reported with 0 attempts: this job made no connection.
+  - A device that waits longer than `wait_timeout` for a slot or a result, or
+    whose admission hits a state file error, fails with BackendFetchError
+    (0 attempts), like any other failed fetch. If the result cannot be
+    shared afterwards, that is only logged.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple
+
+from src.config.schema import CoordinatorConfig
+from src.models.inventory import DeviceRecord
+from src.services.backends import BackendFetchError, FetchOutcome
+from src.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds between checks for exited jobs and expired results.
+_HOUSEKEEPING_SECONDS = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    started REAL NOT NULL,
+    waiting INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS inflight (
+    hostname TEXT NOT NULL,
+    fetch_key TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    site TEXT,
+    started REAL NOT NULL,
+    PRIMARY KEY (hostname, fetch_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS inflight_job ON inflight (job_id);
+CREATE INDEX IF NOT EXISTS inflight_site ON inflight (site);
+CREATE TABLE IF NOT EXISTS results (
+    hostname TEXT NOT NULL,
+    fetch_key TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    finished REAL NOT NULL,
+    backend TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (hostname, fetch_key)
+) WITHOUT ROWID;
+"""
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobCoordinator:
+    """
+    One job's handle on the shared coordinator state.
+
+    Args:
+      db_path (str): Shared state file (created on first use).
+      name (str): Job name for logs (e.g. the run id).
+      max_devices (int): Fetches in flight across all jobs.
+      max_per_site (Optional[int]): Fetches in flight per location (None: no cap).
+      share_seconds (float): How long a finished fetch is reused by other jobs
+        (0 shares in-flight fetches only).
+      poll_interval (float): Seconds between admission checks while waiting.
+      wait_timeout (Optional[float]): Longest a device waits for a slot or a
+        result (None: no limit).
+
+    Attributes:
+      job_id (str): Unique id of this job in the shared state.
+      fetched (int): Devices this job fetched itself.
+      shared (int): Devices served from another job's fetch.
+      wait_seconds (float): Total time workers waited for a slot or a result.
+
+    Example:
+      with JobCoordinator("reports/coordinator.sqlite3", run_id, 32, 8) as coord:
+          outcome = coord.fetch(device, engine.fetch_key(device),
+                                lambda: engine.fetch(device))
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        name: str,
+        max_devices: int,
+        max_per_site: Optional[int] = None,
+        share_seconds: float = 60.0,
+        poll_interval: float = 0.05,
+        wait_timeout: Optional[float] = None,
+    ) -> None:
+        self.db_path = db_path
+        self.job_id = f"{name}.{uuid.uuid4().hex[:8]}"
+        self.max_devices = max_devices
+        self.max_per_site = max_per_site
+        self.share_seconds = share_seconds
+        self.poll_interval = poll_interval
+        self.wait_timeout = wait_timeout
+        self.fetched = 0
+        self.shared = 0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+        self._next_housekeeping = 0.0
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            db_path, timeout=60, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> "JobCoordinator":
+        self.register()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def register(self) -> None:
+        """
+        Adds this job to the shared state.
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, pid, started) VALUES (?, ?, ?)",
+                (self.job_id, os.getpid(), time.time()),
+            )
+
+    def close(self) -> None:
+        """
+        Removes this job (and any slots it still holds) and closes the database.
+        """
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM inflight WHERE job_id = ?", (self.job_id,))
+            conn.execute("DELETE FROM jobs WHERE job_id = ?", (self.job_id,))
+        self._conn.close()
+
+    def fetch(
+        self,
+        device: DeviceRecord,
+        fetch_key: str,
+        fetch: Callable[[], FetchOutcome],
+    ) -> FetchOutcome:
+        """
+        Returns the device's config, fetched by this job or shared by another.
+
+        Args:
+          device (DeviceRecord): Inventory entry (`location` is its site).
+          fetch_key (str): What is fetched (see FetchEngine.fetch_key()).
+          fetch (Callable[[], FetchOutcome]): Fetches the device; called only
+            once this job holds a slot and no other job is fetching the same key.
+
+        Returns:
+          FetchOutcome: The outcome of `fetch`, or a shared one with 0 attempts.
+
+        Raises:
+          BackendFetchError: On a wait past `wait_timeout` or a state file error
+            before fetching.
+          Exception: Whatever `fetch` raises (the slot is released first).
+        """
+        key = (device.hostname, fetch_key)
+        backend = fetch_key.split(":", 1)[0]
+        try:
+            shared = self._acquire(device, key)
+        except (sqlite3.Error, TimeoutError) as exc:
+            raise BackendFetchError(exc, 0, backend) from exc
+        if shared is not None:
+            return shared
+
+        try:
+            outcome = fetch()
+        except BaseException:
+            self._release(key)
+            raise
+        data = zlib.compress(outcome.text.encode(), 1)
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    "DELETE FROM inflight WHERE hostname = ? AND fetch_key = ?", key
+                )
+                if self.share_seconds > 0:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                        (*key, self.job_id, time.time(), outcome.backend, data),
+                    )
+        except sqlite3.Error as exc:
+            logger.warning(f"⚠️  {device.hostname}: result not shared: {exc}")
+        self.fetched += 1
+        return outcome
+
+    def _acquire(
+        self, device: DeviceRecord, key: Tuple[str, str]
+    ) -> Optional[FetchOutcome]:
+        """
+        Waits until another job's result is available (returned) or this job
+        holds a slot for the fetch (None).
+
+        Raises:
+          TimeoutError: After `wait_timeout` seconds.
+          sqlite3.Error: On state file errors.
+        """
+        hostname = device.hostname
+        waiting = False
+        since = time.monotonic()
+        deadline = None if self.wait_timeout is None else since + self.wait_timeout
+        try:
+            while True:
+                with self._transaction() as conn:
+                    self._housekeeping(conn)
+                    row = conn.execute(
+                        "SELECT job_id, backend, data FROM results "
+                        "WHERE hostname = ? AND fetch_key = ?",
+                        key,
+                    ).fetchone()
+                    if row is not None:
+                        waiting = self._set_waiting(conn, waiting, False)
+                        self.shared += 1
+                        self.wait_seconds += time.monotonic() - since
+                        logger.info(f"{hostname}: using config fetched by {row[0]}")
+                        text = zlib.decompress(row[2]).decode()
+                        return FetchOutcome(text, 0, row[1])
+
+                    holder = conn.execute(
+                        "SELECT 1 FROM inflight WHERE hostname = ? AND fetch_key = ?",
+                        key,
+                    ).fetchone()
+                    if holder is None and self._admit(conn, device.location):
+                        waiting = self._set_waiting(conn, waiting, False)
+                        conn.execute(
+                            "INSERT INTO inflight VALUES (?, ?, ?, ?, ?)",
+                            (*key, self.job_id, device.location, time.time()),
+                        )
+                        self.wait_seconds += time.monotonic() - since
+                        return None
+                    # Only jobs blocked on capacity count as waiting for a slot.
+                    waiting = self._set_waiting(conn, waiting, holder is None)
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.wait_seconds += time.monotonic() - since
+                    raise TimeoutError(
+                        f"no coordinator slot or shared result within "
+                        f"{self.wait_timeout:g}s"
+                    )
+                time.sleep(self.poll_interval)
+        except BaseException:
+            if waiting:
+                try:
+                    with self._transaction() as conn:
+                        self._set_waiting(conn, True, False)
+                except sqlite3.Error:
+                    pass
+            raise
+
+    def _release(self, key: Tuple[str, str]) -> None:
+        """
+        Gives up this job's slot for `key` after a failed fetch.
+        """
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    "DELETE FROM inflight WHERE hostname = ? AND fetch_key = ?", key
+                )
+        except sqlite3.Error as exc:
+            logger.warning(f"⚠️  {key[0]}: slot not released: {exc}")
+
+    def _set_waiting(
+        self, conn: sqlite3.Connection, waiting: bool, wanted: bool
+    ) -> bool:
+        if waiting != wanted:
+            conn.execute(
+                "UPDATE jobs SET waiting = waiting + ? WHERE job_id = ?",
+                (1 if wanted else -1, self.job_id),
+            )
+        return wanted
+
+    def _admit(self, conn: sqlite3.Connection, site: Optional[str]) -> bool:
+        """
+        Returns True if this job may start one more fetch at `site` now.
+        """
+        total = conn.execute("SELECT COUNT(*) FROM inflight").fetchone()[0]
+        if total >= self.max_devices:
+            return False
+        if self.max_per_site is not None and site is not None:
+            at_site = conn.execute(
+                "SELECT COUNT(*) FROM inflight WHERE site = ?", (site,)
+            ).fetchone()[0]
+            if at_site >= self.max_per_site:
+                return False
+
+        mine = 0
+        active = 0
+        others_waiting = False
+        for job_id, waiting, running in conn.execute(
+            "SELECT j.job_id, j.waiting, COUNT(i.job_id) FROM jobs j "
+            "LEFT JOIN inflight i ON i.job_id = j.job_id GROUP BY j.job_id"
+        ):
+            if job_id == self.job_id:
+                mine = running
+                active += 1
+            elif waiting or running:
+                active += 1
+                others_waiting = others_waiting or waiting > 0
+        if mine < max(1, self.max_devices // max(active, 1)):
+            return True
+        return not others_waiting
+
+    def _housekeeping(self, conn: sqlite3.Connection) -> None:
+        """
+        Releases the slots of jobs whose process exited and drops expired results.
+        """
+        now = time.monotonic()
+        if now < self._next_housekeeping:
+            return
+        self._next_housekeeping = now + _HOUSEKEEPING_SECONDS
+
+        for job_id, pid in conn.execute("SELECT job_id, pid FROM jobs").fetchall():
+            if pid != os.getpid() and not _pid_alive(pid):
+                logger.warning(f"⚠️  Releasing slots of exited job {job_id}")
+                conn.execute("DELETE FROM inflight WHERE job_id = ?", (job_id,))
+                conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+        conn.execute(
+            "DELETE FROM results WHERE finished < ?",
+            (time.time() - self.share_seconds,),
+        )
+
+
+def open_coordinator(settings: CoordinatorConfig, name: str) -> JobCoordinator:
+    """
+    Creates a JobCoordinator from settings and registers the job.
+    """
+    coordinator = JobCoordinator(
+        settings.path,
+        name,
+        max_devices=settings.max_devices,
+        max_per_site=settings.max_per_site,
+        share_seconds=settings.share_seconds,
+        poll_interval=settings.poll_interval,
+        wait_timeout=settings.wait_timeout,
+    )
+    coordinator.register()
+    return coordinator
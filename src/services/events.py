@@ -0,0 +1,366 @@
+"""
+Device Events Service
+
+Streams one event per device to external consumers as soon as the device
+completes, so config changes can be acted on within seconds of collection.
+
+Contents:
+  - EventKind: Event type values.
+  - ChangeSummary: Comparison of a fetched config with the device's last stored one.
+  - load_baseline(): Each device's newest stored config before this run.
+  - summarize_change(): Classifies a fetched config against the baseline.
+  - build_event(): Builds the JSON event for one run report row.
+  - EventStream: Bounded buffer plus a delivery thread feeding the sinks.
+  - open_event_stream(): Creates and starts an EventStream from settings.
+
+Dependencies:
+  - difflib
+  - src.utils.event_sinks
+  - src.utils.file_utils
+  - src.utils.config_parser (changed sections)
+  - src.services.catalog (baseline lookup when the catalog is enabled)
+
+Notes:
+  - Event kinds:
+      collected   fetched and stored; no earlier config to compare with
+      unchanged   identical to the last stored config
+      changed     differs from the last stored config; carries a diff summary
+                  and the top-level sections (e.g. `interface Gi0/1`) that changed
+      failed      fetch or write failed; carries the error
+  - The baseline comes from the config catalog (`catalog.enabled`), otherwise
+    from a scan of output_dir; it is loaded once per run, and previous configs
+    are read (and diffed) by the worker that fetched the device, before its new
+    config is queued for writing.
+  - Changed configs are parsed into block trees to find the changed sections;
+    trees are kept in the parse cache (`events.parse_cache_dir`) by config hash,
+    so a config parsed as this run's result is not parsed again as the next
+    run's baseline.
+  - publish() never blocks: when `events.buffer_size` events are pending, new
+    events are dropped and counted. A sink that fails is skipped for
+    _SINK_RETRY_SECONDS, and the events it misses are counted as failed.
+"""
+
+import difflib
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.config.schema import AppConfig, EventsConfig
+from src.models.run_report import DeviceStatus
+from src.utils.config_parser import changed_sections, parse_config, ParseCache
+from src.utils.event_sinks import Event, EventSink, SINKS
+from src.utils.file_utils import iter_stored_configs, read_config
+from src.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds a failing sink is skipped before the next delivery attempt.
+_SINK_RETRY_SECONDS = 5.0
+
+# hostname -> (config hash if known, location) of the newest stored config.
+Baseline = Dict[str, Tuple[Optional[str], str]]
+
+
+class EventKind:
+    """
+    Event type values.
+    """
+
+    COLLECTED = "collected"
+    UNCHANGED = "unchanged"
+    CHANGED = "changed"
+    FAILED = "failed"
+
+
+class ChangeSummary(NamedTuple):
+    """
+    Result of comparing a fetched config with the device's baseline.
+
+    Attributes:
+      kind (str): EventKind.COLLECTED, UNCHANGED, or CHANGED.
+      previous_hash (Optional[str]): SHA-256 of the baseline config, if known.
+      previous_path (Optional[str]): Location of the baseline config.
+      added (int): Lines added.
+      removed (int): Lines removed.
+      diff (Tuple[str, ...]): First lines of the unified diff (no context lines).
+      sections (Tuple[str, ...]): First top-level lines whose block changed.
+    """
+
+    kind: str
+    previous_hash: Optional[str] = None
+    previous_path: Optional[str] = None
+    added: int = 0
+    removed: int = 0
+    diff: Tuple[str, ...] = ()
+    sections: Tuple[str, ...] = ()
+
+
+def load_baseline(config: AppConfig, date_stamp: str) -> Baseline:
+    """
+    Returns each device's newest stored config dated on or before date_stamp.
+
+    Args:
+      config (AppConfig): Settings (catalog, output_dir, storage).
+      date_stamp (str): Run date (YYYYMMDD).
+
+    Returns:
+      Baseline: hostname -> (config hash or None, location).
+
+    Notes:
+      - Uses the catalog when enabled and present (hashes included), otherwise
+        walks output_dir (hashes unknown; configs are compared by content).
+    """
+    if config.catalog.enabled and Path(config.catalog.path).exists():
+        from src.services.catalog import ConfigCatalog
+
+        with ConfigCatalog(config.catalog.path) as catalog:
+            return {
+                entry.hostname: (entry.config_hash, entry.location)
+                for entry in catalog.snapshot(date_stamp)
+            }
+
+    newest: Dict[str, Tuple[str, str]] = {}
+    for stored in iter_stored_configs(config.output_dir, config.storage.archive_dir):
+        if stored.date_stamp > date_stamp:
+            continue
+        current = newest.get(stored.hostname)
+        if current is None or stored.date_stamp > current[0]:
+            newest[stored.hostname] = (stored.date_stamp, stored.location)
+    return {host: (None, location) for host, (_, location) in newest.items()}
+
+
+def summarize_change(
+    text: str,
+    config_hash: str,
+    previous: Optional[Tuple[Optional[str], str]],
+    diff_lines: int = 20,
+    parse_cache: Optional[ParseCache] = None,
+) -> ChangeSummary:
+    """
+    Classifies a fetched config against its baseline entry.
+
+    Args:
+      text (str): Fetched config.
+      config_hash (str): SHA-256 of `text`.
+      previous (Optional[Tuple[Optional[str], str]]): Baseline entry, if any.
+      diff_lines (int): Diff lines (and changed sections) to keep.
+      parse_cache (Optional[ParseCache]): Cache of parsed trees (None: parse
+        without caching).
+
+    Returns:
+      ChangeSummary: Kind, baseline reference, and line counts.
+
+    Notes:
+      - A baseline that can no longer be read is reported as `changed` without
+        a diff when its hash differs, or as `collected` when its hash is unknown.
+    """
+    if previous is None:
+        return ChangeSummary(EventKind.COLLECTED)
+    previous_hash, location = previous
+    if previous_hash == config_hash:
+        return ChangeSummary(EventKind.UNCHANGED, previous_hash, location)
+
+    try:
+        old = read_config(location)
+    except (OSError, KeyError, ValueError) as exc:
+        logger.debug(f"Baseline {location} unreadable: {exc}")
+        kind = EventKind.COLLECTED if previous_hash is None else EventKind.CHANGED
+        return ChangeSummary(kind, previous_hash, location)
+    if old == text:
+        return ChangeSummary(EventKind.UNCHANGED, previous_hash, location)
+
+    added = removed = 0
+    diff: List[str] = []
+    for line in difflib.unified_diff(
+        old.splitlines(), text.splitlines(), n=0, lineterm=""
+    ):
+        if line.startswith(("---", "+++", "@@")):
+            continue
+        if line.startswith("+"):
+            added += 1
+        else:
+            removed += 1
+        if len(diff) < diff_lines:
+            diff.append(line)
+    if parse_cache is None:
+        sections = changed_sections(parse_config(old), parse_config(text))
+    else:
+        sections = changed_sections(
+            parse_cache.parse(old, previous_hash), parse_cache.parse(text, config_hash)
+        )
+    return ChangeSummary(
+        EventKind.CHANGED,
+        previous_hash,
+        location,
+        added,
+        removed,
+        tuple(diff),
+        tuple(sections[:diff_lines]),
+    )
+
+
+def build_event(
+    run_id: str,
+    row: Dict[str, Any],
+    change: Optional[ChangeSummary] = None,
+    error: Optional[str] = None,
+) -> Event:
+    """
+    Builds the JSON event for one device.
+
+    Args:
+      run_id (str): Run identifier.
+      row (Dict[str, Any]): The device's RunReport row.
+      change (Optional[ChangeSummary]): Comparison with the baseline (successes).
+      error (Optional[str]): Error message (failures).
+
+    Returns:
+      Event: Keys with None values are omitted.
+    """
+    if row["status"] == DeviceStatus.FAILED:
+        kind = EventKind.FAILED
+    else:
+        kind = change.kind if change is not None else EventKind.COLLECTED
+
+    event: Event = {
+        "event": kind,
+        "run_id": run_id,
+        "time": datetime.now(timezone.utc).isoformat(),
+        **{key: value for key, value in row.items() if value is not None},
+    }
+    if error is not None:
+        event["error"] = error
+    if change is not None and kind != EventKind.FAILED:
+        if change.previous_hash is not None:
+            event["previous_hash"] = change.previous_hash
+        if change.previous_path is not None:
+            event["previous_path"] = change.previous_path
+        if kind == EventKind.CHANGED:
+            event["diff"] = {
+                "added": change.added,
+                "removed": change.removed,
+                "lines": list(change.diff),
+                "sections": list(change.sections),
+            }
+    return event
+
+
+class EventStream:
+    """
+    Non-blocking event publisher with a bounded buffer and one delivery thread.
+
+    Args:
+      sinks (Sequence[EventSink]): Delivery targets, each sent every batch.
+      buffer_size (int): Pending events kept before new ones are dropped.
+      batch_size (int): Most events per sink send.
+
+    Attributes:
+      published (int): Events accepted into the buffer.
+      dropped (int): Events rejected because the buffer was full.
+      failed (Dict[str, int]): Events not delivered, per sink target.
+
+    Example:
+      with EventStream([JSONLinesSink("events.jsonl")]) as stream:
+          stream.publish({"event": "collected", "hostname": "r1"})
+    """
+
+    def __init__(
+        self, sinks: Sequence[EventSink], buffer_size: int = 4096, batch_size: int = 256
+    ) -> None:
+        self.sinks = list(sinks)
+        self.batch_size = batch_size
+        self.published = 0
+        self.dropped = 0
+        self.failed: Dict[str, int] = {sink.target: 0 for sink in self.sinks}
+        self._queue: "queue.Queue[Event]" = queue.Queue(buffer_size)
+        self._retry_at = [0.0] * len(self.sinks)
+        self._closed = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="event-stream", daemon=True
+        )
+
+    def __enter__(self) -> "EventStream":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """
+        Starts the delivery thread.
+        """
+        self._thread.start()
+
+    def publish(self, event: Event) -> bool:
+        """
+        Queues one event for delivery without blocking.
+
+        Returns:
+          bool: False if the buffer was full and the event was dropped.
+        """
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.published += 1
+        return True
+
+    def close(self) -> None:
+        """
+        Delivers the events still buffered, then stops the delivery thread.
+        """
+        if not self._thread.is_alive():
+            return
+        self._closed.set()
+        self._thread.join()
+        for sink in self.sinks:
+            sink.close()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if self._closed.is_set():
+                    return
+                continue
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._deliver(batch)
+
+    def _deliver(self, batch: List[Event]) -> None:
+        now = time.monotonic()
+        for i, sink in enumerate(self.sinks):
+            if now < self._retry_at[i]:
+                self.failed[sink.target] += len(batch)
+                continue
+            try:
+                sink.send(batch)
+            except Exception as exc:
+                self.failed[sink.target] += len(batch)
+                self._retry_at[i] = time.monotonic() + _SINK_RETRY_SECONDS
+                logger.warning(
+                    f"⚠️  Event sink {sink.name} {sink.target} failed: {exc}; "
+                    f"pausing it for {_SINK_RETRY_SECONDS:.0f}s"
+                )
+
+
+def open_event_stream(settings: EventsConfig) -> EventStream:
+    """
+    Creates the configured sinks and starts an EventStream.
+    """
+    sinks = [
+        SINKS[sink.type](sink.target, timeout=sink.timeout) for sink in settings.sinks
+    ]
+    stream = EventStream(sinks, settings.buffer_size, settings.batch_size)
+    stream.start()
+    return stream
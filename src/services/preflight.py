@@ -0,0 +1,342 @@
+"""
+Pre-flight Service
+
+Checks, in parallel, whether each device in the inventory will be reachable and
+collectable before the real collection run.
+
+Contents:
+  - probe_device(): Runs the staged checks for one device.
+  - run_preflight(): Probes the whole inventory and saves a ReadinessReport.
+
+Dependencies:
+  - socket
+  - paramiko (key exchange and auth stages only, imported on first use)
+  - src.models.readiness_report
+  - src.services.backends (target and port per device)
+  - src.utils.device_loader
+
+Notes:
+  - Stages run in order and stop at the first failure:
+      dns     resolve the address the collector connects to (`ip`, else
+              `hostname`)
+      tcp     connect to the port of the device's retrieval backend (SSH,
+              NETCONF, or HTTP), or `preflight.port` when set
+      banner  read the server's SSH identification line
+      kex     complete key exchange (no authentication)
+      auth    authenticate with the collector credentials, then disconnect
+              without opening a session (opt-in: failed attempts may count
+              toward account lockout)
+  - HTTP devices stop after tcp: the SSH stages do not apply to them.
+  - A device whose probe raises unexpectedly is reported as failed at the
+    `probe` stage; the other devices are still probed.
+  - Each stage is bounded by `preflight.timeout` (DNS lookups run on a helper
+    thread, since getaddrinfo() has no timeout of its own, and the auth stage
+    overrides paramiko's 30s default), and at most `preflight.workers` devices
+    are probed at once, so a fleet where every device hangs finishes in about
+    len(devices) / workers * timeout * 2 seconds. A lookup that times out keeps
+    its helper thread until the resolver gives up.
+"""
+
+import socket
+import threading
+import time
+from concurrent.futures import (
+    as_completed,
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeout,
+)
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+
+from src.config.config import load_config
+from src.config.schema import PreflightConfig
+from src.models.inventory import DeviceRecord
+from src.models.readiness_report import DeviceReadiness, ProbeStage, ReadinessReport
+from src.models.run_report import new_run_id
+from src.services.backends import FetchEngine, HTTPBackend
+from src.utils.device_loader import load_inventory
+from src.utils.env_utils import get_env_var
+from src.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+# SSH identification lines are at most 255 bytes (RFC 4253 section 4.2); servers
+# may send other lines first.
+_MAX_BANNER_LINES = 16
+
+
+def _error(exc: BaseException) -> str:
+    detail = str(exc)
+    return f"{type(exc).__name__}: {detail}" if detail else type(exc).__name__
+
+
+def _resolve(host: str, port: int, timeout: float) -> Tuple[Any, ...]:
+    """
+    Returns the first getaddrinfo() entry for a TCP connection to host:port.
+
+    Raises:
+      TimeoutError: If the lookup takes longer than `timeout`.
+      OSError / UnicodeError: On resolution errors.
+    """
+    result: "Future[Tuple[Any, ...]]" = Future()
+
+    def lookup() -> None:
+        try:
+            result.set_result(
+                socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+            )
+        except BaseException as exc:
+            result.set_exception(exc)
+
+    # A daemon thread per lookup: a hung resolver never blocks a probe worker
+    # beyond `timeout`, nor the interpreter's exit.
+    threading.Thread(target=lookup, name="preflight-dns", daemon=True).start()
+    try:
+        return result.result(timeout=timeout)
+    except FutureTimeout:
+        raise TimeoutError(f"lookup timed out after {timeout:g}s") from None
+
+
+def _read_banner(sock: socket.socket) -> str:
+    """
+    Reads lines until the SSH identification string.
+
+    Raises:
+      ValueError: If no `SSH-` line arrives within the first lines.
+      OSError: On timeout or connection errors.
+    """
+    reader = sock.makefile("rb")
+    try:
+        for _ in range(_MAX_BANNER_LINES):
+            line = reader.readline(256)
+            if not line:
+                raise ValueError("connection closed before SSH banner")
+            if line.startswith(b"SSH-"):
+                return line.rstrip(b"\r\n").decode("ascii", "replace")
+        raise ValueError("no SSH banner received")
+    finally:
+        reader.close()
+
+
+def _ssh_handshake(
+    sock: socket.socket,
+    timeout: float,
+    credentials: Optional[Tuple[str, str]],
+) -> Tuple[Optional[str], Optional[str], float, Optional[str], Optional[str]]:
+    """
+    Runs banner + key exchange (and optionally password auth) with paramiko.
+
+    Returns:
+      Tuple: (banner, host_key, auth_ms, failed_stage, error).
+    """
+    import paramiko
+
+    transport = paramiko.Transport(sock)
+    transport.banner_timeout = timeout
+    transport.handshake_timeout = timeout
+    transport.auth_timeout = timeout
+    try:
+        try:
+            transport.start_client(timeout=timeout)
+        except Exception as exc:
+            stage = ProbeStage.KEX if transport.remote_version else ProbeStage.BANNER
+            return transport.remote_version or None, None, 0.0, stage, _error(exc)
+
+        banner = transport.remote_version
+        host_key = transport.get_remote_server_key().get_name()
+        if credentials is None:
+            return banner, host_key, 0.0, None, None
+
+        started = time.perf_counter()
+        try:
+            transport.auth_password(*credentials)
+        except Exception as exc:
+            auth_ms = (time.perf_counter() - started) * 1000
+            return banner, host_key, auth_ms, ProbeStage.AUTH, _error(exc)
+        auth_ms = (time.perf_counter() - started) * 1000
+        return banner, host_key, auth_ms, None, None
+    finally:
+        transport.close()
+
+
+def probe_device(
+    device: DeviceRecord,
+    settings: PreflightConfig,
+    credentials: Optional[Tuple[str, str]] = None,
+    port: Optional[int] = None,
+    ssh: bool = True,
+) -> DeviceReadiness:
+    """
+    Runs the pre-flight stages for one device.
+
+    Args:
+      device (DeviceRecord): Inventory entry (probed at `ip`, else `hostname`).
+      settings (PreflightConfig): Port override, timeout, and stage selection.
+      credentials (Optional[Tuple[str, str]]): (username, password) enables the
+        auth stage.
+      port (Optional[int]): Port to probe when `settings.port` is not set
+        (default: 22).
+      ssh (bool): Run the SSH stages after tcp (False for HTTP devices).
+
+    Returns:
+      DeviceReadiness: Stage timings and the first failure, if any.
+    """
+    result = DeviceReadiness(device.hostname, device.location, device.type)
+    timeout = settings.timeout
+    port = settings.port or port or 22
+
+    # dns
+    started = time.perf_counter()
+    try:
+        family, socktype, proto, _, sockaddr = _resolve(
+            device.ip or device.hostname, port, timeout
+        )
+    except (OSError, UnicodeError) as exc:
+        return result._replace(
+            failed_stage=ProbeStage.DNS,
+            error=_error(exc),
+            dns_ms=(time.perf_counter() - started) * 1000,
+        )
+    result = result._replace(
+        address=str(sockaddr[0]), dns_ms=(time.perf_counter() - started) * 1000
+    )
+
+    # tcp
+    started = time.perf_counter()
+    sock = socket.socket(family, socktype, proto)
+    try:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(sockaddr)
+        except OSError as exc:
+            return result._replace(
+                failed_stage=ProbeStage.TCP,
+                error=_error(exc),
+                tcp_ms=(time.perf_counter() - started) * 1000,
+            )
+        result = result._replace(tcp_ms=(time.perf_counter() - started) * 1000)
+        if not ssh:
+            return result
+
+        # banner / kex / auth
+        started = time.perf_counter()
+        if not settings.kex and credentials is None:
+            try:
+                identification = _read_banner(sock)
+            except (OSError, ValueError) as exc:
+                return result._replace(
+                    failed_stage=ProbeStage.BANNER,
+                    error=_error(exc),
+                    ssh_ms=(time.perf_counter() - started) * 1000,
+                )
+            return result._replace(
+                banner=identification, ssh_ms=(time.perf_counter() - started) * 1000
+            )
+
+        banner, host_key, auth_ms, stage, error = _ssh_handshake(
+            sock, timeout, credentials
+        )
+        ssh_ms = (time.perf_counter() - started) * 1000 - auth_ms
+        return result._replace(
+            banner=banner,
+            host_key=host_key,
+            ssh_ms=ssh_ms,
+            auth_ms=auth_ms,
+            failed_stage=stage,
+            error=error,
+        )
+    finally:
+        sock.close()
+
+
+def run_preflight(devices_file: str, auth: bool = False) -> ReadinessReport:
+    """
+    Probes every device in the inventory and saves a readiness report.
+
+    Args:
+      devices_file (str): Path to devices.yaml.
+      auth (bool): Also run the auth-only probe (overrides `preflight.auth`).
+
+    Returns:
+      ReadinessReport: One row per device; also saved under `report_dir` and
+      printed (not-ready devices only) to stdout.
+    """
+    config = load_config()
+    settings = config.preflight
+    devices = load_inventory(devices_file, config.inventory.cache_dir)
+    engine = FetchEngine(config)
+
+    credentials: Optional[Tuple[str, str]] = None
+    stages: List[str] = [ProbeStage.DNS, ProbeStage.TCP, ProbeStage.BANNER]
+    if settings.kex or auth or settings.auth:
+        stages.append(ProbeStage.KEX)
+    if auth or settings.auth:
+        credentials = (
+            get_env_var("SSH_USERNAME", required=True),
+            get_env_var("SSH_PASSWORD", required=True),
+        )
+        stages.append(ProbeStage.AUTH)
+
+    started = datetime.now(timezone.utc)
+    report = ReadinessReport(
+        new_run_id("preflight", started), started.isoformat(), stages
+    )
+    logger.info(
+        f"=== Pre-flight: {len(devices)} device(s), stages {', '.join(stages)} ==="
+    )
+
+    with ThreadPoolExecutor(
+        max_workers=settings.workers, thread_name_prefix="preflight"
+    ) as pool:
+        futures = {
+            pool.submit(
+                probe_device,
+                device,
+                settings,
+                credentials,
+                engine.endpoint(device)[1],
+                engine.backend_name(device) != HTTPBackend.name,
+            ): device
+            for device in devices
+        }
+        for future in as_completed(futures):
+            try:
+                row = future.result()
+            except Exception as exc:
+                device = futures[future]
+                logger.exception(f"❌ {device.hostname}: probe failed: {exc}")
+                row = DeviceReadiness(
+                    device.hostname,
+                    device.location,
+                    device.type,
+                    failed_stage=ProbeStage.PROBE,
+                    error=_error(exc),
+                )
+            report.add(row)
+            if not row.ready:
+                logger.warning(
+                    f"⚠️  {row.hostname}: {row.failed_stage} failed ({row.error})"
+                )
+
+    report.finish(datetime.now(timezone.utc).isoformat())
+    elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+    counts = report.counts()
+
+    logger.info("=== Pre-flight Summary ===")
+    logger.info(f"Total devices: {len(report)} in {elapsed:.1f}s")
+    logger.info(f"Ready:         {counts.get('ready', 0)}")
+    for stage in stages + [ProbeStage.PROBE]:
+        if counts.get(stage):
+            logger.info(f"{stage + ' failed:':<15}{counts[stage]}")
+
+    try:
+        path = report.save(config.report_dir)
+        logger.info(f"Readiness:     {path}")
+    except OSError as exc:
+        logger.error(f"❌ Failed to write readiness report: {exc}")
+
+    not_ready = report.not_ready()
+    if not_ready:
+        print(report.format_table(not_ready))
+    return report
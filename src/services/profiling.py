@@ -0,0 +1,77 @@
+"""
+Profiling Service
+
+Runs a collection under the profiler and saves the results next to its run report.
+
+Contents:
+  - run_profiled(): Profiles collect_device_configs() and reports the hotspots.
+
+Dependencies:
+  - src.utils.profiler
+  - src.services.ssh_collector
+
+Notes:
+  - Results go to <report_dir>/<run_id>.profile/ (see src.utils.profiler for
+    the files); compare two runs with `scripts/compare_profiles.py`.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from src.config.config import load_config
+from src.models.run_report import RunReport
+from src.services.ssh_collector import collect_device_configs
+from src.utils.logger_utils import get_logger
+from src.utils.profiler import load_profile, RunProfiler
+
+logger = get_logger(__name__)
+
+
+def run_profiled(
+    devices_file: Optional[str],
+    dry_run: bool = False,
+    mode: str = "sample",
+    record: Optional[str] = None,
+    replay: Optional[str] = None,
+    replay_speed: Optional[float] = None,
+) -> RunReport:
+    """
+    Collects configs under the profiler and saves the profile.
+
+    Args:
+      devices_file (Optional[str]): Path to devices.yaml.
+      dry_run (bool): Passed to collect_device_configs().
+      mode (str): "sample" (low-overhead wall-clock sampling) or "trace"
+        (deterministic cProfile in every thread).
+      record (Optional[str]): Passed to collect_device_configs().
+      replay (Optional[str]): Passed to collect_device_configs(); profiles the
+        pipeline on a recorded fleet.
+      replay_speed (Optional[float]): Passed to collect_device_configs().
+
+    Returns:
+      RunReport: The collection's report.
+    """
+    config = load_config()
+    with RunProfiler(mode, config.profiling.interval) as profiler:
+        report = collect_device_configs(
+            devices_file,
+            dry_run=dry_run,
+            record=record,
+            replay=replay,
+            replay_speed=replay_speed,
+        )
+
+    try:
+        path = profiler.save(Path(config.report_dir) / f"{report.run_id}.profile")
+    except OSError as exc:
+        logger.error(f"❌ Failed to write profile: {exc}")
+        return report
+
+    logger.info(f"=== Profile ({mode}, {profiler.duration:.1f}s) ===")
+    hotspots = sorted(
+        load_profile(str(path)).items(), key=lambda item: item[1].self_s, reverse=True
+    )
+    for function, times in hotspots[: config.profiling.top]:
+        logger.info(f"{times.self_s:9.3f}s self {times.cum_s:9.3f}s cum  {function}")
+    logger.info(f"Profile:       {path}")
+    return report
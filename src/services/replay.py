@@ -0,0 +1,173 @@
+"""
+Session Record/Replay Service
+
+Records what each device returned during a collection run, and feeds such a
+recording back through the full pipeline (hashing, change events, writer,
+catalog, compliance) without contacting any device.
+
+Contents:
+  - RecordingEngine: FetchEngine that appends every fetch to a capture file.
+  - ReplayEngine: FetchEngine that answers fetches from a capture file.
+  - ReplayedFetchError: Base class of failures re-raised from a capture.
+  - capture_inventory(): The recorded fleet as an Inventory.
+
+Dependencies:
+  - src.services.backends
+  - src.utils.capture
+
+Notes:
+  - Recording happens at the FetchEngine level, which every collector fetch goes
+    through; configs served by another job through the coordinator are not
+    recorded (no device session took place).
+  - Replay speed: None returns recorded results at once (throughput of the
+    pipeline alone); 1.0 starts each device's fetch no earlier than its
+    recorded offset from the start of the run and sleeps its recorded fetch
+    duration, so the worker pool sees the original arrival pattern and
+    per-device latency; 2.0 is twice as fast. Replays that start fewer fetches
+    at once than the recording (smaller pool, other devices file) fall behind
+    the recorded schedule rather than catching up.
+  - Recorded failures are re-raised with the original exception class name and
+    attempts, so replayed run reports match the recorded ones.
+  - `collector.max_rate` does not apply to replayed fetches.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Sequence, Type
+
+from src.config.schema import AppConfig
+from src.models.inventory import DeviceRecord, Inventory
+from src.services.backends import BackendFetchError, FetchEngine, FetchOutcome
+from src.utils.capture import CaptureRecord, CaptureWriter
+
+
+class ReplayedFetchError(Exception):
+    """
+    A fetch failure re-raised from a capture (subclasses carry the original
+    exception class name).
+    """
+
+
+_replayed_errors: Dict[str, Type[ReplayedFetchError]] = {}
+
+
+def _replayed_error(name: str) -> Type[ReplayedFetchError]:
+    cls = _replayed_errors.get(name)
+    if cls is None:
+        cls = type(name, (ReplayedFetchError,), {})
+        _replayed_errors[name] = cls
+    return cls
+
+
+class RecordingEngine(FetchEngine):
+    """
+    FetchEngine that records every fetch (config or failure, plus timing).
+
+    Args:
+      config (AppConfig): Application settings.
+      capture (CaptureWriter): Open capture file; closed by the caller.
+    """
+
+    def __init__(self, config: AppConfig, capture: CaptureWriter) -> None:
+        super().__init__(config)
+        self.capture = capture
+        self._origin = time.perf_counter()
+
+    def fetch(self, device: DeviceRecord) -> FetchOutcome:
+        started = time.perf_counter()
+        offset = round(started - self._origin, 6)
+        try:
+            outcome = super().fetch(device)
+        except BackendFetchError as exc:
+            self.capture.add(
+                CaptureRecord(
+                    hostname=device.hostname,
+                    ip=device.ip,
+                    location=device.location,
+                    type=device.type,
+                    backend=exc.backend,
+                    attempts=exc.attempts,
+                    offset=offset,
+                    seconds=round(time.perf_counter() - started, 6),
+                    error_class=type(exc.cause).__name__,
+                    error=str(exc.cause),
+                )
+            )
+            raise
+        self.capture.add(
+            CaptureRecord(
+                hostname=device.hostname,
+                ip=device.ip,
+                location=device.location,
+                type=device.type,
+                backend=outcome.backend,
+                attempts=outcome.attempts,
+                offset=offset,
+                seconds=round(time.perf_counter() - started, 6),
+                text=outcome.text,
+            )
+        )
+        return outcome
+
+
+class ReplayEngine(FetchEngine):
+    """
+    FetchEngine that returns recorded results instead of contacting devices.
+
+    Args:
+      config (AppConfig): Application settings.
+      records (Sequence[CaptureRecord]): Recorded fetches (see read_capture()).
+      speed (Optional[float]): None for full speed, else a multiple of the
+        recorded fetch durations (1.0 = original timing).
+
+    Notes:
+      - A device missing from the capture fails with `NotInCapture`.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        records: Sequence[CaptureRecord],
+        speed: Optional[float] = None,
+    ) -> None:
+        super().__init__(config)
+        self.speed = speed
+        self._records = {record.hostname: record for record in records}
+        self._origin: Optional[float] = None  # set by the first fetch
+        self._origin_lock = threading.Lock()
+
+    def fetch(self, device: DeviceRecord) -> FetchOutcome:
+        record = self._records.get(device.hostname)
+        if record is None:
+            cause = _replayed_error("NotInCapture")(
+                f"{device.hostname} is not in the capture"
+            )
+            raise BackendFetchError(cause, 0, self.backend_name(device))
+        if self.speed:
+            with self._origin_lock:
+                if self._origin is None:
+                    self._origin = time.perf_counter()
+            start_at = self._origin + record.offset / self.speed
+            time.sleep(max(0.0, start_at - time.perf_counter()))
+            time.sleep(record.seconds / self.speed)
+        if record.text is None:
+            cause = _replayed_error(record.error_class or "Exception")(record.error)
+            raise BackendFetchError(cause, record.attempts, record.backend)
+        return FetchOutcome(record.text, record.attempts, record.backend)
+
+
+def capture_inventory(records: Sequence[CaptureRecord]) -> Inventory:
+    """
+    Returns the recorded devices, in the order their fetches started.
+    """
+    return Inventory.from_entries(
+        [
+            {
+                "hostname": record.hostname,
+                "ip": record.ip,
+                "location": record.location,
+                "type": record.type,
+            }
+            for record in records
+        ]
+    )
@@ -0,0 +1,318 @@
+"""
+Retention Service
+
+Applies the retention policy to the configs output directory and compacts old
+configs into compressed, randomly accessible per-month archives.
+
+Contents:
+  - select_retained(): Grandfather-father-son selection of dates to keep for one device.
+  - CompactionResult: Counters describing one compaction pass.
+  - compact_output_dir(): Incremental prune + archive pass over output_dir.
+  - run_compaction(): CLI entry point using settings.yaml.
+
+Dependencies:
+  - zipfile
+  - src.config.schema.StorageConfig
+  - src.utils.file_utils
+
+Notes:
+  - Archives live at <output_dir>/<archive_dir>/<YYYY>/<YYYY-MM>.zip, one deflated
+    member per config plus a `.index.json` sidecar, so read_config() reaches any
+    member with one seek.
+  - A month is archived once all of its days are older than the daily window; it
+    is rewritten later only when retention thins it further (e.g. when it leaves
+    the weekly window) or when late files for it appear.
+  - Every step is restartable: archives are written to a temp file and renamed
+    before any loose file is deleted, and state is always re-derived from disk.
+  - A rewritten archive's old index is removed before the archive is replaced,
+    so an index never points into another version of it; without an index,
+    reads fall back to the zip directory.
+  - Per-run tar/zip bundles written by ConfigWriter are left untouched.
+"""
+
+import calendar
+import os
+import zipfile
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from src.config.config import load_config
+from src.config.schema import RetentionConfig, StorageConfig
+from src.utils.file_utils import (
+    iter_stored_configs,
+    read_config,
+    replace_archive,
+    StoredConfig,
+    zip_index_entry,
+)
+from src.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class CompactionResult(NamedTuple):
+    """
+    Counters describing one compaction pass.
+
+    Attributes:
+      pruned (int): Configs deleted because retention no longer keeps them.
+      archived (int): Loose configs moved into monthly archives.
+      archives_written (int): Monthly archives created or rewritten.
+      months_pending (int): Eligible months left for a later pass (max_months).
+    """
+
+    pruned: int
+    archived: int
+    archives_written: int
+    months_pending: int
+
+
+def _to_date(date_stamp: str) -> date:
+    return date(int(date_stamp[:4]), int(date_stamp[4:6]), int(date_stamp[6:8]))
+
+
+def select_retained(
+    date_stamps: Iterable[str], today: date, policy: RetentionConfig
+) -> Set[str]:
+    """
+    Returns the subset of one device's collection dates that the policy keeps.
+
+    Args:
+      date_stamps (Iterable[str]): YYYYMMDD stamps of the device's stored configs.
+      today (date): Reference date for ages.
+      policy (RetentionConfig): Retention windows.
+
+    Returns:
+      Set[str]: Stamps to keep.
+
+    Notes:
+      - Daily window: every stamp younger than keep_daily_days.
+      - Weekly window: newest stamp of each ISO week younger than keep_weekly_weeks.
+      - Monthly window: newest stamp of each month within keep_monthly_months
+        (forever when None).
+    """
+    keep: Set[str] = set()
+    weeks: Set[Tuple[int, int]] = set()
+    months: Set[Tuple[int, int]] = set()
+    this_month = today.year * 12 + today.month
+
+    for stamp in sorted(set(date_stamps), reverse=True):
+        day = _to_date(stamp)
+        age = (today - day).days
+        iso = day.isocalendar()
+        week = (iso[0], iso[1])
+        month = (day.year, day.month)
+
+        kept = age < policy.keep_daily_days
+        if not kept and age < policy.keep_weekly_weeks * 7 and week not in weeks:
+            kept = True
+        if (
+            not kept
+            and month not in months
+            and (
+                policy.keep_monthly_months is None
+                or this_month - (day.year * 12 + day.month) < policy.keep_monthly_months
+            )
+        ):
+            kept = True
+
+        if kept:
+            keep.add(stamp)
+            weeks.add(week)
+            months.add(month)
+    return keep
+
+
+def _archive_path(output_dir: Path, archive_dir: str, month: str) -> Path:
+    return output_dir / archive_dir / month[:4] / f"{month[:4]}-{month[4:6]}.zip"
+
+
+def _write_month_archive(
+    path: Path, members: Dict[str, str], compress_level: int
+) -> None:
+    """
+    Writes a monthly archive atomically from {member name: source location}.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    index: Dict[str, Dict[str, int]] = {}
+    try:
+        with zipfile.ZipFile(
+            tmp_path,
+            "w",
+            compression=zipfile.ZIP_DEFLATED,
+            compresslevel=compress_level,
+        ) as zf:
+            for name in sorted(members):
+                zf.writestr(name, read_config(members[name]).encode())
+                index[name] = zip_index_entry(zf.getinfo(name))
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        replace_archive(tmp_path, path, "zip", index, fsync=True)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _remove_empty_dirs(root: Path, directories: Set[Path]) -> None:
+    for directory in sorted(directories, key=lambda p: len(p.parts), reverse=True):
+        while directory != root and root in directory.parents:
+            try:
+                directory.rmdir()
+            except OSError:
+                break
+            directory = directory.parent
+
+
+def compact_output_dir(
+    output_dir: str,
+    storage: StorageConfig,
+    today: Optional[date] = None,
+    max_months: Optional[int] = None,
+    dry_run: bool = False,
+) -> CompactionResult:
+    """
+    Prunes configs retention no longer keeps and packs old months into archives.
+
+    Args:
+      output_dir (str): Root output directory.
+      storage (StorageConfig): Layout, archive, and retention settings.
+      today (Optional[date]): Reference date (default: today, UTC).
+      max_months (Optional[int]): Archive at most this many months per call, oldest
+        first, so large backlogs can be compacted in bounded increments.
+      dry_run (bool): Log the plan without changing anything.
+
+    Returns:
+      CompactionResult: What was (or would be) done.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    root = Path(output_dir)
+    policy = storage.retention
+    archive_root = root / storage.archive_dir
+
+    loose: List[StoredConfig] = []
+    archived: Dict[str, List[StoredConfig]] = defaultdict(list)  # month -> members
+    dates_by_host: Dict[str, Set[str]] = defaultdict(set)
+
+    for stored in iter_stored_configs(output_dir, storage.archive_dir):
+        path = Path(stored.location.split("#", 1)[0])
+        if "#" not in stored.location:
+            loose.append(stored)
+        elif archive_root in path.parents:
+            archived[stored.date_stamp[:6]].append(stored)
+        else:
+            continue  # per-run bundle: not managed by retention
+        dates_by_host[stored.hostname].add(stored.date_stamp)
+
+    retained = {
+        host: select_retained(stamps, today, policy)
+        for host, stamps in dates_by_host.items()
+    }
+
+    def is_kept(stored: StoredConfig) -> bool:
+        return stored.date_stamp in retained[stored.hostname]
+
+    # Months whose last day is outside the daily window are archived.
+    cutoff = today - timedelta(days=policy.keep_daily_days)
+    loose_by_month: Dict[str, List[StoredConfig]] = defaultdict(list)
+    for stored in loose:
+        loose_by_month[stored.date_stamp[:6]].append(stored)
+
+    def month_closed(month: str) -> bool:
+        year, mon = int(month[:4]), int(month[4:6])
+        return date(year, mon, calendar.monthrange(year, mon)[1]) < cutoff
+
+    eligible = sorted(
+        month
+        for month in set(loose_by_month) | set(archived)
+        if month_closed(month)
+        and (
+            loose_by_month.get(month)
+            or not all(is_kept(member) for member in archived.get(month, []))
+        )
+    )
+    pending = eligible[max_months:] if max_months is not None else []
+    eligible = eligible[:max_months] if max_months is not None else eligible
+
+    pruned = archived_count = written = 0
+    touched_dirs: Set[Path] = set()
+
+    for month in eligible:
+        members: Dict[str, str] = {}
+        for stored in archived.get(month, []) + loose_by_month.get(month, []):
+            if is_kept(stored):
+                members[f"{stored.hostname}_{stored.date_stamp}.cfg"] = stored.location
+        dropped = len(archived.get(month, [])) + len(loose_by_month.get(month, []))
+        dropped -= len(members)
+        path = _archive_path(root, storage.archive_dir, month)
+
+        logger.info(
+            f"{'[DRY-RUN] ' if dry_run else ''}Archiving {month[:4]}-{month[4:]}: "
+            f"{len(members)} config(s) -> {path} ({dropped} pruned)"
+        )
+        pruned += dropped
+        archived_count += sum(1 for s in loose_by_month.get(month, []) if is_kept(s))
+        if dry_run:
+            continue
+
+        if members:
+            _write_month_archive(path, members, storage.compress_level)
+        else:
+            path.with_name(f"{path.name}.index.json").unlink(missing_ok=True)
+            path.unlink(missing_ok=True)
+        written += 1
+        for stored in loose_by_month.get(month, []):
+            Path(stored.location).unlink(missing_ok=True)
+            touched_dirs.add(Path(stored.location).parent)
+
+    # Loose configs in open months are pruned in place.
+    for month, stored_list in loose_by_month.items():
+        if month in eligible or month in pending:
+            continue
+        for stored in stored_list:
+            if is_kept(stored):
+                continue
+            pruned += 1
+            if not dry_run:
+                Path(stored.location).unlink(missing_ok=True)
+                touched_dirs.add(Path(stored.location).parent)
+
+    if not dry_run:
+        _remove_empty_dirs(root, touched_dirs)
+
+    result = CompactionResult(pruned, archived_count, written, len(pending))
+    logger.info(
+        f"Compaction: {result.archived} archived, {result.pruned} pruned, "
+        f"{result.archives_written} archive(s) written, "
+        f"{result.months_pending} month(s) pending"
+    )
+    return result
+
+
+def run_compaction(
+    max_months: Optional[int] = None, dry_run: bool = False
+) -> CompactionResult:
+    """
+    Runs one compaction pass over the configured output directory, then
+    re-syncs the config catalog (when enabled) so it points at the new locations.
+
+    Args:
+      max_months (Optional[int]): Upper bound on months archived in this pass.
+      dry_run (bool): Log the plan without changing anything.
+
+    Returns:
+      CompactionResult: What was (or would be) done.
+    """
+    config = load_config()
+    logger.info(f"=== Compacting {config.output_dir} ===")
+    result = compact_output_dir(
+        config.output_dir, config.storage, max_months=max_months, dry_run=dry_run
+    )
+    if config.catalog.enabled and not dry_run:
+        from src.services.catalog import ConfigCatalog
+
+        with ConfigCatalog(config.catalog.path) as catalog:
+            catalog.sync(config.output_dir, config.storage.archive_dir)
+    return result
@@ -1,100 +1,601 @@
 """
 SSH Collector Service
 
-Responsible for orchestrating SSH collection jobs across a list of devices.
+Responsible for orchestrating collection jobs across a list of devices.
 
 Contents:
-  - collect_device_configs(): Loads devices, connects, collects, saves configs
+  - collect_device_configs(): Loads devices, connects, collects, saves configs,
+    and returns/saves a RunReport
   - run_diagnostics(): Validates environment, config, and input YAML
 
 Dependencies:
   - src.utils.logger_utils
   - src.utils.file_utils
-  - src.utils.ssh_utils
+  - src.services.backends
   - src.utils.device_loader
+  - src.models.inventory
   - src.config.config
 
 Notes:
   - Uses dry-run, config-based output path, and retry-safe SSH.
   - Skips unreachable devices gracefully; logs summary at end.
+  - When `compliance.enabled` is set, policy rules are evaluated over the stored
+    configs after all writes complete (see src.services.compliance).
+  - When `catalog.enabled` is set, the run's configs are added to the config
+    catalog (see src.services.catalog).
+  - Devices are fetched by a pool of `collector.workers` threads; completed configs
+    are handed to a single ConfigWriter stage that owns all disk I/O.
+  - Each device is fetched with the backend configured for its type (SSH,
+    NETCONF, or HTTP) through the shared retry policy in FetchEngine.
+  - When `events.enabled` is set, one event per device (collected, unchanged,
+    changed, failed) is published as it completes (see src.services.events).
+  - When `coordinator.enabled` is set, fetches go through the cross-process job
+    coordinator: devices another running job is fetching are shared rather than
+    fetched twice, and all jobs together respect the global and per-site caps
+    (see src.services.coordinator).
+  - `record` saves every device's fetch result and timing to a capture file;
+    `replay` feeds a capture through the same pipeline instead of contacting
+    devices (see src.services.replay). Replays bypass the job coordinator and
+    publish events only with `events.on_replay`.
 """
 
 import getpass
+import hashlib
 import platform
 import socket
+import time
+from concurrent.futures import as_completed, Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
 
 from src.config.config import load_config
-from src.utils.device_loader import load_device_list
+from src.config.schema import AppConfig
+from src.models.inventory import DeviceRecord
+from src.models.run_report import DeviceStatus, new_run_id, RunReport
+from src.services.backends import BackendFetchError, FetchEngine
+from src.utils.device_loader import load_inventory
 from src.utils.env_utils import get_env_var
-from src.utils.file_utils import write_config_to_file
+from src.utils.file_utils import config_subdir, ConfigWriter
 from src.utils.logger_utils import get_logger
-from src.utils.ssh_utils import fetch_running_config
+
+if TYPE_CHECKING:
+    from src.services.coordinator import JobCoordinator
+    from src.services.events import Baseline, ChangeSummary, EventStream
+    from src.utils.capture import CaptureRecord, CaptureWriter
+    from src.utils.config_parser import ParseCache
 
 logger = get_logger(__name__)
 
 
-def collect_device_configs(devices_file_path: str, dry_run: bool = False) -> None:
+def collect_device_configs(
+    devices_file_path: Optional[str],
+    dry_run: bool = False,
+    record: Optional[str] = None,
+    replay: Optional[str] = None,
+    replay_speed: Optional[float] = None,
+) -> RunReport:
     """
     Connects to devices via SSH and writes their running configs to .cfg files.
 
     Args:
-      devices_file_path (str): Path to a YAML file with device metadata list.
+      devices_file_path (Optional[str]): Path to a YAML file with device metadata
+        list (with `replay`, None replays every recorded device).
       dry_run (bool): If True, skips actual SSH and file output.
+      record (Optional[str]): Capture file to record every fetch into.
+      replay (Optional[str]): Capture file to replay instead of contacting devices.
+      replay_speed (Optional[float]): With `replay`: None for full speed, 1.0 for
+        the recorded fetch durations.
 
     Returns:
-      None
+      RunReport: Per-device status, error class, attempts, timings, size, hash,
+      and output path. The same report is saved under `report_dir`.
 
     Raises:
       FileNotFoundError: If the input YAML file is missing or malformed.
+      ValueError: If `replay` is not a capture file, or neither it nor
+        `devices_file_path` is given.
 
     Notes:
       - Output files are named <hostname>_<YYYYMMDD>.cfg
       - A full summary is logged at the end of the run.
+      - The report is written to <report_dir>/<run_id>.json.gz
     """
     logger.info("=== Job Metadata ===")
     logger.info(f"User: {getpass.getuser()}")
     logger.info(f"Host: {platform.node()}")
-    logger.info(f"Timestamp: {datetime.now(timezone.utc).isoformat()}")
+    run_started = datetime.now(timezone.utc)
+    logger.info(f"Timestamp: {run_started.isoformat()}")
 
-    date_stamp = datetime.now(timezone.utc).strftime("%Y%m%d")
+    date_stamp = run_started.strftime("%Y%m%d")
+    run_id = new_run_id("run", run_started)
     config = load_config()
     output_dir = config.output_dir
-    devices = load_device_list(devices_file_path)
+    replayed: "Optional[List[CaptureRecord]]" = None
+    if replay is not None:
+        from src.services.replay import capture_inventory
+        from src.utils.capture import read_capture
 
-    success_count = 0
-    failure_count = 0
-    skipped_count = 0
-
-    for device in devices:
-        hostname = device.hostname
+        header, replayed = read_capture(replay)
+        logger.info(
+            f"Replaying:     {replay} ({len(replayed)} device(s) from "
+            f"{header.get('run_id')}, speed {replay_speed or 'max'})"
+        )
+    if devices_file_path is not None:
+        devices = load_inventory(devices_file_path, config.inventory.cache_dir)
+    elif replayed is not None:
+        devices = capture_inventory(replayed)
+    else:
+        raise ValueError("devices_file_path is required without replay")
+    report = RunReport(run_id, run_started.isoformat(), dry_run=dry_run)
 
-        if dry_run:
+    if dry_run:
+        for device in devices:
+            hostname = device.hostname
             logger.info(
                 f"[DRY-RUN] Would connect to {hostname} ({device.ip or 'no IP'})"
             )
-            logger.info(
-                f"[DRY-RUN] Would write config to {output_dir}/{hostname}_{date_stamp}.cfg"
+            target = Path(
+                output_dir,
+                config_subdir(hostname, date_stamp, config.storage.layout),
+                f"{hostname}_{date_stamp}.cfg",
+            )
+            logger.info(f"[DRY-RUN] Would write config to {target}")
+            report.add(
+                hostname,
+                DeviceStatus.SKIPPED,
+                location=device.location,
+                type=device.type,
             )
-            skipped_count += 1
-            continue
+    else:
+        writer = ConfigWriter(
+            output_dir,
+            fsync=config.writer.fsync,
+            batch_size=config.writer.batch_size,
+            queue_size=config.writer.queue_size,
+            bundle=config.writer.bundle,
+            fsync_workers=config.writer.fsync_workers,
+            run_name=run_id,
+            layout=config.storage.layout,
+        )
+        engine, capture = _make_engine(config, report, record, replayed, replay_speed)
+        # Replays never touch the shared coordinator state (their configs may
+        # be months old), and publish events only when asked to.
+        replaying = replay is not None
+        if replaying and not config.events.on_replay:
+            stream, baseline = None, None
+        else:
+            stream, baseline = _open_events(config, date_stamp)
+        parse_cache = None
+        if baseline is not None and config.events.parse_cache_dir:
+            from src.utils.config_parser import ParseCache
 
+            parse_cache = ParseCache(config.events.parse_cache_dir)
+        coordinator = None if replaying else _open_coordinator(config, run_id)
+        # Bundle members only exist once the writer has closed and renamed the
+        # archive, so in bundle mode devices are recorded after that.
+        deferred: "List[Tuple[DeviceRecord, Future[_Fetched]]]" = []
         try:
-            logger.info(f"Connecting to {hostname}...")
-            config_text = fetch_running_config(hostname)
-            write_config_to_file(hostname, config_text, date_stamp, output_dir)
-            logger.info(f"✅ Config saved for {hostname}")
-            success_count += 1
-        except Exception as exc:
-            logger.exception(f"❌ Failed to fetch config from {hostname}: {exc}")
-            failure_count += 1
+            with ThreadPoolExecutor(
+                max_workers=config.collector.workers, thread_name_prefix="collector"
+            ) as pool:
+                pending = {
+                    pool.submit(
+                        _fetch_and_queue,
+                        device,
+                        engine,
+                        writer,
+                        date_stamp,
+                        baseline,
+                        config.events.diff_lines,
+                        coordinator,
+                        parse_cache,
+                    ): device
+                    for device in devices
+                }
+                for future in as_completed(pending):
+                    if writer.bundle is None:
+                        _complete_device(report, pending[future], future, stream)
+                    else:
+                        deferred.append((pending[future], future))
+        finally:
+            _close_writer(writer)
+        for device, future in deferred:
+            _complete_device(report, device, future, stream)
+        if stream is not None:
+            _close_events(stream)
+        if coordinator is not None:
+            _close_coordinator(coordinator)
+        if capture is not None:
+            capture.close()
+            logger.info(f"Recorded:      {capture.count} device(s) -> {capture.path}")
+
+    report.finish(datetime.now(timezone.utc).isoformat())
+    counts = report.counts()
 
     logger.info("=== SSH Collection Summary ===")
     logger.info(f"Total devices: {len(devices)}")
-    logger.info(f"Successes:     {success_count}")
-    logger.info(f"Failures:      {failure_count}")
-    logger.info(f"Dry-run/skips: {skipped_count}")
+    logger.info(f"Successes:     {counts.get(DeviceStatus.SUCCESS, 0)}")
+    logger.info(f"Failures:      {counts.get(DeviceStatus.FAILED, 0)}")
+    logger.info(f"Dry-run/skips: {counts.get(DeviceStatus.SKIPPED, 0)}")
+
+    try:
+        report_path = report.save(config.report_dir)
+        logger.info(f"Run report:    {report_path}")
+    except OSError as exc:
+        logger.error(f"❌ Failed to write run report: {exc}")
+
+    if config.catalog.enabled and not dry_run:
+        _update_catalog(report, config, date_stamp)
+
+    if config.compliance.enabled and not dry_run:
+        _run_compliance(report, config)
+
+    if replay is not None and not dry_run:
+        seconds = (datetime.now(timezone.utc) - run_started).total_seconds()
+        logger.info(
+            f"Replay:        {len(devices) / max(seconds, 1e-9):.1f} device(s)/s "
+            f"end to end ({seconds:.2f}s)"
+        )
+
+    return report
+
+
+def _close_writer(writer: ConfigWriter) -> None:
+    """
+    Closes the writer stage; errors are logged, and also fail the affected writes.
+    """
+    try:
+        writer.close()
+    except Exception as exc:
+        logger.exception(f"❌ Failed to finalize output: {exc}")
+
+
+def _complete_device(
+    report: RunReport,
+    device: DeviceRecord,
+    future: "Future[_Fetched]",
+    stream: "Optional[EventStream]",
+) -> None:
+    """
+    Records one finished device and publishes its event.
+    """
+    _record_result(report, device, future)
+    if stream is not None:
+        stream.publish(_device_event(report, future))
+
+
+def _make_engine(
+    config: AppConfig,
+    report: RunReport,
+    record: Optional[str],
+    replayed: "Optional[List[CaptureRecord]]",
+    replay_speed: Optional[float],
+) -> "Tuple[FetchEngine, Optional[CaptureWriter]]":
+    """
+    Returns the fetch engine for this run (live, recording, or replaying) and
+    the capture file being recorded, if any.
+    """
+    if replayed is not None:
+        from src.services.replay import ReplayEngine
+
+        return ReplayEngine(config, replayed, replay_speed), None
+    if record is not None:
+        from src.services.replay import RecordingEngine
+        from src.utils.capture import CaptureWriter
+
+        capture = CaptureWriter(
+            record, {"run_id": report.run_id, "started_at": report.started_at}
+        )
+        return RecordingEngine(config, capture), capture
+    return FetchEngine(config), None
+
+
+def _open_events(
+    config: AppConfig, date_stamp: str
+) -> "Tuple[Optional[EventStream], Optional[Baseline]]":
+    """
+    Loads the change baseline and starts the event stream, if events are enabled.
+
+    Notes:
+      - Failures are logged, never raised: the run continues without events.
+    """
+    if not config.events.enabled:
+        return None, None
+    from src.services.events import load_baseline, open_event_stream
+
+    try:
+        baseline = load_baseline(config, date_stamp)
+        stream = open_event_stream(config.events)
+    except Exception as exc:
+        logger.exception(f"❌ Failed to start event stream: {exc}")
+        return None, None
+    logger.info(
+        f"Events:        {len(stream.sinks)} sink(s), "
+        f"baseline for {len(baseline)} device(s)"
+    )
+    return stream, baseline
+
+
+def _close_events(stream: "EventStream") -> None:
+    """
+    Flushes the event stream and logs delivery counts.
+    """
+    stream.close()
+    failed = sum(stream.failed.values())
+    logger.info(
+        f"Events:        {stream.published} published, {stream.dropped} dropped, "
+        f"{failed} undelivered"
+    )
+
+
+def _open_coordinator(config: AppConfig, run_id: str) -> "Optional[JobCoordinator]":
+    """
+    Registers this run with the job coordinator, if coordination is enabled.
+
+    Notes:
+      - Failures are logged, never raised: the run continues uncoordinated.
+    """
+    if not config.coordinator.enabled:
+        return None
+    from src.services.coordinator import open_coordinator
+
+    try:
+        coordinator = open_coordinator(config.coordinator, run_id)
+    except Exception as exc:
+        logger.exception(f"❌ Failed to join job coordinator: {exc}")
+        return None
+    logger.info(
+        f"Coordinator:   {coordinator.job_id} "
+        f"(max {config.coordinator.max_devices} in flight)"
+    )
+    return coordinator
+
+
+def _close_coordinator(coordinator: "JobCoordinator") -> None:
+    """
+    Leaves the job coordinator and logs how many fetches were shared.
+    """
+    try:
+        coordinator.close()
+    except Exception as exc:
+        logger.exception(f"❌ Failed to leave job coordinator: {exc}")
+    logger.info(
+        f"Coordinator:   {coordinator.fetched} fetched, {coordinator.shared} shared, "
+        f"{coordinator.wait_seconds:.1f}s waiting"
+    )
+
+
+def _device_event(report: RunReport, future: "Future[_Fetched]") -> Dict[str, object]:
+    """
+    Builds the event for the device most recently added to the report.
+    """
+    from src.services.events import build_event
+
+    row = report.row(-1)
+    err = future.exception()
+    if err is not None:
+        cause = err.cause if isinstance(err, _FetchError) else err
+        return build_event(report.run_id, row, error=str(cause))
+    fetched = future.result()
+    write_error = fetched.write.exception()
+    if write_error is not None:
+        return build_event(report.run_id, row, error=str(write_error))
+    return build_event(report.run_id, row, change=fetched.change)
+
+
+def _update_catalog(report: RunReport, config: AppConfig, date_stamp: str) -> None:
+    """
+    Records the run's stored configs in the config catalog.
+
+    Notes:
+      - Failures are logged, never raised; `--catalog-sync` rebuilds missed entries.
+    """
+    from src.services.catalog import ConfigCatalog, record_run
+
+    try:
+        with ConfigCatalog(config.catalog.path) as catalog:
+            count = record_run(catalog, report, date_stamp)
+        logger.info(f"Catalog:       {count} config(s) -> {config.catalog.path}")
+    except Exception as exc:
+        logger.exception(f"❌ Failed to update config catalog: {exc}")
+
+
+def _run_compliance(report: RunReport, config: AppConfig) -> None:
+    """
+    Runs the compliance stage over the run's stored configs and saves the results.
+
+    Notes:
+      - Failures are logged, never raised: policy checks must not fail a backup run.
+    """
+    from src.services.compliance import run_compliance_stage, save_results
+
+    try:
+        results = run_compliance_stage(
+            report,
+            rules_file=config.compliance.rules_file,
+            cache_dir=config.compliance.cache_dir,
+            workers=config.compliance.workers,
+            cache_max_entries=config.compliance.cache_max_entries,
+        )
+        path = save_results(
+            results, Path(config.report_dir) / f"{report.run_id}.compliance.json.gz"
+        )
+        logger.info(f"Compliance:    {path}")
+    except Exception as exc:
+        logger.exception(f"❌ Compliance stage failed: {exc}")
+
+
+class _Fetched(NamedTuple):
+    """
+    Worker output for one device: fetch metrics plus the pending write.
+    """
+
+    started: float
+    fetch_seconds: float
+    attempts: int
+    backend: str
+    size: int
+    config_hash: str
+    write: "Future[str]"
+    change: "Optional[ChangeSummary]" = None
+
+
+class _FetchError(Exception):
+    """
+    Carries a device fetch failure plus the metrics gathered before it failed.
+    """
+
+    def __init__(
+        self, cause: Exception, fetch_seconds: float, attempts: int, backend: str
+    ) -> None:
+        super().__init__(str(cause))
+        self.cause = cause
+        self.fetch_seconds = fetch_seconds
+        self.attempts = attempts
+        self.backend = backend
+
+
+def _fetch_and_queue(
+    device: DeviceRecord,
+    engine: FetchEngine,
+    writer: ConfigWriter,
+    date_stamp: str,
+    baseline: "Optional[Baseline]" = None,
+    diff_lines: int = 20,
+    coordinator: "Optional[JobCoordinator]" = None,
+    parse_cache: "Optional[ParseCache]" = None,
+) -> _Fetched:
+    """
+    Worker task: fetches one device's config and hands it to the writer stage.
+
+    Args:
+      device (DeviceRecord): Inventory entry.
+      engine (FetchEngine): Shared backend selection and retry layer.
+      writer (ConfigWriter): Shared writer stage.
+      date_stamp (str): Timestamp (YYYYMMDD) used in the filename.
+      baseline (Optional[Baseline]): Previous configs to compare against (events
+        enabled), read before the new config is queued, which may replace it.
+      diff_lines (int): Diff lines kept for `changed` events.
+      coordinator (Optional[JobCoordinator]): Cross-job slot and result sharing.
+      parse_cache (Optional[ParseCache]): Parsed configs for changed sections.
+
+    Returns:
+      _Fetched: Fetch metrics and a Future resolving to the output location.
+
+    Raises:
+      _FetchError: Wraps the fetch exception together with timing and attempts.
+    """
+    hostname = device.hostname
+    logger.info(f"Connecting to {hostname}...")
+    started = time.perf_counter()
+    try:
+        if coordinator is None:
+            outcome = engine.fetch(device)
+        else:
+            outcome = coordinator.fetch(
+                device, engine.fetch_key(device), lambda: engine.fetch(device)
+            )
+    except BackendFetchError as exc:
+        raise _FetchError(
+            exc.cause, time.perf_counter() - started, exc.attempts, exc.backend
+        ) from exc
+    fetch_seconds = time.perf_counter() - started
+
+    data = outcome.text.encode()
+    config_hash = hashlib.sha256(data).hexdigest()
+    change = None
+    if baseline is not None:
+        from src.services.events import summarize_change
+
+        change = summarize_change(
+            outcome.text,
+            config_hash,
+            baseline.get(hostname),
+            diff_lines,
+            parse_cache,
+        )
+    return _Fetched(
+        started=started,
+        fetch_seconds=fetch_seconds,
+        attempts=outcome.attempts,
+        backend=outcome.backend,
+        size=len(data),
+        config_hash=config_hash,
+        write=writer.submit(hostname, outcome.text, date_stamp),
+        change=change,
+    )
+
+
+def _record_result(
+    report: RunReport, device: DeviceRecord, future: "Future[_Fetched]"
+) -> None:
+    """
+    Waits for one device's fetch and write, logs the outcome, and adds it to the report.
+    """
+    hostname = device.hostname
+    try:
+        fetched = future.result()
+    except _FetchError as err:
+        logger.error(
+            f"❌ Failed to fetch config from {hostname}: {err.cause}",
+            exc_info=err.cause,
+        )
+        report.add(
+            hostname,
+            DeviceStatus.FAILED,
+            location=device.location,
+            type=device.type,
+            error_class=type(err.cause).__name__,
+            backend=err.backend,
+            attempts=err.attempts,
+            fetch_ms=err.fetch_seconds * 1000,
+            total_ms=err.fetch_seconds * 1000,
+        )
+        return
+    except Exception as exc:
+        # Anything else (e.g. a failed writer or coordinator) fails this device only.
+        logger.exception(f"❌ Failed to collect {hostname}: {exc}")
+        report.add(
+            hostname,
+            DeviceStatus.FAILED,
+            location=device.location,
+            type=device.type,
+            error_class=type(exc).__name__,
+        )
+        return
+
+    try:
+        output_path = fetched.write.result()
+    except Exception as exc:
+        logger.exception(f"❌ Failed to write config for {hostname}: {exc}")
+        report.add(
+            hostname,
+            DeviceStatus.FAILED,
+            location=device.location,
+            type=device.type,
+            error_class=type(exc).__name__,
+            backend=fetched.backend,
+            attempts=fetched.attempts,
+            fetch_ms=fetched.fetch_seconds * 1000,
+            total_ms=(time.perf_counter() - fetched.started) * 1000,
+        )
+        return
+
+    logger.info(f"✅ Config saved for {hostname}")
+    report.add(
+        hostname,
+        DeviceStatus.SUCCESS,
+        location=device.location,
+        type=device.type,
+        backend=fetched.backend,
+        attempts=fetched.attempts,
+        fetch_ms=fetched.fetch_seconds * 1000,
+        total_ms=(time.perf_counter() - fetched.started) * 1000,
+        bytes=fetched.size,
+        config_hash=fetched.config_hash,
+        output_path=output_path,
+    )
 
 
 def run_diagnostics(devices_file: str) -> None:
@@ -124,7 +625,7 @@ def run_diagnostics(devices_file: str) -> None:
         return
 
     try:
-        devices = load_device_list(devices_file)
+        devices = load_inventory(devices_file, config.inventory.cache_dir)
         logger.info(f"✅ Loaded {len(devices)} device(s) from devices.yaml")
     except Exception as e:
         logger.error(f"❌ devices.yaml check failed: {e}")
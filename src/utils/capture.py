@@ -0,0 +1,165 @@
+"""
+Session Capture Utility
+
+Reads and writes capture files: compact recordings of what every device
+returned during a collection run, and how long it took, for offline replay.
+
+Contents:
+  - CaptureRecord: One device's recorded fetch (config text or error, timing).
+  - CaptureWriter: Thread-safe, append-as-you-go capture file writer.
+  - read_capture(): Loads a capture file's header and records.
+
+Dependencies:
+  - gzip
+  - json
+
+Notes:
+  - Format: gzip-compressed JSON Lines. The first line is a header
+    (`{"format": "capture", "version": 1, "run_id": ..., "started_at": ...}`);
+    each further line is one CaptureRecord, written when the device completes.
+  - `offset` is seconds from the start of the recording to the start of the
+    device's fetch; `seconds` is the fetch's duration including retries.
+  - A capture cut short by a crash is still readable up to its last complete
+    record.
+"""
+
+import gzip
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+CAPTURE_FORMAT = "capture"
+CAPTURE_VERSION = 1
+
+
+class CaptureRecord(NamedTuple):
+    """
+    One device's recorded fetch.
+
+    Attributes:
+      hostname (str): Device hostname.
+      ip (Optional[str]): Device IP.
+      location (Optional[str]): Device location.
+      type (Optional[str]): Device type.
+      backend (str): Backend that fetched the device.
+      attempts (int): Attempts used.
+      offset (float): Seconds from the start of the recording to the fetch start.
+      seconds (float): Fetch duration, including retries.
+      text (Optional[str]): Fetched config (None if the fetch failed).
+      error_class (Optional[str]): Exception class name of a failed fetch.
+      error (Optional[str]): Error message of a failed fetch.
+    """
+
+    hostname: str
+    ip: Optional[str]
+    location: Optional[str]
+    type: Optional[str]
+    backend: str
+    attempts: int
+    offset: float
+    seconds: float
+    text: Optional[str] = None
+    error_class: Optional[str] = None
+    error: Optional[str] = None
+
+
+class CaptureWriter:
+    """
+    Appends CaptureRecords to a capture file from any number of threads.
+
+    Args:
+      path (str): Capture file (parent directories are created).
+      header (Dict[str, Any]): Extra header fields (e.g. run_id, started_at).
+      compress_level (int): gzip level.
+
+    Attributes:
+      count (int): Records written.
+
+    Example:
+      with CaptureWriter("captures/run.capture.gz", {"run_id": run_id}) as capture:
+          capture.add(record)
+    """
+
+    def __init__(
+        self, path: str, header: Dict[str, Any], compress_level: int = 6
+    ) -> None:
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(path, "wb", compresslevel=compress_level)
+        self._write({"format": CAPTURE_FORMAT, "version": CAPTURE_VERSION, **header})
+
+    def __enter__(self) -> "CaptureWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _write(self, obj: Dict[str, Any]) -> None:
+        self._file.write(
+            json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode() + b"\n"
+        )
+
+    def add(self, record: CaptureRecord) -> None:
+        """
+        Appends one record (fields left at None are omitted).
+        """
+        obj = {k: v for k, v in record._asdict().items() if v is not None}
+        with self._lock:
+            self._write(obj)
+            self.count += 1
+
+    def close(self) -> None:
+        """
+        Flushes and closes the file.
+        """
+        with self._lock:
+            self._file.close()
+
+
+# Fields omitted from a record line (None values) read back as None.
+_UNSET: Dict[str, Any] = dict.fromkeys(CaptureRecord._fields)
+
+
+def read_capture(path: str) -> Tuple[Dict[str, Any], List[CaptureRecord]]:
+    """
+    Loads a capture file.
+
+    Args:
+      path (str): Capture file.
+
+    Returns:
+      Tuple[Dict[str, Any], List[CaptureRecord]]: Header, and records in the
+      order their fetches started.
+
+    Raises:
+      FileNotFoundError: If the file does not exist.
+      ValueError: If the file is not a capture of a supported version.
+    """
+    if not Path(path).is_file():
+        raise FileNotFoundError(f"Capture file not found: {path}")
+
+    records: List[CaptureRecord] = []
+    header: Optional[Dict[str, Any]] = None
+    with gzip.open(path, "rb") as f:
+        try:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                obj = json.loads(line)
+                if header is None:
+                    header = obj
+                    continue
+                records.append(CaptureRecord(**{**_UNSET, **obj}))
+        except EOFError:
+            pass
+    if (
+        header is None
+        or header.get("format") != CAPTURE_FORMAT
+        or header.get("version") != CAPTURE_VERSION
+    ):
+        raise ValueError(f"Not a version {CAPTURE_VERSION} capture file: {path}")
+    records.sort(key=lambda record: record.offset)
+    return header, records
@@ -0,0 +1,392 @@
+"""
+Config Parser Utility
+
+Parses indentation-based device configs (IOS/EOS/NX-OS style) into a compact,
+queryable block tree, with an on-disk parse cache keyed by config hash.
+
+Contents:
+  - ConfigTree: Flat, array-backed tree of config lines with path queries.
+  - ConfigNode: Lightweight view of one line in a ConfigTree.
+  - parse_config(): Parses raw config text into a ConfigTree.
+  - ParseCache: Persistent cache of parsed trees keyed by SHA-256 of the config.
+  - load_tree(): Returns the tree for a stored config, parsing only on cache miss.
+  - changed_sections(): Top-level blocks that differ between two trees.
+
+Dependencies:
+  - re
+  - array
+  - marshal
+  - src.utils.file_utils
+
+Notes:
+  - A line's parent is the nearest preceding line with smaller indentation.
+  - Blank lines and `!` separator lines carry no structure and are dropped.
+  - The tree is three parallel columns (text, parent index, depth) rather than one
+    object per line, so it is cheap to build, cache, and load.
+  - Path queries match one regex per level against the stripped line text
+    (`re.match`, i.e. anchored at the start of the line).
+"""
+
+import hashlib
+import marshal
+import os
+import re
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+from src.utils.file_utils import read_config
+
+# Bump when the cached tree layout changes.
+_CACHE_VERSION = 1
+
+
+@lru_cache(maxsize=1024)
+def _compile(pattern: str) -> Pattern[str]:
+    return re.compile(pattern)
+
+
+class ConfigNode:
+    """
+    View of one config line inside a ConfigTree.
+
+    Attributes:
+      tree (ConfigTree): Owning tree.
+      index (int): Line index within the tree.
+    """
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: "ConfigTree", index: int) -> None:
+        self.tree = tree
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"ConfigNode({self.text!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, ConfigNode)
+            and other.tree is self.tree
+            and other.index == self.index
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    @property
+    def text(self) -> str:
+        """
+        Stripped line text.
+        """
+        return self.tree.lines[self.index]
+
+    @property
+    def depth(self) -> int:
+        """
+        Nesting depth (0 for top-level lines).
+        """
+        return self.tree.depths[self.index]
+
+    @property
+    def parent(self) -> Optional["ConfigNode"]:
+        """
+        Enclosing block line, or None for top-level lines.
+        """
+        parent = self.tree.parents[self.index]
+        return None if parent < 0 else ConfigNode(self.tree, parent)
+
+    @property
+    def children(self) -> List["ConfigNode"]:
+        """
+        Direct child lines, in config order.
+        """
+        return [ConfigNode(self.tree, i) for i in self.tree.child_indexes(self.index)]
+
+    @property
+    def path(self) -> List[str]:
+        """
+        Texts from the top-level ancestor down to this line.
+        """
+        parts: List[str] = []
+        node: Optional[ConfigNode] = self
+        while node is not None:
+            parts.append(node.text)
+            node = node.parent
+        return parts[::-1]
+
+    def query(self, *patterns: str) -> List["ConfigNode"]:
+        """
+        Runs a path query relative to this node's children.
+        """
+        return self.tree._query(self.tree.child_indexes(self.index), patterns)
+
+    def lines(self) -> Iterator[str]:
+        """
+        Yields this line and all descendants, re-indented by one space per level.
+        """
+        yield self.text
+        for index in self.tree.descendant_indexes(self.index):
+            yield " " * (self.tree.depths[index] - self.depth) + self.tree.lines[index]
+
+
+class ConfigTree:
+    """
+    Array-backed hierarchical view of a device config.
+
+    Attributes:
+      lines (List[str]): Stripped line texts, in config order.
+      parents (array): Parent line index per line (-1 for top level).
+      depths (array): Nesting depth per line.
+
+    Example:
+      tree = parse_config(text)
+      for iface in tree.query(r"interface GigabitEthernet"):
+          print(iface.text, [c.text for c in iface.children])
+      tree.query(r"router bgp", r"neighbor \\S+ remote-as")
+    """
+
+    __slots__ = ("lines", "parents", "depths", "_children")
+
+    def __init__(
+        self, lines: List[str], parents: "array[int]", depths: "array[int]"
+    ) -> None:
+        self.lines = lines
+        self.parents = parents
+        self.depths = depths
+        self._children: Optional[Dict[int, List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def _child_map(self) -> Dict[int, List[int]]:
+        if self._children is None:
+            children: Dict[int, List[int]] = {}
+            for index, parent in enumerate(self.parents):
+                children.setdefault(parent, []).append(index)
+            self._children = children
+        return self._children
+
+    def child_indexes(self, index: int) -> List[int]:
+        """
+        Returns indexes of the direct children of `index` (-1 for top level).
+        """
+        return self._child_map().get(index, [])
+
+    def descendant_indexes(self, index: int) -> range:
+        """
+        Returns indexes of all lines nested under `index`.
+
+        Notes:
+          - Descendants are always the contiguous run of deeper lines that follows.
+        """
+        depth = self.depths[index]
+        end = index + 1
+        while end < len(self.lines) and self.depths[end] > depth:
+            end += 1
+        return range(index + 1, end)
+
+    @property
+    def roots(self) -> List[ConfigNode]:
+        """
+        Top-level lines.
+        """
+        return [ConfigNode(self, i) for i in self.child_indexes(-1)]
+
+    def query(self, *patterns: str) -> List[ConfigNode]:
+        """
+        Finds lines by path: one regex per level, starting at the top level.
+
+        Args:
+          *patterns (str): Regexes matched (anchored at line start) at successive
+            depths.
+
+        Returns:
+          List[ConfigNode]: Lines matching the last pattern whose ancestors matched
+          the preceding ones.
+
+        Example:
+          tree.query(r"interface ", r"shutdown$")  # shut-down interfaces' lines
+        """
+        return self._query(self.child_indexes(-1), patterns)
+
+    def _query(
+        self, candidates: List[int], patterns: Sequence[str]
+    ) -> List[ConfigNode]:
+        if not patterns:
+            return []
+        current = candidates
+        for level, pattern in enumerate(patterns):
+            match = _compile(pattern).match
+            current = [i for i in current if match(self.lines[i])]
+            if level < len(patterns) - 1:
+                current = [c for i in current for c in self.child_indexes(i)]
+        return [ConfigNode(self, i) for i in current]
+
+    def section(self, pattern: str) -> Optional[ConfigNode]:
+        """
+        Returns the first top-level block matching `pattern`, or None.
+        """
+        found = self.query(pattern)
+        return found[0] if found else None
+
+    def to_columns(self) -> Dict[str, object]:
+        """
+        Returns builtin-typed columns for caching.
+        """
+        return {
+            "lines": self.lines,
+            "parents": self.parents.tobytes(),
+            "depths": self.depths.tobytes(),
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, object]) -> "ConfigTree":
+        """
+        Rebuilds a tree from `to_columns()` output.
+        """
+        parents = array("i")
+        depths = array("H")
+        parents.frombytes(columns["parents"])  # type: ignore[arg-type]
+        depths.frombytes(columns["depths"])  # type: ignore[arg-type]
+        return cls(columns["lines"], parents, depths)  # type: ignore[arg-type]
+
+
+def parse_config(text: str) -> ConfigTree:
+    """
+    Parses indentation-based config text into a ConfigTree.
+
+    Args:
+      text (str): Raw configuration text.
+
+    Returns:
+      ConfigTree: Parsed tree.
+    """
+    lines: List[str] = []
+    parents = array("i")
+    depths = array("H")
+    # Stack of (indent, line index) for currently open blocks.
+    stack: List[Tuple[int, int]] = []
+
+    for raw in text.splitlines():
+        stripped = raw.strip()
+        if not stripped or stripped == "!":
+            continue
+        indent = len(raw) - len(raw.lstrip())
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        parents.append(stack[-1][1] if stack else -1)
+        depths.append(len(stack))
+        stack.append((indent, len(lines)))
+        lines.append(stripped)
+
+    return ConfigTree(lines, parents, depths)
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed trees keyed by the SHA-256 of the config text.
+
+    Args:
+      cache_dir (str): Directory holding cached trees (sharded by hash prefix).
+    """
+
+    def __init__(self, cache_dir: str = ".cache/parse") -> None:
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, config_hash: str) -> Path:
+        return self.cache_dir / config_hash[:2] / f"{config_hash}.marshal"
+
+    def get(self, config_hash: str) -> Optional[ConfigTree]:
+        """
+        Returns the cached tree, or None on a miss or unreadable entry.
+        """
+        try:
+            # marshal.loads on the whole buffer; marshal.load(file) reads in
+            # tiny increments and is much slower.
+            cached = marshal.loads(self._path(config_hash).read_bytes())
+            if cached.get("version") != _CACHE_VERSION:
+                return None
+            return ConfigTree.from_columns(cached)
+        except (OSError, EOFError, ValueError, TypeError, KeyError):
+            return None
+
+    def put(self, config_hash: str, tree: ConfigTree) -> None:
+        """
+        Stores a tree atomically; write errors are ignored.
+        """
+        path = self._path(config_hash)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            with tmp_path.open("wb") as f:
+                marshal.dump({"version": _CACHE_VERSION, **tree.to_columns()}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def parse(self, text: str, config_hash: Optional[str] = None) -> ConfigTree:
+        """
+        Parses `text`, serving the result from the cache when possible.
+
+        Args:
+          text (str): Raw configuration text.
+          config_hash (Optional[str]): SHA-256 of `text`, if already known.
+        """
+        if config_hash is None:
+            config_hash = hashlib.sha256(text.encode()).hexdigest()
+        tree = self.get(config_hash)
+        if tree is None:
+            tree = parse_config(text)
+            self.put(config_hash, tree)
+        return tree
+
+
+def load_tree(
+    location: str, config_hash: Optional[str] = None, cache: Optional[ParseCache] = None
+) -> ConfigTree:
+    """
+    Returns the parsed tree of a stored config.
+
+    Args:
+      location (str): Output location from the writer / run report.
+      config_hash (Optional[str]): Known SHA-256 (e.g. from the run report). When
+        given and cached, the config file is not read at all.
+      cache (Optional[ParseCache]): Parse cache (default: .cache/parse).
+
+    Returns:
+      ConfigTree: Parsed tree.
+    """
+    cache = cache or ParseCache()
+    if config_hash is not None:
+        tree = cache.get(config_hash)
+        if tree is not None:
+            return tree
+    return cache.parse(read_config(location))
+
+
+def changed_sections(old: ConfigTree, new: ConfigTree) -> List[str]:
+    """
+    Returns the top-level lines whose block was added, removed, or modified.
+
+    Args:
+      old (ConfigTree): Previous config.
+      new (ConfigTree): Current config.
+
+    Returns:
+      List[str]: Changed top-level lines in `new` order, then removed ones in
+      `old` order (a changed top-level line appears in both forms).
+    """
+
+    def blocks(tree: ConfigTree) -> Dict[str, List[str]]:
+        found: Dict[str, List[str]] = {}
+        for root in tree.roots:
+            found.setdefault(root.text, []).extend(root.lines())
+        return found
+
+    before = blocks(old)
+    after = blocks(new)
+    changed = [text for text, lines in after.items() if before.get(text) != lines]
+    changed.extend(text for text in before if text not in after)
+    return changed
@@ -12,16 +12,24 @@ Dependencies:
   - dotenv (python-dotenv)
 
 Notes:
-  - Automatically loads `.env` from the project root using `load_dotenv()`.
+  - Loads `.env` from the project root using `load_dotenv()` on the first lookup,
+    not at import time, so callers that never read a variable skip python-dotenv.
   - Recommended for use in non-containerized or local development environments.
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 
-from dotenv import load_dotenv
 
-load_dotenv()
+@lru_cache(maxsize=None)
+def _load_dotenv_once() -> None:
+    """
+    Loads `.env` into `os.environ` exactly once per process.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
 
 def get_env_var(
@@ -42,10 +50,12 @@ def get_env_var(
       EnvironmentError: If the variable is required and not found or empty.
 
     Notes:
-      - Reads from `os.environ`, including values from a `.env` file (loaded at import).
+      - Reads from `os.environ`, including values from a `.env` file (loaded on
+        first call).
       - Useful for secrets like SSH_USERNAME or API_KEY.
       - If both default and required=True are set, required takes precedence.
     """
+    _load_dotenv_once()
     value = os.getenv(name, default)
 
     if required and not value:
@@ -0,0 +1,162 @@
+"""
+Event Sink Utility
+
+Delivers batches of JSON-serializable events to an external consumer.
+
+Contents:
+  - EventSink: Base class for one delivery target.
+  - JSONLinesSink: Appends one JSON object per line to a file.
+  - UnixSocketSink: Streams JSON lines to a Unix domain socket.
+  - WebhookSink: POSTs each batch as a JSON array to an HTTP endpoint.
+  - SINKS: Sink classes by name (as used in `events.sinks[].type`).
+
+Dependencies:
+  - json
+  - socket
+  - urllib.request
+
+Notes:
+  - Sinks are called from a single delivery thread and need not be thread-safe.
+  - send() raises on failure (OSError, HTTPStatusError); the caller decides
+    whether to retry or drop. Connections are re-opened on the next batch.
+"""
+
+import json
+import socket
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from src.utils.http_utils import HTTPStatusError
+
+Event = Dict[str, Any]
+
+
+def _encode_lines(events: List[Event]) -> bytes:
+    return b"".join(
+        json.dumps(event, separators=(",", ":")).encode() + b"\n" for event in events
+    )
+
+
+class EventSink:
+    """
+    One event delivery target. Subclasses implement send().
+
+    Args:
+      target (str): File path, socket path, or URL, depending on the sink.
+      timeout (float): Connect/send timeout in seconds, where applicable.
+
+    Attributes:
+      name (str): Sink type used in settings.
+    """
+
+    name = "base"
+
+    def __init__(self, target: str, timeout: float = 5.0) -> None:
+        self.target = target
+        self.timeout = timeout
+
+    def send(self, events: List[Event]) -> None:
+        """
+        Delivers a batch of events, in order.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Releases any open file or connection.
+        """
+
+
+class JSONLinesSink(EventSink):
+    """
+    Appends events to a JSON Lines file (flushed after every batch).
+
+    Args:
+      target (str): Output file; parent directories are created.
+      timeout (float): Unused.
+    """
+
+    name = "jsonl"
+
+    def __init__(self, target: str, timeout: float = 5.0) -> None:
+        super().__init__(target, timeout)
+        self._file: Optional[BinaryIO] = None
+
+    def send(self, events: List[Event]) -> None:
+        if self._file is None:
+            Path(self.target).parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.target, "ab")
+        self._file.write(_encode_lines(events))
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class UnixSocketSink(EventSink):
+    """
+    Streams events as JSON lines over a Unix domain stream socket.
+
+    Args:
+      target (str): Socket path of a listening local receiver.
+      timeout (float): Connect and send timeout in seconds.
+    """
+
+    name = "unix"
+
+    def __init__(self, target: str, timeout: float = 5.0) -> None:
+        super().__init__(target, timeout)
+        self._sock: Optional[socket.socket] = None
+
+    def send(self, events: List[Event]) -> None:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.target)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        try:
+            self._sock.sendall(_encode_lines(events))
+        except OSError:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+class WebhookSink(EventSink):
+    """
+    POSTs each batch to a URL as a JSON array (`Content-Type: application/json`).
+
+    Args:
+      target (str): Receiver URL.
+      timeout (float): Request timeout in seconds.
+    """
+
+    name = "webhook"
+
+    def send(self, events: List[Event]) -> None:
+        request = urllib.request.Request(
+            self.target,
+            data=json.dumps(events, separators=(",", ":")).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+                resp.read()
+        except urllib.error.HTTPError as exc:
+            raise HTTPStatusError(exc.code, str(exc.reason), self.target) from None
+
+
+SINKS = {cls.name: cls for cls in (JSONLinesSink, UnixSocketSink, WebhookSink)}
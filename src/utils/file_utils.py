@@ -4,26 +4,182 @@ File Output Utility
 Handles writing configuration data to `.cfg` files using a standardized naming format.
 
 Contents:
-  - write_config_to_file(): Writes raw config data to a timestamped .cfg file.
+  - write_config_to_file(): Atomically writes config data to a timestamped .cfg file.
+  - ConfigWriter: Background writer stage fed by collection workers.
+  - read_config(): Reads a config back from a file path or bundle location.
+  - replace_archive(): Swaps in a rewritten archive and its index.
+  - fsync_dir(): Flushes a directory's entries to stable storage.
+  - config_subdir(): Shard directory for a config under the configured layout.
+  - parse_config_name(): Splits `<hostname>_<YYYYMMDD>.cfg` into its parts.
+  - iter_stored_configs(): Walks loose files, monthly archives, and run bundles.
 
 Dependencies:
   - pathlib
+  - queue / threading
+  - tarfile / zipfile
 
 Notes:
-  - Files are saved in <output_dir>/<hostname>_<YYYYMMDD>.cfg format.
+  - Files are saved in <output_dir>/[<shard>/]<hostname>_<YYYYMMDD>.cfg format, where
+    the shard depends on the storage layout:
+      flat: no shard (legacy)
+      date: YYYY/MM/DD/
+      host: <2 hex digits of sha1(hostname)>/<hostname>/
+    Sharding keeps every directory small, and the host layout turns one device's
+    history into a single directory listing.
   - Output directory is created if it does not exist.
   - Filename is sanitized only at higher levels (assumes valid hostnames here).
+  - Every file is written to a temporary sibling and renamed into place, so a
+    crash never leaves a truncated `.cfg` behind.
+  - ConfigWriter drains completed configs in batches: file fsyncs within a batch
+    run concurrently on a small pool (`fsync_workers`), and each directory is
+    fsynced once per batch instead of once per file, which keeps the number of
+    serial synchronous round-trips low on NFS-backed archives.
 
 Warnings:
   - If output_dir is not writable, this will raise an OSError.
   - Config data is written as-is — no filtering or parsing is performed.
 """
 
+import hashlib
+import io
+import itertools
+import json
+import os
+import queue
+import re
+import struct
+import tarfile
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from types import TracebackType
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Type, Union
+
+BUNDLE_FORMATS = ("tar", "zip")
+LAYOUTS = ("flat", "date", "host")
+
+_CONFIG_NAME = re.compile(r"^(?P<hostname>.+)_(?P<date>\d{8})\.cfg$")
+
+_STOP = object()
+
+# Makes temporary file names unique across threads and writers of one process.
+_tmp_counter = itertools.count()
+
+
+class StoredConfig(NamedTuple):
+    """
+    One stored config found by iter_stored_configs().
+
+    Attributes:
+      hostname (str): Device hostname.
+      date_stamp (str): Collection date (YYYYMMDD).
+      location (str): Path, or `<archive>#<member>` for archived/bundled configs.
+      size (int): Stored size in bytes (compressed size for zip members).
+    """
+
+    hostname: str
+    date_stamp: str
+    location: str
+    size: int
+
+
+def config_subdir(hostname: str, date_stamp: str, layout: str = "flat") -> str:
+    """
+    Returns the shard directory (relative to output_dir) for a config.
+
+    Args:
+      hostname (str): Device hostname.
+      date_stamp (str): Collection date (YYYYMMDD).
+      layout (str): One of LAYOUTS.
+
+    Returns:
+      str: Relative directory ("" for the flat layout).
+
+    Raises:
+      ValueError: If the layout is unknown.
+    """
+    if layout == "flat":
+        return ""
+    if layout == "date":
+        return f"{date_stamp[:4]}/{date_stamp[4:6]}/{date_stamp[6:8]}"
+    if layout == "host":
+        shard = hashlib.sha1(hostname.encode()).hexdigest()[:2]
+        return f"{shard}/{hostname}"
+    raise ValueError(f"Unsupported storage layout: {layout}")
+
+
+def parse_config_name(name: str) -> Optional[Tuple[str, str]]:
+    """
+    Splits a config filename into (hostname, YYYYMMDD), or None if it is not one.
+    """
+    match = _CONFIG_NAME.match(name)
+    if match is None:
+        return None
+    return match.group("hostname"), match.group("date")
+
+
+def fsync_dir(path: Path) -> None:
+    """
+    Flushes directory metadata (new names from renames) to stable storage.
+
+    Args:
+      path (Path): Directory to fsync.
+
+    Notes:
+      - Silently ignored on platforms that cannot open directories (Windows).
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _tmp_sibling(file_path: Path) -> Path:
+    return file_path.with_name(
+        f".{file_path.name}.{os.getpid()}.{next(_tmp_counter)}.tmp"
+    )
+
+
+def _atomic_write_bytes(file_path: Path, data: bytes, fsync: bool) -> None:
+    """
+    Writes bytes to a temporary sibling file, then renames it over `file_path`.
+
+    Args:
+      file_path (Path): Final destination path.
+      data (bytes): File content.
+      fsync (bool): If True, flush file content to disk before the rename.
+
+    Raises:
+      OSError: If writing or renaming fails. The temporary file is removed.
+    """
+    tmp_path = _tmp_sibling(file_path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
 def write_config_to_file(
-    hostname: str, config_data: str, date_stamp: str, output_dir: str
+    hostname: str,
+    config_data: str,
+    date_stamp: str,
+    output_dir: str,
+    fsync: bool = False,
+    layout: str = "flat",
 ) -> None:
     """
     Writes a raw device config string to a local `.cfg` file using the hostname and date stamp.
@@ -33,6 +189,8 @@ def write_config_to_file(
       config_data (str): Raw configuration text to write.
       date_stamp (str): Timestamp (YYYYMMDD) used in the filename.
       output_dir (str): Destination directory for writing the config file.
+      fsync (bool): If True, fsync the file and its directory before returning.
+      layout (str): Storage layout used to shard output_dir (see LAYOUTS).
 
     Returns:
       None
@@ -43,9 +201,566 @@ def write_config_to_file(
     Notes:
       - Example output filename: `router1_20250518.cfg`
       - Caller is responsible for ensuring unique hostnames to avoid overwrite.
+      - The write is atomic: readers see either the old file or the complete new one.
     """
-    out_path = Path(output_dir)
+    out_path = Path(output_dir) / config_subdir(hostname, date_stamp, layout)
     out_path.mkdir(parents=True, exist_ok=True)
 
     file_path = out_path / f"{hostname}_{date_stamp}.cfg"
-    file_path.write_text(config_data)
+    _atomic_write_bytes(file_path, config_data.encode(), fsync)
+    if fsync:
+        fsync_dir(out_path)
+
+
+def zip_index_entry(info: zipfile.ZipInfo) -> Dict[str, int]:
+    """
+    Returns the index entry that lets read_config() fetch a zip member with one seek.
+
+    Args:
+      info (zipfile.ZipInfo): Member metadata from the archive being written.
+
+    Returns:
+      Dict[str, int]: Local header offset, sizes, and compression method.
+    """
+    return {
+        "offset": info.header_offset,
+        "size": info.file_size,
+        "csize": info.compress_size,
+        "method": info.compress_type,
+    }
+
+
+def write_index(
+    archive_path: Path, fmt: str, members: Dict[str, Dict[str, int]], fsync: bool
+) -> None:
+    """
+    Atomically writes the `<archive>.index.json` sidecar used for random access.
+    """
+    index_path = archive_path.with_name(f"{archive_path.name}.index.json")
+    _atomic_write_bytes(
+        index_path, json.dumps({"format": fmt, "members": members}).encode(), fsync
+    )
+    _bundle_index.cache_clear()
+
+
+def replace_archive(
+    tmp_path: Path,
+    archive_path: Path,
+    fmt: str,
+    members: Dict[str, Dict[str, int]],
+    fsync: bool,
+) -> None:
+    """
+    Renames a finished archive into place and writes its index.
+
+    The old index is removed first, so no index ever describes a different
+    version of the archive; until the new one is written (or after a crash),
+    readers fall back to the archive's own directory.
+    """
+    index_path = archive_path.with_name(f"{archive_path.name}.index.json")
+    if index_path.exists():
+        index_path.unlink()
+        _bundle_index.cache_clear()
+        if fsync:
+            fsync_dir(archive_path.parent)
+    os.replace(tmp_path, archive_path)
+    write_index(archive_path, fmt, members, fsync)
+    if fsync:
+        fsync_dir(archive_path.parent)
+
+
+def _read_zip_member(
+    zip_path: str, member: str, entry: Dict[str, int]
+) -> Optional[bytes]:
+    """
+    Reads one member using its index entry, without parsing the central directory.
+
+    Returns None if the local header at the indexed offset is not `member`'s
+    (an index that does not belong to this archive).
+    """
+    with open(zip_path, "rb") as f:
+        f.seek(entry["offset"])
+        header = f.read(30)
+        if header[:4] != b"PK\x03\x04":
+            return None
+        name_len, extra_len = struct.unpack("<HH", header[26:30])
+        if f.read(name_len) != member.encode():
+            return None
+        f.seek(extra_len, os.SEEK_CUR)
+        raw = f.read(entry["csize"])
+    if entry["method"] == zipfile.ZIP_STORED:
+        return raw
+    if entry["method"] == zipfile.ZIP_DEFLATED:
+        return zlib.decompress(raw, -15)
+    raise zipfile.BadZipFile(f"Unsupported compression method {entry['method']}")
+
+
+@lru_cache(maxsize=32)
+def _bundle_index(bundle_path: str) -> Dict[str, Dict[str, int]]:
+    index_path = f"{bundle_path}.index.json"
+    with open(index_path, "rb") as f:
+        members: Dict[str, Dict[str, int]] = json.load(f)["members"]
+    return members
+
+
+def read_config(location: str) -> str:
+    """
+    Reads a stored config given the location returned by ConfigWriter.
+
+    Args:
+      location (str): A `.cfg` file path, or `<bundle path>#<member>` for bundles.
+
+    Returns:
+      str: The stored configuration text.
+
+    Raises:
+      OSError: If the file or bundle cannot be read.
+      KeyError: If the member is not present in the bundle index.
+
+    Notes:
+      - Tar and zip members are read with a single seek using the archive's JSON
+        index; zip archives without an index, or whose member header does not
+        match it, fall back to zipfile.
+    """
+    if "#" not in location:
+        return Path(location).read_bytes().decode()
+
+    bundle_path, member = location.rsplit("#", 1)
+    if bundle_path.endswith(".zip"):
+        data = None
+        try:
+            entry = _bundle_index(bundle_path)[member]
+        except (OSError, ValueError, KeyError):
+            pass
+        else:
+            data = _read_zip_member(bundle_path, member, entry)
+            if data is None:  # index of another version of the archive
+                _bundle_index.cache_clear()
+        if data is None:
+            with zipfile.ZipFile(bundle_path) as zf:
+                data = zf.read(member)
+        return data.decode()
+
+    entry = _bundle_index(bundle_path)[member]
+    with open(bundle_path, "rb") as f:
+        f.seek(entry["offset"])
+        return f.read(entry["size"]).decode()
+
+
+class ConfigWriter:
+    """
+    Dedicated writer stage that persists configs handed over by collection workers.
+
+    Workers call `submit()` and continue with the next device; a single background
+    thread drains the queue in batches. Each batch is written to temporary files,
+    whose fsyncs run concurrently on `fsync_workers` threads; the files are then
+    renamed into place and each touched directory is fsynced once.
+
+    With `bundle` set to "tar" or "zip", every config of the run is appended to one
+    archive (`<output_dir>/<run_name>.<ext>`) instead of individual files, and a
+    JSON index (`<run_name>.<ext>.index.json`) records each member's offset and size
+    for random access. The archive is renamed into place when the writer closes,
+    and only then do the futures of its members resolve.
+
+    If the writer thread fails unexpectedly, pending and later futures fail with
+    its error, and `submit()` raises RuntimeError instead of blocking.
+
+    Args:
+      output_dir (str): Destination directory.
+      fsync (bool): Flush file data and directory entries to stable storage.
+      batch_size (int): Maximum number of configs written per directory fsync.
+      queue_size (int): Bound on configs waiting to be written (back-pressure).
+      bundle (Optional[str]): None, "tar", or "zip".
+      run_name (str): Archive basename used when `bundle` is set.
+      layout (str): Storage layout for individual files (see LAYOUTS).
+      extension (str): Filename suffix (".cfg" for configs).
+      fsync_workers (int): Concurrent file fsyncs per batch.
+
+    Example:
+      with ConfigWriter("configs") as writer:
+          future = writer.submit("router1", text, "20250518")
+      path = future.result()   # bundles: only after the writer has closed
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        fsync: bool = True,
+        batch_size: int = 64,
+        queue_size: int = 256,
+        bundle: Optional[str] = None,
+        run_name: str = "run",
+        layout: str = "flat",
+        extension: str = ".cfg",
+        fsync_workers: int = 8,
+    ) -> None:
+        if bundle is not None and bundle not in BUNDLE_FORMATS:
+            raise ValueError(f"Unsupported bundle format: {bundle}")
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unsupported storage layout: {layout}")
+
+        self.output_dir = Path(output_dir)
+        self.fsync = fsync
+        self.batch_size = max(1, batch_size)
+        self.bundle = bundle
+        self.layout = layout
+        self.extension = extension
+        self.fsync_workers = max(1, fsync_workers)
+        self._known_dirs: Set[Path] = {self.output_dir}
+        self.bundle_path: Optional[Path] = (
+            self.output_dir / f"{run_name}.{bundle}" if bundle else None
+        )
+
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max(1, queue_size))
+        self._archive: Union[tarfile.TarFile, zipfile.ZipFile, None] = None
+        self._bundle_tmp: Optional[Path] = None  # unique per writer
+        self._index: Dict[str, Dict[str, int]] = {}  # member -> offset/size
+        self._dirty_dirs: Set[Path] = set()
+        self._bundled: List[Tuple["Future[str]", str]] = []  # resolved on finalize
+        self._fsync_pool: Optional[ThreadPoolExecutor] = None
+        self._submit_lock = threading.Lock()
+        self._failure: Optional[BaseException] = None  # writer thread died
+        self._failed = threading.Event()  # wakes producers waiting for space
+        self._thread = threading.Thread(
+            target=self._run, name="config-writer", daemon=True
+        )
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._thread.start()
+
+    def __enter__(self) -> "ConfigWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def submit(self, hostname: str, config_data: str, date_stamp: str) -> "Future[str]":
+        """
+        Queues a config for writing; blocks only when the queue is full.
+
+        Args:
+          hostname (str): Device hostname used in the output filename.
+          config_data (str): Raw configuration text.
+          date_stamp (str): Timestamp (YYYYMMDD) used in the filename.
+
+        Returns:
+          Future[str]: Resolves to the output location once the config is written
+          (`<file path>`), or once the bundle is finalized (`<bundle path>#<member>`),
+          or to the write error.
+
+        Raises:
+          RuntimeError: If the writer is closed or its thread has failed.
+        """
+        if self._closed:
+            raise RuntimeError("ConfigWriter is closed")
+        future: "Future[str]" = Future()
+        name = f"{hostname}_{date_stamp}{self.extension}"
+        subdir = config_subdir(hostname, date_stamp, self.layout)
+        self._put((subdir, name, config_data.encode(), future))
+        return future
+
+    def _put(self, item: object) -> None:
+        """
+        Queues an item, waiting while the queue is full, unless the thread failed.
+        """
+        while True:
+            # One non-blocking attempt under the lock, so that `_fail` never
+            # waits behind a producer and nothing is queued after its drain.
+            with self._submit_lock:
+                if self._failure is not None:
+                    raise RuntimeError("ConfigWriter thread failed") from self._failure
+                try:
+                    self._queue.put_nowait(item)
+                    return
+                except queue.Full:
+                    pass
+            self._failed.wait(0.01)
+
+    def close(self) -> None:
+        """
+        Drains pending writes, finalizes the bundle (if any), and stops the thread.
+
+        Raises:
+          OSError: If the bundle or its index could not be finalized (the
+            bundle's futures fail with the same error).
+          RuntimeError: If the writer thread failed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._put(_STOP)
+        except RuntimeError:
+            pass
+        self._thread.join()
+        if self._failure is not None:
+            raise RuntimeError("ConfigWriter thread failed") from self._failure
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        batch: List[Tuple[str, str, bytes, "Future[str]"]] = []
+        try:
+            stopping = False
+            while not stopping:
+                batch = []
+                item = self._queue.get()
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)  # type: ignore[arg-type]
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                self._write_batch(batch)
+            batch = []
+
+            try:
+                self._finalize_bundle()
+            except BaseException as exc:  # surfaced to the caller by close()
+                self._error = exc
+                for future, _ in self._bundled:
+                    future.set_exception(exc)
+            else:
+                for future, location in self._bundled:
+                    future.set_result(location)
+        except BaseException as exc:
+            self._fail(exc, [future for *_, future in batch])
+        finally:
+            if self._fsync_pool is not None:
+                self._fsync_pool.shutdown()
+
+    def _fail(self, exc: BaseException, in_progress: List["Future[str]"]) -> None:
+        """
+        Fails every unresolved future and stops accepting submissions.
+        """
+        with self._submit_lock:
+            self._failure = exc
+            self._failed.set()
+            pending = in_progress + [future for future, _ in self._bundled]
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    pending.append(item[-1])  # type: ignore[index]
+        for future in pending:
+            if not future.done():
+                future.set_exception(exc)
+
+    def _write_batch(self, batch: List[Tuple[str, str, bytes, "Future[str]"]]) -> None:
+        if self.bundle is not None:
+            for _, name, data, future in batch:
+                try:
+                    self._bundled.append((future, self._add_to_bundle(name, data)))
+                except Exception as exc:
+                    future.set_exception(exc)
+            return
+
+        # Stage 1: write every file of the batch to a temporary sibling.
+        staged: List[Tuple["Future[str]", Path, Path]] = []
+        for subdir, name, data, future in batch:
+            try:
+                directory = self.output_dir / subdir
+                if directory not in self._known_dirs:
+                    directory.mkdir(parents=True, exist_ok=True)
+                    self._known_dirs.add(directory)
+                file_path = directory / name
+                tmp_path = _tmp_sibling(file_path)
+                try:
+                    tmp_path.write_bytes(data)
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+                staged.append((future, tmp_path, file_path))
+            except Exception as exc:
+                future.set_exception(exc)
+
+        # Stage 2: fsync the temporary files concurrently.
+        if self.fsync and staged:
+            results = list(
+                self._fsync_executor().map(
+                    _fsync_file_quietly, [tmp for _, tmp, _ in staged]
+                )
+            )
+        else:
+            results = [None] * len(staged)
+
+        # Stage 3: rename into place, then fsync each touched directory once.
+        done: List[Tuple["Future[str]", str]] = []
+        for (future, tmp_path, file_path), error in zip(staged, results):
+            try:
+                if error is not None:
+                    raise error
+                os.replace(tmp_path, file_path)
+            except Exception as exc:
+                tmp_path.unlink(missing_ok=True)
+                future.set_exception(exc)
+                continue
+            self._dirty_dirs.add(file_path.parent)
+            done.append((future, str(file_path)))
+
+        try:
+            if self.fsync:
+                for directory in self._dirty_dirs:
+                    fsync_dir(directory)
+            self._dirty_dirs.clear()
+        except Exception as exc:
+            for future, _ in done:
+                future.set_exception(exc)
+            return
+
+        for future, location in done:
+            future.set_result(location)
+
+    def _fsync_executor(self) -> ThreadPoolExecutor:
+        if self._fsync_pool is None:
+            self._fsync_pool = ThreadPoolExecutor(
+                max_workers=self.fsync_workers, thread_name_prefix="config-fsync"
+            )
+        return self._fsync_pool
+
+    def _add_to_bundle(self, name: str, data: bytes) -> str:
+        archive = self._open_bundle()
+        if isinstance(archive, tarfile.TarFile):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            archive.addfile(info, io.BytesIO(data))
+            # Data ends at the archive offset, padded to a whole number of blocks.
+            padded = -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+            self._index[name] = {"offset": archive.offset - padded, "size": info.size}
+        else:
+            archive.writestr(name, data)
+            self._index[name] = zip_index_entry(archive.getinfo(name))
+        return f"{self.bundle_path}#{name}"
+
+    def _open_bundle(self) -> Union[tarfile.TarFile, zipfile.ZipFile]:
+        if self._archive is None:
+            tmp_path = self._bundle_tmp_path()
+            if self.bundle == "tar":
+                self._archive = tarfile.open(tmp_path, "w")
+            else:
+                self._archive = zipfile.ZipFile(
+                    tmp_path, "w", compression=zipfile.ZIP_DEFLATED
+                )
+        return self._archive
+
+    def _bundle_tmp_path(self) -> Path:
+        assert self.bundle_path is not None
+        if self._bundle_tmp is None:
+            self._bundle_tmp = _tmp_sibling(self.bundle_path)
+        return self._bundle_tmp
+
+    def _finalize_bundle(self) -> None:
+        if self._archive is None or self.bundle_path is None:
+            return
+        tmp_path = self._bundle_tmp_path()
+        self._archive.close()
+        if self.fsync:
+            with open(tmp_path, "rb") as f:
+                os.fsync(f.fileno())
+        replace_archive(
+            tmp_path, self.bundle_path, str(self.bundle), self._index, self.fsync
+        )
+
+
+def _fsync_file_quietly(path: Path) -> Optional[OSError]:
+    """
+    Flushes one file to stable storage; returns the error instead of raising it,
+    so one failure does not stop the rest of the batch.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError as exc:
+        return exc
+    return None
+
+
+def iter_stored_configs(
+    output_dir: str, archive_dir: str = "archive"
+) -> Iterator[StoredConfig]:
+    """
+    Walks every stored config under output_dir, whatever the layout.
+
+    Args:
+      output_dir (str): Root output directory.
+      archive_dir (str): Monthly archive directory, relative to output_dir.
+
+    Yields:
+      StoredConfig: Loose `.cfg` files (any shard depth), members of monthly
+      `.zip` archives under archive_dir, and members of per-run tar/zip bundles.
+
+    Notes:
+      - Uses os.scandir and reads only zip central directories / bundle indexes,
+        never config contents.
+    """
+    root = Path(output_dir)
+    if not root.is_dir():
+        return
+    archive_root = root / archive_dir
+
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not name.startswith("."):
+                        stack.append(Path(entry.path))
+                    continue
+                parsed = parse_config_name(name)
+                if parsed is not None:
+                    yield StoredConfig(
+                        parsed[0], parsed[1], entry.path, entry.stat().st_size
+                    )
+                elif name.endswith(".zip") and (
+                    directory == root or archive_root in Path(entry.path).parents
+                ):
+                    yield from _iter_zip(entry.path)
+                elif name.endswith(".tar") and directory == root:
+                    yield from _iter_tar_bundle(entry.path)
+
+
+def _iter_zip(zip_path: str) -> Iterator[StoredConfig]:
+    try:
+        with zipfile.ZipFile(zip_path) as zf:
+            infos = zf.infolist()
+    except (OSError, zipfile.BadZipFile):
+        return
+    for info in infos:
+        parsed = parse_config_name(info.filename.rsplit("/", 1)[-1])
+        if parsed is not None:
+            yield StoredConfig(
+                parsed[0], parsed[1], f"{zip_path}#{info.filename}", info.compress_size
+            )
+
+
+def _iter_tar_bundle(tar_path: str) -> Iterator[StoredConfig]:
+    try:
+        members = _bundle_index(tar_path)
+    except (OSError, ValueError, KeyError):
+        return
+    for name, entry in members.items():
+        parsed = parse_config_name(name)
+        if parsed is not None:
+            yield StoredConfig(
+                parsed[0], parsed[1], f"{tar_path}#{name}", entry["size"]
+            )
@@ -0,0 +1,99 @@
+"""
+HTTP Utility
+
+Retrieves a device's configuration from an HTTP(S) API such as RESTCONF.
+
+Contents:
+  - HTTPStatusError: Non-2xx response, with the status code.
+  - build_url(): Builds the request URL for a device.
+  - get_config(): Single request returning the response body.
+
+Dependencies:
+  - urllib.request
+  - ssl
+
+Notes:
+  - One GET returns the whole configuration tree (e.g. RESTCONF `/restconf/data`),
+    already structured, instead of scraping CLI output.
+  - Credentials are sent as HTTP Basic authentication.
+"""
+
+import base64
+import ssl
+import urllib.error
+import urllib.request
+from functools import lru_cache
+from typing import Optional
+
+
+class HTTPStatusError(Exception):
+    """
+    Raised for non-2xx responses.
+
+    Attributes:
+      status (int): HTTP status code.
+    """
+
+    def __init__(self, status: int, reason: str, url: str) -> None:
+        super().__init__(f"HTTP {status} {reason} for {url}")
+        self.status = status
+
+
+@lru_cache(maxsize=2)
+def _ssl_context(verify: bool) -> ssl.SSLContext:
+    context = ssl.create_default_context()
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def build_url(
+    hostname: str, scheme: str = "https", port: Optional[int] = None, path: str = "/"
+) -> str:
+    """
+    Returns `<scheme>://<host>[:port]<path>`, bracketing IPv6 literals.
+    """
+    host = f"[{hostname}]" if ":" in hostname else hostname
+    netloc = f"{host}:{port}" if port else host
+    return f"{scheme}://{netloc}{path}"
+
+
+def get_config(
+    url: str,
+    timeout: float = 30,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    accept: str = "application/yang-data+json",
+    verify_tls: bool = True,
+) -> str:
+    """
+    Performs one GET and returns the decoded body.
+
+    Args:
+      url (str): Full request URL (see build_url()).
+      timeout (float): Connect and read timeout in seconds.
+      username (Optional[str]): Basic auth user.
+      password (Optional[str]): Basic auth password.
+      accept (str): Accept header.
+      verify_tls (bool): Verify the server certificate.
+
+    Returns:
+      str: Response body.
+
+    Raises:
+      HTTPStatusError: On non-2xx responses.
+      OSError: On network errors (including urllib.error.URLError).
+    """
+    request = urllib.request.Request(url, headers={"Accept": accept})
+    if username is not None:
+        token = base64.b64encode(f"{username}:{password or ''}".encode()).decode()
+        request.add_header("Authorization", f"Basic {token}")
+    context = _ssl_context(verify_tls) if url.startswith("https:") else None
+    try:
+        with urllib.request.urlopen(request, timeout=timeout, context=context) as resp:
+            charset = resp.headers.get_content_charset() or "utf-8"
+            body: bytes = resp.read()
+            return body.decode(charset)
+    except urllib.error.HTTPError as exc:
+        raise HTTPStatusError(exc.code, str(exc.reason), url) from None
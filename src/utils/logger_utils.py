@@ -15,6 +15,8 @@ Notes:
   - Logs to file at DEBUG level and above (rotating).
   - File logs are stored under ./logs/network_automation.log
   - Uses RotatingFileHandler (max 1MB per file, 5 backups).
+  - The log directory and file are created on the first emitted record, not when
+    a module calls get_logger() at import time.
 """
 
 import logging
@@ -22,6 +24,17 @@ from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
 
+class _LazyRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that defers creating its parent directory until the
+    stream is first opened (used with `delay=True`).
+    """
+
+    def _open(self):  # type: ignore[no-untyped-def]
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Creates or retrieves a logger instance with dual output handlers:
@@ -54,14 +67,12 @@ def get_logger(name: str) -> logging.Logger:
     stream_handler.setLevel(logging.INFO)
     stream_handler.setFormatter(formatter)
 
-    # Rotating file handler
-    logs_dir = Path("logs")
-    logs_dir.mkdir(parents=True, exist_ok=True)
-
-    file_handler = RotatingFileHandler(
-        logs_dir / "network_automation.log",
+    # Rotating file handler (directory and file created on first write)
+    file_handler = _LazyRotatingFileHandler(
+        Path("logs") / "network_automation.log",
         maxBytes=1_048_576,  # 1MB
         backupCount=5,
+        delay=True,
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
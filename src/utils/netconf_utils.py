@@ -0,0 +1,207 @@
+"""
+NETCONF Utility
+
+Retrieves a device's configuration with NETCONF over SSH (RFC 6241 / RFC 6242).
+
+Contents:
+  - NetconfError: <rpc-error> reply or protocol violation.
+  - NetconfSession: Message framing over an SSH channel (base:1.0 and base:1.1).
+  - get_config(): Single connection attempt returning the full datastore.
+
+Dependencies:
+  - paramiko (imported on first use)
+  - xml.etree.ElementTree
+
+Notes:
+  - The whole datastore is fetched with one <get-config> RPC (no per-section
+    commands or screen scraping); the returned text is the XML content of <data>.
+  - base:1.1 chunked framing is used when the server advertises it, otherwise
+    base:1.0 end-of-message framing.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from typing import Any, List, Optional
+
+NETCONF_NS = "urn:ietf:params:xml:ns:netconf:base:1.0"
+BASE_10 = "urn:ietf:params:netconf:base:1.0"
+BASE_11 = "urn:ietf:params:netconf:base:1.1"
+
+_EOM = b"]]>]]>"
+
+# Inner text of the reply's <data> element, with or without a namespace prefix.
+_DATA = re.compile(r"<(?:[\w.-]+:)?data\b[^>]*?(?:/>|>(.*)</(?:[\w.-]+:)?data>)", re.S)
+
+CLIENT_HELLO = (
+    f'<?xml version="1.0" encoding="UTF-8"?><hello xmlns="{NETCONF_NS}">'
+    f"<capabilities><capability>{BASE_10}</capability>"
+    f"<capability>{BASE_11}</capability></capabilities></hello>"
+)
+
+
+class NetconfError(Exception):
+    """
+    Raised for <rpc-error> replies and malformed NETCONF messages.
+    """
+
+
+class NetconfSession:
+    """
+    NETCONF message framing over a connected channel.
+
+    Args:
+      channel (Any): Object with `sendall(bytes)` and `recv(int) -> bytes`
+        (a paramiko Channel with the `netconf` subsystem invoked, or a socket).
+
+    Attributes:
+      chunked (bool): Use base:1.1 chunked framing (set after the hello exchange).
+    """
+
+    def __init__(self, channel: Any) -> None:
+        self.channel = channel
+        self.chunked = False
+        self._buffer = b""
+
+    def _fill(self) -> None:
+        data = self.channel.recv(65536)
+        if not data:
+            raise NetconfError("connection closed by peer")
+        self._buffer += data
+
+    def send(self, message: str) -> None:
+        """
+        Sends one message with the current framing.
+        """
+        data = message.encode()
+        if self.chunked:
+            self.channel.sendall(b"\n#%d\n" % len(data) + data + b"\n##\n")
+        else:
+            self.channel.sendall(data + _EOM)
+
+    def read(self) -> str:
+        """
+        Reads one complete message with the current framing.
+
+        Raises:
+          NetconfError: If the peer closes mid-message or the framing is invalid.
+        """
+        return self._read_chunked() if self.chunked else self._read_eom()
+
+    def _read_eom(self) -> str:
+        while True:
+            end = self._buffer.find(_EOM)
+            if end >= 0:
+                message = self._buffer[:end]
+                self._buffer = self._buffer[end + len(_EOM) :]
+                return message.decode()
+            self._fill()
+
+    def _read_chunked(self) -> str:
+        chunks: List[bytes] = []
+        while True:
+            while self._buffer.find(b"\n", 2) < 0:
+                self._fill()
+            if not self._buffer.startswith(b"\n#"):
+                raise NetconfError("invalid chunk header")
+            header_end = self._buffer.index(b"\n", 2)
+            size_text = self._buffer[2:header_end]
+            if size_text == b"#":
+                self._buffer = self._buffer[header_end + 1 :]
+                return b"".join(chunks).decode()
+            if not size_text.isdigit():
+                raise NetconfError("invalid chunk size")
+            size = int(size_text)
+            start = header_end + 1
+            while len(self._buffer) < start + size:
+                self._fill()
+            chunks.append(self._buffer[start : start + size])
+            self._buffer = self._buffer[start + size :]
+
+    def hello(self) -> List[str]:
+        """
+        Exchanges <hello> messages and switches to base:1.1 framing if both sides
+        support it.
+
+        Returns:
+          List[str]: Capabilities advertised by the server.
+        """
+        server_hello = ET.fromstring(self._read_eom())
+        capabilities = [
+            (cap.text or "").strip()
+            for cap in server_hello.iter(f"{{{NETCONF_NS}}}capability")
+        ]
+        self.send(CLIENT_HELLO)
+        self.chunked = BASE_11 in capabilities
+        return capabilities
+
+    def rpc(self, body: str, message_id: int) -> str:
+        """
+        Sends one RPC and returns the raw <rpc-reply> text.
+
+        Raises:
+          NetconfError: If the reply contains an <rpc-error>.
+        """
+        self.send(f'<rpc xmlns="{NETCONF_NS}" message-id="{message_id}">{body}</rpc>')
+        text = self.read()
+        error = ET.fromstring(text).find(f"{{{NETCONF_NS}}}rpc-error")
+        if error is not None:
+            message = error.findtext(f"{{{NETCONF_NS}}}error-message") or "rpc-error"
+            raise NetconfError(message.strip())
+        return text
+
+
+def get_config(
+    hostname: str,
+    port: int = 830,
+    timeout: float = 30,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    source: str = "running",
+) -> str:
+    """
+    Connects once and returns the full configuration datastore as XML.
+
+    Args:
+      hostname (str): Target device hostname or IP address.
+      port (int): NETCONF SSH port.
+      timeout (float): Connect and read timeout in seconds.
+      username (Optional[str]): Login user.
+      password (Optional[str]): Login password.
+      source (str): Datastore to read ("running", "startup", ...).
+
+    Returns:
+      str: The content of <data>, exactly as sent by the device.
+
+    Raises:
+      NetconfError: On <rpc-error> replies or protocol errors.
+      paramiko.SSHException: On connection/authentication failure.
+      OSError: On network errors.
+    """
+    import paramiko
+
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        client.connect(
+            hostname, port=port, username=username, password=password, timeout=timeout
+        )
+        transport = client.get_transport()
+        if transport is None:
+            raise paramiko.SSHException("SSH transport closed after connect")
+        channel = transport.open_session(timeout=timeout)
+        channel.settimeout(timeout)
+        channel.invoke_subsystem("netconf")
+
+        session = NetconfSession(channel)
+        session.hello()
+        reply = session.rpc(f"<get-config><source><{source}/></source></get-config>", 1)
+        match = _DATA.search(reply)
+        if match is None:
+            raise NetconfError("rpc-reply without <data>")
+        try:
+            session.rpc("<close-session/>", 2)
+        except (NetconfError, OSError):
+            pass
+        return (match.group(1) or "").strip()
+    finally:
+        client.close()
@@ -0,0 +1,418 @@
+"""
+Profiler Utility
+
+Profiles a multi-threaded run with per-thread attribution and writes the results
+as standard pstats files and flamegraph-compatible collapsed stacks.
+
+Contents:
+  - thread_group(): Stable group name for a thread (pool index stripped).
+  - SamplingProfiler: Wall-clock stack sampler over all threads.
+  - TracingProfiler: Deterministic cProfile, one profiler per thread.
+  - RunProfiler: Runs one of the above (plus the sampler) and saves the results.
+  - load_profile(): Reads a saved profile's self/cumulative seconds per function.
+  - compare_profiles(): Ranks the functions whose time changed most between runs.
+
+Dependencies:
+  - cProfile / pstats / marshal
+  - sys._current_frames (sampling)
+
+Notes:
+  - Output directory layout:
+      all.pstats              every thread (pstats.Stats / snakeviz / gprof2dot)
+      thread-<group>.pstats   one file per thread group (collector, config-writer, ...)
+      stacks.collapsed        "<group>;<frame>;...;<frame> <samples>" lines for
+                              flamegraph.pl, speedscope, or inferno
+      profile.json            mode, interval, duration, samples per group
+  - "sample" mode is low overhead and measures wall time, so threads blocked on
+    the network or a queue show where they wait; its pstats are synthesized from
+    the samples (call counts are sample counts, times are samples multiplied by
+    the measured time per sampling round).
+  - "trace" mode measures every call with cProfile in every thread started after
+    the profiler (threading.setprofile); it is exact but slows the run. The
+    sampler still runs alongside it for the collapsed stacks.
+"""
+
+import cProfile
+import json
+import marshal
+import os
+import pstats
+import re
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# pstats function key: (filename, first line, function name)
+FuncKey = Tuple[str, int, str]
+
+_POOL_SUFFIX = re.compile(r"[_-]\d+$")
+_STDLIB = sysconfig.get_paths()["stdlib"] + os.sep
+
+
+def thread_group(thread: threading.Thread) -> str:
+    """
+    Returns the thread's name without its pool index ("collector_3" -> "collector").
+
+    Unnamed threads ("Thread-12 (...)") are grouped by their class or target.
+    """
+    name = thread.name
+    if name.startswith("Thread-"):
+        if type(thread) is not threading.Thread:
+            return f"{type(thread).__module__.split('.')[0]}.{type(thread).__name__}"
+        target = getattr(thread, "_target", None)
+        return getattr(target, "__qualname__", "thread")
+    return _POOL_SUFFIX.sub("", name)
+
+
+def _short_path(filename: str) -> str:
+    """
+    Returns a run-independent file label: relative to site-packages or the
+    working directory when possible.
+    """
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    if filename.startswith(_STDLIB):
+        return filename[len(_STDLIB) :]
+    try:
+        return os.path.relpath(filename)
+    except ValueError:
+        return filename
+
+
+class SamplingProfiler:
+    """
+    Samples every thread's stack at a fixed interval.
+
+    Args:
+      interval (float): Seconds between samples.
+
+    Attributes:
+      samples (Counter): (group, stack of FuncKey from outermost) -> sample count.
+      ticks (int): Sampling rounds taken.
+      elapsed (float): Seconds between the first and last round.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.samples: "Counter[Tuple[str, Tuple[FuncKey, ...]]]" = Counter()
+        self.ticks = 0
+        self.elapsed = 0.0
+        self._keys: Dict[CodeType, FuncKey] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profiler-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _key(self, code: CodeType) -> FuncKey:
+        key = self._keys.get(code)
+        if key is None:
+            key = (code.co_filename, code.co_firstlineno, code.co_name)
+            self._keys[code] = key
+        return key
+
+    def _stack(self, frame: Optional[FrameType]) -> Tuple[FuncKey, ...]:
+        stack: List[FuncKey] = []
+        while frame is not None:
+            stack.append(self._key(frame.f_code))
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    @property
+    def seconds_per_sample(self) -> float:
+        """
+        Measured time per sampling round; rounds run late while other threads
+        hold the GIL, so this is usually longer than `interval`.
+        """
+        return self.elapsed / self.ticks if self.ticks else self.interval
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        started = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            self.ticks += 1
+            self.elapsed = time.perf_counter() - started
+            groups = {t.ident: thread_group(t) for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    group = groups.get(ident, "unknown")
+                    self.samples[(group, self._stack(frame))] += 1
+
+    def collapsed(self) -> List[str]:
+        """
+        Returns collapsed-stack lines ("group;frame;...;frame count"), sorted.
+        """
+        lines: "Counter[str]" = Counter()
+        for (group, stack), count in self.samples.items():
+            frames = ";".join(f"{_short_path(f)}:{name}" for f, _, name in stack)
+            lines[f"{group};{frames}"] += count
+        return [f"{stack} {count}" for stack, count in sorted(lines.items())]
+
+    def stats(self, group: Optional[str] = None) -> Dict[FuncKey, Any]:
+        """
+        Returns a pstats-compatible stats dict built from the samples.
+
+        Args:
+          group (Optional[str]): Restrict to one thread group.
+
+        Returns:
+          Dict: FuncKey -> (calls, calls, self s, cumulative s, callers).
+        """
+        self_s: Dict[FuncKey, float] = defaultdict(float)
+        cum_s: Dict[FuncKey, float] = defaultdict(float)
+        hits: "Counter[FuncKey]" = Counter()
+        callers: Dict[FuncKey, Dict[FuncKey, List[float]]] = defaultdict(dict)
+        for (sample_group, stack), count in self.samples.items():
+            if not stack or (group is not None and sample_group != group):
+                continue
+            seconds = count * self.seconds_per_sample
+            self_s[stack[-1]] += seconds
+            for func in set(stack):
+                cum_s[func] += seconds
+                hits[func] += count
+            for caller, callee in set(zip(stack, stack[1:])):
+                edge = callers[callee].setdefault(caller, [0, 0, 0.0, 0.0])
+                edge[0] += count
+                edge[1] += count
+                edge[2] += seconds if callee == stack[-1] else 0.0
+                edge[3] += seconds
+        return {
+            func: (
+                hits[func],
+                hits[func],
+                self_s[func],
+                cum_s[func],
+                {caller: tuple(edge) for caller, edge in callers[func].items()},
+            )
+            for func in cum_s
+        }
+
+    def groups(self) -> Dict[str, int]:
+        """
+        Returns the number of samples per thread group.
+        """
+        totals: "Counter[str]" = Counter()
+        for (group, _), count in self.samples.items():
+            totals[group] += count
+        return dict(totals)
+
+
+class TracingProfiler:
+    """
+    Deterministic cProfile of the calling thread and every thread started later.
+    """
+
+    def __init__(self) -> None:
+        self.profiles: List[Tuple[str, cProfile.Profile]] = []
+        self._lock = threading.Lock()
+        self._main = cProfile.Profile()
+
+    def _bootstrap(self, frame: FrameType, event: str, arg: Any) -> None:
+        # Installed by threading.setprofile(): runs once in each new thread,
+        # then hands that thread over to its own cProfile.Profile.
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        with self._lock:
+            self.profiles.append((thread_group(threading.current_thread()), profile))
+        profile.enable()
+
+    def start(self) -> None:
+        threading.setprofile(self._bootstrap)
+        self.profiles.append((thread_group(threading.current_thread()), self._main))
+        self._main.enable()
+
+    def stop(self) -> None:
+        self._main.disable()
+        threading.setprofile(None)  # type: ignore[arg-type]
+
+    def stats(self) -> Dict[str, pstats.Stats]:
+        """
+        Returns merged pstats per thread group.
+        """
+        merged: Dict[str, pstats.Stats] = {}
+        with self._lock:
+            profiles = list(self.profiles)
+        for group, profile in profiles:
+            profile.create_stats()
+            if not profile.stats:  # type: ignore[attr-defined]
+                continue
+            if group in merged:
+                merged[group].add(profile)
+            else:
+                merged[group] = pstats.Stats(profile)
+        return merged
+
+
+def _safe_name(group: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", group)
+
+
+class RunProfiler:
+    """
+    Profiles a block of code and saves pstats and collapsed stacks.
+
+    Args:
+      mode (str): "sample" or "trace".
+      interval (float): Sampling interval in seconds.
+
+    Example:
+      with RunProfiler("sample") as profiler:
+          report = collect_device_configs(...)
+      profiler.save(Path(report_dir) / f"{report.run_id}.profile")
+    """
+
+    def __init__(self, mode: str = "sample", interval: float = 0.005) -> None:
+        if mode not in ("sample", "trace"):
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.sampler = SamplingProfiler(interval)
+        self.tracer = TracingProfiler() if mode == "trace" else None
+        self.duration = 0.0
+        self._started = 0.0
+
+    def __enter__(self) -> "RunProfiler":
+        self._started = time.perf_counter()
+        self.sampler.start()
+        if self.tracer is not None:
+            self.tracer.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if self.tracer is not None:
+            self.tracer.stop()
+        self.sampler.stop()
+        self.duration = time.perf_counter() - self._started
+
+    def save(self, directory: Path) -> Path:
+        """
+        Writes the profile files into `directory` (created if needed).
+
+        Returns:
+          Path: The directory.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        for old in directory.glob("*.pstats"):
+            old.unlink()
+
+        if self.tracer is not None:
+            total = pstats.Stats()
+            for group, stats in self.tracer.stats().items():
+                stats.dump_stats(str(directory / f"thread-{_safe_name(group)}.pstats"))
+                total.add(stats)
+            total.dump_stats(str(directory / "all.pstats"))
+        else:
+            for group in self.sampler.groups():
+                with open(directory / f"thread-{_safe_name(group)}.pstats", "wb") as f:
+                    marshal.dump(self.sampler.stats(group), f)
+            with open(directory / "all.pstats", "wb") as f:
+                marshal.dump(self.sampler.stats(), f)
+
+        (directory / "stacks.collapsed").write_text(
+            "\n".join(self.sampler.collapsed()) + "\n"
+        )
+        meta = {
+            "mode": self.mode,
+            "interval": self.sampler.interval,
+            "seconds_per_sample": round(self.sampler.seconds_per_sample, 6),
+            "duration": round(self.duration, 3),
+            "samples": self.sampler.groups(),
+        }
+        (directory / "profile.json").write_text(json.dumps(meta, indent=2) + "\n")
+        return directory
+
+
+class FunctionTime(NamedTuple):
+    """
+    Time attributed to one function in a saved profile.
+
+    Attributes:
+      self_s (float): Seconds in the function itself.
+      cum_s (float): Seconds including callees.
+    """
+
+    self_s: float
+    cum_s: float
+
+
+def _label(key: FuncKey) -> str:
+    filename, _, name = key
+    if filename == "~":  # built-in functions in cProfile output
+        return name
+    return f"{_short_path(filename)}:{name}"
+
+
+def load_profile(path: str) -> Dict[str, FunctionTime]:
+    """
+    Reads a profile directory (or a .pstats file) into per-function times.
+
+    Returns:
+      Dict[str, FunctionTime]: "<file>:<function>" -> times; line numbers are
+      dropped so labels stay stable across code edits.
+    """
+    source = Path(path)
+    if source.is_dir():
+        source = source / "all.pstats"
+    stats = pstats.Stats(str(source)).stats  # type: ignore[attr-defined]
+    times: Dict[str, FunctionTime] = {}
+    for key, (_, _, self_s, cum_s, _) in stats.items():
+        label = _label(key)
+        prev = times.get(label, FunctionTime(0.0, 0.0))
+        times[label] = FunctionTime(prev.self_s + self_s, max(prev.cum_s, cum_s))
+    return times
+
+
+class Hotspot(NamedTuple):
+    """
+    One function's time in two profiles.
+
+    Attributes:
+      function (str): "<file>:<function>".
+      before (FunctionTime): Time in the baseline profile.
+      after (FunctionTime): Time in the new profile.
+      delta_s (float): Change in self time, in seconds.
+    """
+
+    function: str
+    before: FunctionTime
+    after: FunctionTime
+    delta_s: float
+
+
+def compare_profiles(before: str, after: str, top: int = 20) -> List[Hotspot]:
+    """
+    Returns the functions whose self time changed most between two profiles.
+
+    Args:
+      before (str): Baseline profile directory or .pstats file.
+      after (str): New profile directory or .pstats file.
+      top (int): Number of functions to return.
+
+    Returns:
+      List[Hotspot]: Sorted by absolute change in self time, largest first.
+    """
+    old, new = load_profile(before), load_profile(after)
+    zero = FunctionTime(0.0, 0.0)
+    rows = [
+        Hotspot(
+            label,
+            old.get(label, zero),
+            new.get(label, zero),
+            new.get(label, zero).self_s - old.get(label, zero).self_s,
+        )
+        for label in set(old) | set(new)
+    ]
+    rows.sort(key=lambda row: abs(row.delta_s), reverse=True)
+    return rows[:top]
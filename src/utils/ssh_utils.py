@@ -4,36 +4,161 @@ SSH Utility
 Encapsulates SSH connection logic using `paramiko`.
 
 Contents:
-  - fetch_running_config(): Connects to device and retrieves config.
+  - run_command(): Single SSH connection attempt running one command.
+  - CommandResult: Output and exit status of one command.
+  - run_commands(): Single connection running several commands and/or a config
+    snippet.
+  - fetch_running_config(): Connects to device and retrieves config (with retry).
 
 Dependencies:
   - paramiko
-  - tenacity
-  - src.utils.env_utils
+  - src.services.backends (fetch_running_config() only)
 
 Notes:
   - Assumes username/password are provided via environment variables.
-  - Uses exponential backoff with retry (3 attempts).
   - Errors are re-raised for service-level handling.
+  - Retries live in the shared layer in src.services.backends, which calls
+    run_command() / run_commands() once per attempt; fetch_running_config() goes
+    through that layer too.
+  - paramiko is imported on first use, so importing this module (e.g. for
+    --dry-run or --diagnose) does not load the SSH/crypto stack.
 """
 
-import paramiko
-from tenacity import (
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
+from typing import List, NamedTuple, Optional, Sequence
 
-from src.utils.env_utils import get_env_var
+
+def run_command(
+    hostname: str,
+    command: str = "show running-config",
+    port: int = 22,
+    timeout: float = 10,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+) -> str:
+    """
+    Connects once, runs one command, and returns its output.
+
+    Args:
+      hostname (str): Target device hostname or IP address.
+      command (str): Command to execute.
+      port (int): SSH port.
+      timeout (float): Connect timeout in seconds.
+      username (Optional[str]): Login user.
+      password (Optional[str]): Login password.
+
+    Returns:
+      str: Raw command output.
+
+    Raises:
+      paramiko.SSHException: On connection/authentication failure.
+      OSError: On network errors.
+    """
+    import paramiko
+
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+    try:
+        client.connect(
+            hostname, port=port, username=username, password=password, timeout=timeout
+        )
+        _, stdout, _ = client.exec_command(command)
+        return stdout.read().decode()
+    finally:
+        client.close()
+
+
+class CommandResult(NamedTuple):
+    """
+    Output of one command.
+
+    Attributes:
+      command (str): Command as sent ("<config>" for a config snippet session).
+      exit_status (int): Exit status reported by the device (-1 if none).
+      output (str): stdout followed by stderr, or the session transcript.
+    """
+
+    command: str
+    exit_status: int
+    output: str
+
+
+CONFIG_SESSION = "<config>"
+
+
+def run_commands(
+    hostname: str,
+    commands: Sequence[str],
+    config_lines: Sequence[str] = (),
+    port: int = 22,
+    timeout: float = 10,
+    command_timeout: float = 60,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+) -> List[CommandResult]:
+    """
+    Connects once and runs each command on its own exec channel, then sends the
+    config snippet (if any) through one interactive shell.
+
+    Args:
+      hostname (str): Target device hostname or IP address.
+      commands (Sequence[str]): Exec commands, in order.
+      config_lines (Sequence[str]): Lines typed into an interactive shell,
+        followed by `exit`; include the device's enter/leave config mode lines
+        (e.g. `configure terminal` ... `end`).
+      port (int): SSH port.
+      timeout (float): Connect timeout in seconds.
+      command_timeout (float): Read timeout per command or session, in seconds.
+      username (Optional[str]): Login user.
+      password (Optional[str]): Login password.
+
+    Returns:
+      List[CommandResult]: One entry per command, plus one for the snippet.
+
+    Raises:
+      paramiko.SSHException: On connection/authentication failure.
+      OSError: On network errors or read timeouts.
+    """
+    import paramiko
+
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+    results: List[CommandResult] = []
+    try:
+        client.connect(
+            hostname, port=port, username=username, password=password, timeout=timeout
+        )
+        for command in commands:
+            _, stdout, stderr = client.exec_command(command, timeout=command_timeout)
+            output = stdout.read() + stderr.read()
+            status = stdout.channel.recv_exit_status()
+            results.append(
+                CommandResult(command, status, output.decode(errors="replace"))
+            )
+
+        if config_lines:
+            channel = client.invoke_shell()
+            channel.settimeout(command_timeout)
+            script = "".join(f"{line}\n" for line in config_lines) + "exit\n"
+            channel.sendall(script.encode())
+            chunks = []
+            while True:
+                data = channel.recv(65536)
+                if not data:
+                    break
+                chunks.append(data)
+            status = channel.recv_exit_status() if channel.exit_status_ready() else -1
+            results.append(
+                CommandResult(
+                    CONFIG_SESSION, status, b"".join(chunks).decode(errors="replace")
+                )
+            )
+        return results
+    finally:
+        client.close()
 
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type((paramiko.SSHException, OSError)),
-    reraise=True,
-)
 def fetch_running_config(hostname: str) -> str:
     """
     Connects to a device via SSH and returns the running configuration.
@@ -49,18 +174,18 @@ def fetch_running_config(hostname: str) -> str:
       IOError: On command execution failure or read error.
 
     Notes:
-      - Uses retry with exponential backoff for network resilience.
+      - Runs through the collector's retry layer (FetchEngine) with the `ssh`
+        and `collector` settings from settings.yaml.
       - Environment variables SSH_USERNAME and SSH_PASSWORD must be defined.
     """
-    username = get_env_var("SSH_USERNAME", required=True)
-    password = get_env_var("SSH_PASSWORD", required=True)
-
-    client = paramiko.SSHClient()
-    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    from src.config.config import load_config
+    from src.config.schema import BackendsConfig
+    from src.models.inventory import DeviceRecord
+    from src.services.backends import BackendFetchError, FetchEngine
 
+    config = load_config()
+    engine = FetchEngine(config.model_copy(update={"backends": BackendsConfig()}))
     try:
-        client.connect(hostname, username=username, password=password, timeout=10)
-        _, stdout, _ = client.exec_command("show running-config")
-        return stdout.read().decode()
-    finally:
-        client.close()
+        return engine.fetch(DeviceRecord(hostname)).text
+    except BackendFetchError as exc:
+        raise exc.cause
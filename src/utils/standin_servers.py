@@ -0,0 +1,348 @@
+"""
+Stand-in Device Servers
+
+Local, in-process SSH/NETCONF and HTTP servers that impersonate network devices,
+for backend tests and collection benchmarks without real hardware.
+
+Contents:
+  - StandinSSHServer: SSH server answering exec commands, an interactive shell
+    (config snippets), and the `netconf` subsystem (base:1.0 and base:1.1 framing).
+  - StandinHTTPServer: Threaded HTTP server answering GET requests for a path.
+
+Dependencies:
+  - paramiko
+  - http.server
+
+Notes:
+  - Both listen on 127.0.0.1 with an ephemeral port (`.port`) and run in daemon
+    threads; use them as context managers.
+  - Authentication is password (SSH) or HTTP Basic with the given credentials.
+  - `delay` adds a fixed per-request latency to emulate slow devices.
+  - Not for production use: host keys are generated per instance and nothing
+    is hardened.
+"""
+
+import base64
+import logging
+import socket
+import threading
+import time
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence
+
+import paramiko
+from paramiko.common import (
+    AUTH_FAILED,
+    AUTH_SUCCESSFUL,
+    OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED,
+    OPEN_SUCCEEDED,
+)
+
+from src.utils.netconf_utils import BASE_10, BASE_11, NETCONF_NS, NetconfSession
+
+# Server-side transport errors (e.g. clients disconnecting) are expected noise.
+_transport_log = logging.getLogger(f"{__name__}.transport")
+_transport_log.addHandler(logging.NullHandler())
+_transport_log.propagate = False
+
+_SERVER_HELLO = (
+    f'<hello xmlns="{NETCONF_NS}"><capabilities>'
+    f"<capability>{BASE_10}</capability><capability>{BASE_11}</capability>"
+    "</capabilities><session-id>1</session-id></hello>"
+)
+
+
+class _Interface(paramiko.ServerInterface):
+    def __init__(self, server: "StandinSSHServer") -> None:
+        self.server = server
+
+    def check_auth_password(self, username: str, password: str) -> int:
+        if (username, password) == (self.server.username, self.server.password):
+            return AUTH_SUCCESSFUL
+        return AUTH_FAILED
+
+    def get_allowed_auths(self, username: str) -> str:
+        return "password"
+
+    def check_channel_request(self, kind: str, chanid: int) -> int:
+        if kind == "session":
+            return OPEN_SUCCEEDED
+        return OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel: Any, command: bytes) -> bool:
+        threading.Thread(
+            target=self.server._serve_exec,
+            args=(channel, command.decode()),
+            daemon=True,
+        ).start()
+        return True
+
+    def check_channel_pty_request(self, channel: Any, *args: Any) -> bool:
+        return True
+
+    def check_channel_shell_request(self, channel: Any) -> bool:
+        threading.Thread(
+            target=self.server._serve_shell, args=(channel,), daemon=True
+        ).start()
+        return True
+
+    def check_channel_subsystem_request(self, channel: Any, name: str) -> bool:
+        if name != "netconf" or self.server.netconf_data is None:
+            return False
+        threading.Thread(
+            target=self.server._serve_netconf, args=(channel,), daemon=True
+        ).start()
+        return True
+
+
+class StandinSSHServer:
+    """
+    In-process SSH server impersonating a device.
+
+    Args:
+      commands (Dict[str, str]): Exec command -> output (unknown commands exit 1).
+      netconf_data (Optional[str]): XML content of <data> for <get-config>
+        (None disables the netconf subsystem).
+      username (str): Accepted user.
+      password (str): Accepted password.
+      delay (float): Seconds to wait before answering each request.
+      rejected (Sequence[str]): Config-mode lines answered with
+        `% Invalid input detected at '^' marker.`
+
+    Attributes:
+      port (int): Listening port.
+      connections (int): Connections accepted so far.
+      shell_lines (List[str]): Lines received by interactive shells, in order.
+
+    Example:
+      with StandinSSHServer({"show running-config": "hostname r1"}) as server:
+          run_command("127.0.0.1", port=server.port, username="admin", password="admin")
+    """
+
+    def __init__(
+        self,
+        commands: Dict[str, str],
+        netconf_data: Optional[str] = None,
+        username: str = "admin",
+        password: str = "admin",
+        delay: float = 0.0,
+        rejected: Sequence[str] = (),
+    ) -> None:
+        self.commands = commands
+        self.rejected = set(rejected)
+        self.netconf_data = netconf_data
+        self.username = username
+        self.password = password
+        self.delay = delay
+        self.host_key = paramiko.ECDSAKey.generate()
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(512)
+        self.port: int = self._sock.getsockname()[1]
+        self.connections = 0
+        self.shell_lines: List[str] = []
+
+    def __enter__(self) -> "StandinSSHServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """
+        Starts accepting connections in a background thread.
+        """
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def stop(self) -> None:
+        """
+        Stops accepting connections.
+        """
+        self._sock.close()
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: socket.socket) -> None:
+        transport = paramiko.Transport(conn)
+        transport.set_log_channel(_transport_log.name)
+        transport.add_server_key(self.host_key)
+        try:
+            transport.start_server(server=_Interface(self))
+            transport.join()
+        except (paramiko.SSHException, EOFError, OSError):
+            pass
+        finally:
+            transport.close()
+
+    def _serve_exec(self, channel: Any, command: str) -> None:
+        time.sleep(self.delay)
+        output = self.commands.get(command)
+        if output is None:
+            channel.sendall_stderr(f"% Invalid command: {command}\n".encode())
+            channel.send_exit_status(1)
+        else:
+            channel.sendall(output.encode())
+            channel.send_exit_status(0)
+        # EOF rather than close: this runs concurrently with paramiko's reply to
+        # the exec request, and a close that overtakes it fails the client's
+        # exec_command(). The client closes the channel after reading.
+        channel.shutdown_write()
+
+    def _serve_shell(self, channel: Any) -> None:
+        # IOS-like prompts: `configure terminal` enters config mode, `end` or
+        # `exit` leaves it, and `exit` at the exec prompt ends the session.
+        prompt = {False: "standin# ", True: "standin(config)# "}
+        config_mode = False
+        buffer = b""
+        try:
+            channel.sendall(prompt[config_mode].encode())
+            while True:
+                data = channel.recv(4096)
+                if not data:
+                    return
+                buffer += data
+                while b"\n" in buffer:
+                    raw, buffer = buffer.split(b"\n", 1)
+                    line = raw.decode().strip()
+                    self.shell_lines.append(line)
+                    if line == "exit" and not config_mode:
+                        channel.sendall(b"exit\r\n")
+                        channel.send_exit_status(0)
+                        channel.shutdown_write()
+                        return
+                    if line in ("configure terminal", "conf t"):
+                        config_mode = True
+                    elif line in ("end", "exit"):
+                        config_mode = False
+                    reply = f"{line}\r\n"
+                    if config_mode and line in self.rejected:
+                        reply += "% Invalid input detected at '^' marker.\r\n"
+                    channel.sendall(f"{reply}{prompt[config_mode]}".encode())
+        except (EOFError, OSError):
+            return
+
+    def _serve_netconf(self, channel: Any) -> None:
+        session = NetconfSession(channel)
+        try:
+            session.send(_SERVER_HELLO)
+            client_hello = ET.fromstring(session.read())
+            session.chunked = any(
+                (cap.text or "").strip() == BASE_11
+                for cap in client_hello.iter(f"{{{NETCONF_NS}}}capability")
+            )
+            while True:
+                rpc = ET.fromstring(session.read())
+                time.sleep(self.delay)
+                message_id = rpc.get("message-id", "0")
+                operation = rpc[0].tag.split("}")[-1] if len(rpc) else ""
+                if operation == "get-config":
+                    body = f"<data>{self.netconf_data}</data>"
+                elif operation == "close-session":
+                    body = "<ok/>"
+                else:
+                    body = (
+                        "<rpc-error><error-type>protocol</error-type>"
+                        "<error-tag>operation-not-supported</error-tag>"
+                        "<error-severity>error</error-severity>"
+                        f"<error-message>{operation} not supported</error-message>"
+                        "</rpc-error>"
+                    )
+                session.send(
+                    f'<rpc-reply xmlns="{NETCONF_NS}" message-id="{message_id}">'
+                    f"{body}</rpc-reply>"
+                )
+                if operation == "close-session":
+                    return
+        except Exception:
+            return
+        finally:
+            try:
+                channel.close()
+            except (EOFError, OSError):
+                pass
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+
+class StandinHTTPServer:
+    """
+    In-process HTTP server impersonating a device REST API.
+
+    Args:
+      resources (Dict[str, str]): Path -> response body (JSON text).
+      username (str): Accepted Basic auth user.
+      password (str): Accepted Basic auth password.
+      delay (float): Seconds to wait before answering each request.
+      content_type (str): Content-Type of responses.
+    """
+
+    def __init__(
+        self,
+        resources: Dict[str, str],
+        username: str = "admin",
+        password: str = "admin",
+        delay: float = 0.0,
+        content_type: str = "application/yang-data+json",
+    ) -> None:
+        expected = base64.b64encode(f"{username}:{password}".encode()).decode()
+        standin = self
+        self.requests = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 (http.server API)
+                standin.requests += 1
+                time.sleep(delay)
+                if self.headers.get("Authorization") != f"Basic {expected}":
+                    self.send_response(401)
+                    self.send_header("WWW-Authenticate", 'Basic realm="standin"')
+                    self.end_headers()
+                    return
+                body = resources.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = _HTTPServer(("127.0.0.1", 0), Handler)
+        self.port: int = self._server.server_address[1]
+
+    def __enter__(self) -> "StandinHTTPServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """
+        Starts serving in a background thread.
+        """
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        """
+        Stops serving and closes the listening socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
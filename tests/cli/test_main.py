@@ -4,11 +4,18 @@ Tests for CLI argument parsing and main function dispatch.
 Covers:
   - Validates correct parsing of --devices-file
   - Verifies main() dispatches to service layer
+  - --compact and catalog queries run without --devices-file
+  - --profile runs the collection under the profiler
+  - --run-job dispatches to the command job service
+  - --replay runs the collection from a capture without --devices-file
+  - --replay is rejected with --record and the modes that do not replay
 """
 
 from argparse import Namespace
 from unittest.mock import patch
 
+import pytest
+
 from src.cli.main import main, parse_args
 
 
@@ -22,7 +29,7 @@ def test_parse_args_with_devices_file(monkeypatch) -> None:
     assert args.devices_file == "devices.yaml"
 
 
-@patch("src.cli.main.collect_device_configs")
+@patch("src.services.ssh_collector.collect_device_configs")
 def test_main_calls_collect_device_configs(mock_collect, monkeypatch) -> None:
     """
     Tests that main() dispatches to collect_device_configs when --diagnose is not used.
@@ -30,11 +37,15 @@ def test_main_calls_collect_device_configs(mock_collect, monkeypatch) -> None:
     monkeypatch.setattr("sys.argv", ["prog", "--devices-file", "devices.yaml"])
     main()
     mock_collect.assert_called_once_with(
-        devices_file_path="devices.yaml", dry_run=False
+        devices_file_path="devices.yaml",
+        dry_run=False,
+        record=None,
+        replay=None,
+        replay_speed=None,
     )
 
 
-@patch("src.cli.main.run_diagnostics")
+@patch("src.services.ssh_collector.run_diagnostics")
 def test_main_calls_diagnostics_when_flag_set(mock_diag, monkeypatch) -> None:
     """
     Tests that main() calls run_diagnostics() when --diagnose is used.
@@ -44,3 +55,114 @@ def test_main_calls_diagnostics_when_flag_set(mock_diag, monkeypatch) -> None:
     )
     main()
     mock_diag.assert_called_once_with(devices_file="devices.yaml")
+
+
+@patch("src.services.retention.run_compaction")
+def test_main_calls_compaction_without_devices_file(mock_compact, monkeypatch) -> None:
+    """
+    Tests that --compact dispatches to run_compaction() and needs no device file.
+    """
+    monkeypatch.setattr("sys.argv", ["prog", "--compact", "--max-months", "2"])
+    main()
+    mock_compact.assert_called_once_with(max_months=2, dry_run=False)
+
+
+def test_parse_args_requires_devices_file_for_collection(monkeypatch) -> None:
+    """
+    Tests that collection modes still require --devices-file.
+    """
+    monkeypatch.setattr("sys.argv", ["prog"])
+    with pytest.raises(SystemExit):
+        parse_args()
+
+
+@pytest.mark.parametrize(
+    "mode", [["--preflight"], ["--run-job", "job.yaml"], ["--record", "c2.gz"]]
+)
+def test_parse_args_rejects_replay_with_other_modes(mode, monkeypatch) -> None:
+    """
+    Tests that --replay is rejected with options and modes that would ignore it.
+    """
+    argv = ["prog", "--devices-file", "d.yaml", "--replay", "c.jsonl.gz", *mode]
+    monkeypatch.setattr("sys.argv", argv)
+    with pytest.raises(SystemExit):
+        parse_args()
+
+
+@patch("src.services.catalog.run_catalog")
+def test_main_calls_catalog_history(mock_catalog, monkeypatch) -> None:
+    """
+    Tests that --history dispatches to run_catalog() without a device file.
+    """
+    monkeypatch.setattr("sys.argv", ["prog", "--history", "r1", "--limit", "5"])
+    main()
+    mock_catalog.assert_called_once_with(
+        sync=False, snapshot=None, history="r1", limit=5
+    )
+
+
+@patch("src.services.preflight.run_preflight")
+def test_main_calls_preflight(mock_preflight, monkeypatch) -> None:
+    """
+    Tests that --preflight dispatches to run_preflight() with the auth flag.
+    """
+    monkeypatch.setattr(
+        "sys.argv",
+        ["prog", "--devices-file", "devices.yaml", "--preflight", "--auth-probe"],
+    )
+    main()
+    mock_preflight.assert_called_once_with(devices_file="devices.yaml", auth=True)
+
+
+@patch("src.services.profiling.run_profiled")
+def test_main_profile_dispatch(mock_profiled, monkeypatch) -> None:
+    """
+    Tests that --profile defaults to sampling and accepts trace mode.
+    """
+    monkeypatch.setattr("sys.argv", ["prog", "--devices-file", "d.yaml", "--profile"])
+    main()
+    no_replay = dict(record=None, replay=None, replay_speed=None)
+    mock_profiled.assert_called_with(
+        devices_file="d.yaml", dry_run=False, mode="sample", **no_replay
+    )
+
+    monkeypatch.setattr(
+        "sys.argv", ["prog", "--devices-file", "d.yaml", "--profile", "trace"]
+    )
+    main()
+    mock_profiled.assert_called_with(
+        devices_file="d.yaml", dry_run=False, mode="trace", **no_replay
+    )
+
+
+@patch("src.services.command_jobs.run_job")
+def test_main_run_job_dispatch(mock_run_job, monkeypatch) -> None:
+    """
+    Tests that --run-job passes the job file, inventory, and canary override.
+    """
+    monkeypatch.setattr(
+        "sys.argv",
+        ["prog", "--devices-file", "d.yaml", "--run-job", "job.yaml", "--canary", "3"],
+    )
+    main()
+    mock_run_job.assert_called_once_with(
+        job_file="job.yaml", devices_file="d.yaml", canary=3, dry_run=False
+    )
+
+
+@patch("src.services.ssh_collector.collect_device_configs")
+def test_main_replay_without_devices_file(mock_collect, monkeypatch) -> None:
+    """
+    Tests that --replay needs no --devices-file and passes the replay speed.
+    """
+    monkeypatch.setattr(
+        "sys.argv", ["prog", "--replay", "run.capture.gz", "--replay-speed", "2"]
+    )
+    main()
+    mock_collect.assert_called_once_with(
+        devices_file_path=None,
+        dry_run=False,
+        record=None,
+        replay="run.capture.gz",
+        replay_speed=2.0,
+    )
@@ -0,0 +1,99 @@
+"""
+Tests for CLI cold-start cost.
+
+Covers:
+  - --help imports no service, config, or SSH dependencies
+  - --dry-run never loads the SSH/crypto stack or python-dotenv
+  - Cold-start wall time for both paths stays within a fixed budget
+
+Notes:
+  - Each measurement runs in a fresh interpreter so module caching cannot hide
+    regressions. The best of several runs is compared against the budget.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Measured on a developer laptop: --help ~0.01s, --dry-run ~0.2s.
+# Budgets leave headroom for slow CI runners while still catching an eager import
+# of paramiko/cryptography (~0.3s on its own).
+HELP_BUDGET_SECONDS = 0.25
+DRY_RUN_BUDGET_SECONDS = 1.0
+
+HEAVY_MODULES = ("paramiko", "tenacity", "dotenv", "cryptography", "pydantic", "yaml")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+sys.argv = ["prog"] + sys.argv[1:]
+try:
+    from src.cli.main import main
+    main()
+except SystemExit:
+    pass
+elapsed = time.perf_counter() - start
+heavy = [m for m in HEAVY if m in sys.modules]
+sys.stderr.write(json.dumps({"elapsed": elapsed, "heavy": heavy}) + "\\n")
+"""
+
+
+def _measure(cwd: Path, *cli_args: str, runs: int = 3) -> dict:
+    """
+    Runs the CLI in fresh interpreters and returns the fastest measurement.
+    """
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+    code = f"HEAVY = {HEAVY_MODULES!r}\n{_PROBE}"
+    results = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-P", "-c", code, *cli_args],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        results.append(json.loads(proc.stderr.strip().splitlines()[-1]))
+    return min(results, key=lambda r: r["elapsed"])
+
+
+@pytest.fixture
+def run_dir(tmp_path) -> Path:
+    """
+    Working directory with the default settings.yaml and a small device list.
+    """
+    (tmp_path / "src" / "config").mkdir(parents=True)
+    shutil.copy(
+        REPO_ROOT / "src" / "config" / "settings.yaml",
+        tmp_path / "src" / "config" / "settings.yaml",
+    )
+    shutil.copy(
+        REPO_ROOT / "src" / "config" / "devices.yaml", tmp_path / "devices.yaml"
+    )
+    return tmp_path
+
+
+def test_help_imports_no_heavy_modules(run_dir) -> None:
+    """
+    Ensures --help is served by argparse alone and stays within budget.
+    """
+    result = _measure(run_dir, "--help")
+    assert result["heavy"] == []
+    assert result["elapsed"] < HELP_BUDGET_SECONDS
+
+
+def test_dry_run_skips_ssh_stack(run_dir) -> None:
+    """
+    Ensures --dry-run does not import paramiko, tenacity, or python-dotenv.
+    """
+    result = _measure(run_dir, "--devices-file", "devices.yaml", "--dry-run")
+    assert not {"paramiko", "tenacity", "dotenv", "cryptography"} & set(result["heavy"])
+    assert result["elapsed"] < DRY_RUN_BUDGET_SECONDS
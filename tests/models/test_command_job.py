@@ -0,0 +1,58 @@
+"""
+Tests for the command job model.
+
+Covers:
+  - Loading a job file and per-type command set fallback
+  - Job name validation
+  - Error pattern defaults and validation
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from src.models.command_job import CommandJob, load_job
+
+
+def test_load_job_and_command_sets(tmp_path) -> None:
+    """
+    Verifies by_type entries win, unlisted types use the default, and the
+    shipped example parses.
+    """
+    path = tmp_path / "job.yaml"
+    path.write_text(
+        "name: audit\n"
+        "canary: 3\n"
+        "default: {commands: [show clock]}\n"
+        "by_type: {core: {commands: [show ver], config: [ntp server 1.1.1.1]}}\n"
+    )
+    job = load_job(str(path))
+
+    assert job.canary == 3
+    assert job.command_set("core").config == ["ntp server 1.1.1.1"]
+    assert job.command_set("edge").commands == ["show clock"]
+    assert job.command_set(None).commands == ["show clock"]
+    assert CommandJob(name="x").command_set("edge") is None
+    assert load_job("src/config/jobs/ntp_audit.yaml").name == "ntp-audit"
+
+
+def test_job_name_must_be_path_safe() -> None:
+    """
+    Verifies names that would escape the output directory are rejected.
+    """
+    with pytest.raises(ValidationError):
+        CommandJob(name="../etc")
+
+
+def test_error_patterns() -> None:
+    """
+    Verifies the default patterns catch IOS rejections only, and invalid
+    patterns are rejected.
+    """
+    errors = CommandJob(name="x").error_regex()
+    assert errors is not None
+    assert errors.search("r1(config)#ntp srv\r\n% Invalid input detected at")
+    assert errors.search("  % Incomplete command.")
+    assert not errors.search("%LINK-3-UPDOWN: Interface Gi0/1, changed state")
+    assert CommandJob(name="x", error_patterns=[]).error_regex() is None
+    with pytest.raises(ValidationError):
+        CommandJob(name="x", error_patterns=["(unclosed"])
@@ -0,0 +1,95 @@
+"""
+Tests for the compact Inventory model and loader.
+
+Covers:
+  - Bulk validation accepts Device-compatible entries and rejects bad ones
+  - Iteration yields DeviceRecord views with interned location/type
+  - Device (Pydantic) view for API compatibility
+  - load_inventory() reads the shipped devices.yaml
+  - Opt-in parsed-inventory snapshots, reused until the YAML content changes
+"""
+
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from src.models.device_model import Device
+from src.models.inventory import DeviceRecord, Inventory
+from src.utils.device_loader import load_device_list, load_inventory
+
+
+def test_from_entries_builds_records() -> None:
+    """
+    Verifies entries round-trip through the columnar store.
+    """
+    inventory = Inventory.from_entries(
+        [
+            {"hostname": "r1", "ip": "10.0.0.1", "location": "DFW", "type": "core"},
+            {"hostname": "r2", "location": "DFW"},
+            {"hostname": "r3", "extra": "ignored"},
+        ]
+    )
+
+    assert len(inventory) == 3
+    assert list(inventory) == [
+        DeviceRecord("r1", "10.0.0.1", "DFW", "core"),
+        DeviceRecord("r2", None, "DFW", None),
+        DeviceRecord("r3", None, None, None),
+    ]
+    assert inventory.locations == ["DFW"]
+    assert inventory.types == ["core"]
+
+
+def test_from_entries_rejects_invalid_entries() -> None:
+    """
+    Ensures bulk validation enforces the same rules as Device.
+    """
+    with pytest.raises(ValidationError):
+        Inventory.from_entries([{"hostname": "r1"}, {"ip": "10.0.0.2"}])
+    with pytest.raises(ValidationError):
+        Inventory.from_entries([{"hostname": "r1", "ip": 42}])
+
+
+def test_device_view_matches_pydantic_model() -> None:
+    """
+    Verifies the Device view equals a directly constructed Device.
+    """
+    inventory = Inventory.from_entries([{"hostname": "r1", "type": "edge"}])
+
+    assert inventory.device(0) == Device(hostname="r1", type="edge")
+    assert inventory.devices() == [Device(hostname="r1", type="edge")]
+
+
+def test_load_inventory_matches_load_device_list() -> None:
+    """
+    Verifies both loaders agree on the shipped devices.yaml.
+    """
+    path = "src/config/devices.yaml"
+    assert load_inventory(path).devices() == load_device_list(path)
+
+
+def test_load_inventory_snapshot_tracks_file_changes(tmp_path, monkeypatch) -> None:
+    """
+    Verifies the parsed-inventory snapshot is opt-in, reused, and refreshed on
+    edits that keep the file's size and mtime.
+    """
+    monkeypatch.chdir(tmp_path)
+    devices = tmp_path / "devices.yaml"
+    cache_dir = str(tmp_path / "cache")
+    devices.write_text("devices:\n  - hostname: r1\n")
+
+    load_inventory(str(devices))
+    assert not list(tmp_path.rglob("*.marshal"))  # no cache unless asked
+
+    first = load_inventory(str(devices), cache_dir=cache_dir)
+    assert list((tmp_path / "cache").glob("inventory-*.marshal"))
+    assert list(load_inventory(str(devices), cache_dir=cache_dir)) == list(first)
+
+    stat = devices.stat()
+    devices.write_text("devices:\n  - hostname: r2\n")
+    os.utime(devices, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert devices.stat().st_size == stat.st_size
+
+    reloaded = load_inventory(str(devices), cache_dir=cache_dir)
+    assert [d.hostname for d in reloaded] == ["r2"]
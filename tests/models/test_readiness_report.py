@@ -0,0 +1,44 @@
+"""
+Tests for the ReadinessReport model.
+
+Covers:
+  - Counts by failing stage and not-ready ordering
+  - gzip JSON round trip
+"""
+
+from src.models.readiness_report import DeviceReadiness, ProbeStage, ReadinessReport
+
+
+def _report() -> ReadinessReport:
+    report = ReadinessReport("preflight_1", "2026-03-01T00:00:00+00:00", ["dns", "tcp"])
+    report.add(DeviceReadiness("r3", address="10.0.0.3", banner="SSH-2.0-X"))
+    report.add(DeviceReadiness("r2", failed_stage=ProbeStage.TCP, error="timeout"))
+    report.add(DeviceReadiness("r1", failed_stage=ProbeStage.DNS, error="NXDOMAIN"))
+    return report
+
+
+def test_counts_and_not_ready() -> None:
+    """
+    Verifies per-stage counts and that failures sort by stage order.
+    """
+    report = _report()
+
+    assert report.counts() == {"ready": 1, "tcp": 1, "dns": 1}
+    assert [r.hostname for r in report.not_ready()] == ["r1", "r2"]
+    table = report.format_table().splitlines()
+    assert table[0].startswith("HOSTNAME")
+    assert "dns failed" in table[1] and "NXDOMAIN" in table[1]
+
+
+def test_save_and_load_round_trip(tmp_path) -> None:
+    """
+    Verifies a saved report loads back unchanged.
+    """
+    report = _report()
+    report.finish("2026-03-01T00:01:00+00:00")
+
+    loaded = ReadinessReport.load(str(report.save(str(tmp_path))))
+
+    assert loaded.rows == report.rows
+    assert loaded.stages == ["dns", "tcp"]
+    assert loaded.finished_at == report.finished_at
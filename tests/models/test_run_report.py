@@ -0,0 +1,76 @@
+"""
+Tests for the RunReport model.
+
+Covers:
+  - Status counts and group-by aggregation
+  - Round-trip through save() / load()
+  - Rejecting aggregation by non-categorical columns
+  - Unique run ids for runs started in the same second
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.models.run_report import DeviceStatus, new_run_id, RunReport
+
+
+def _sample_report() -> RunReport:
+    report = RunReport("run_test", "2025-05-18T00:00:00+00:00")
+    report.add("r1", DeviceStatus.SUCCESS, location="DFW", type="core", bytes=10)
+    report.add("r2", DeviceStatus.FAILED, location="DFW", error_class="OSError")
+    report.add("r3", DeviceStatus.SUCCESS, location="NYC", type="core", attempts=2)
+    return report
+
+
+def test_counts_and_summarize() -> None:
+    """
+    Verifies status totals and per-location aggregation.
+    """
+    report = _sample_report()
+
+    assert report.counts() == {"success": 2, "failed": 1}
+    assert report.summarize(by="location") == {
+        "DFW": {"success": 1, "failed": 1},
+        "NYC": {"success": 1},
+    }
+    assert report.failed_hosts() == ["r2"]
+
+
+def test_save_and_load_round_trip(tmp_path) -> None:
+    """
+    Verifies that a saved report loads back with identical rows.
+    """
+    report = _sample_report()
+    report.finish("2025-05-18T00:05:00+00:00")
+
+    path = report.save(str(tmp_path))
+    loaded = RunReport.load(str(path))
+
+    assert path.name == "run_test.json.gz"
+    assert loaded.finished_at == "2025-05-18T00:05:00+00:00"
+    assert list(loaded.rows()) == list(report.rows())
+    assert loaded.column("attempts") == [0, 0, 2]
+
+
+def test_summarize_rejects_plain_columns() -> None:
+    """
+    Ensures aggregation is limited to dictionary-encoded columns.
+    """
+    with pytest.raises(ValueError):
+        _sample_report().summarize(by="hostname")
+
+
+def test_new_run_id_is_unique_within_a_second(tmp_path) -> None:
+    """
+    Verifies that runs started in the same second get distinct ids, reports,
+    and no leftover temporary files.
+    """
+    started = datetime(2025, 5, 18, tzinfo=timezone.utc)
+    ids = {new_run_id("run", started) for _ in range(100)}
+    assert len(ids) == 100
+    assert all(run_id.startswith("run_20250518T000000Z_") for run_id in ids)
+
+    for run_id in sorted(ids)[:2]:
+        RunReport(run_id, started.isoformat()).save(str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 2
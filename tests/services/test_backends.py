@@ -0,0 +1,147 @@
+"""
+Tests for the retrieval backends service.
+
+Covers:
+  - Backend selection by device type, and the endpoint it connects to
+  - SSH, NETCONF, and HTTP retrieval against local stand-in servers
+  - Shared retry policy: transient errors retried, auth errors not
+  - Missing credentials fail the fetch rather than raising
+  - Rate limiter spacing across threads
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.config.schema import (
+    AppConfig,
+    BackendsConfig,
+    CollectorConfig,
+    HTTPConfig,
+    NetconfConfig,
+    SSHConfig,
+)
+from src.models.inventory import DeviceRecord
+from src.services.backends import BackendFetchError, FetchEngine, RateLimiter
+from src.utils.standin_servers import StandinHTTPServer, StandinSSHServer
+
+RUNNING = "hostname r1\ninterface Gi0/1\n shutdown\n"
+NETCONF_DATA = '<native xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-native"/>'
+RESTCONF = '{"Cisco-IOS-XE-native:native": {"hostname": "r1"}}'
+
+
+@pytest.fixture(scope="module")
+def ssh_server():
+    with StandinSSHServer({"show running-config": RUNNING}, NETCONF_DATA) as server:
+        yield server
+
+
+@pytest.fixture(scope="module")
+def http_server():
+    with StandinHTTPServer({"/restconf/data": RESTCONF}) as server:
+        yield server
+
+
+@pytest.fixture
+def engine(monkeypatch, ssh_server, http_server) -> FetchEngine:
+    monkeypatch.setenv("SSH_USERNAME", "admin")
+    monkeypatch.setenv("SSH_PASSWORD", "admin")
+    return FetchEngine(
+        AppConfig(
+            ssh=SSHConfig(port=ssh_server.port),
+            collector=CollectorConfig(retries=2, retry_wait_min=0, retry_wait_max=0),
+            backends=BackendsConfig(
+                by_type={"iosxe": "netconf", "api": "http"},
+                netconf=NetconfConfig(port=ssh_server.port),
+                http=HTTPConfig(scheme="http", port=http_server.port),
+            ),
+        )
+    )
+
+
+def test_each_backend_fetches_from_standin(engine) -> None:
+    """
+    Verifies devices are routed by type and each protocol returns the config.
+    """
+    ssh = engine.fetch(DeviceRecord("r1", ip="127.0.0.1"))
+    netconf = engine.fetch(DeviceRecord("r2", ip="127.0.0.1", type="iosxe"))
+    http = engine.fetch(DeviceRecord("r3", ip="127.0.0.1", type="api"))
+
+    assert (ssh.text, ssh.backend, ssh.attempts) == (RUNNING, "ssh", 1)
+    assert (netconf.text, netconf.backend) == (NETCONF_DATA, "netconf")
+    assert (http.text, http.backend) == (RESTCONF, "http")
+
+
+def test_endpoint_follows_backend(engine, ssh_server, http_server) -> None:
+    """
+    Verifies the target is the IP when set, on the port of the device's backend.
+    """
+    assert engine.endpoint(DeviceRecord("r1")) == ("r1", ssh_server.port)
+    assert engine.endpoint(DeviceRecord("r2", ip="10.0.0.2", type="api")) == (
+        "10.0.0.2",
+        http_server.port,
+    )
+    engine.config.backends.http.port = None
+    assert engine.endpoint(DeviceRecord("r3", type="api"))[1] == 80
+
+
+def test_missing_credentials_fail_the_fetch(engine, monkeypatch) -> None:
+    """
+    Verifies unset credentials surface as BackendFetchError with no attempts.
+    """
+    monkeypatch.delenv("SSH_USERNAME")
+
+    with pytest.raises(BackendFetchError) as info:
+        engine.fetch(DeviceRecord("r1", ip="127.0.0.1"))
+
+    assert info.value.attempts == 0
+    assert isinstance(info.value.cause, OSError)
+
+
+def test_transient_errors_are_retried(engine) -> None:
+    """
+    Verifies connection errors use every attempt of the shared policy.
+    """
+    engine.config.backends.http.port = 1  # nothing listens there
+
+    with pytest.raises(BackendFetchError) as info:
+        engine.fetch(DeviceRecord("r3", ip="127.0.0.1", type="api"))
+
+    assert info.value.attempts == 2
+    assert info.value.backend == "http"
+    assert isinstance(info.value.cause, OSError)
+
+
+def test_auth_errors_fail_fast(engine, monkeypatch) -> None:
+    """
+    Verifies authentication failures are not retried.
+    """
+    import paramiko
+
+    monkeypatch.setenv("SSH_PASSWORD", "wrong")
+    engine._credentials = None
+
+    with pytest.raises(BackendFetchError) as info:
+        engine.fetch(DeviceRecord("r1", ip="127.0.0.1"))
+
+    assert info.value.attempts == 1
+    assert isinstance(info.value.cause, paramiko.AuthenticationException)
+
+
+def test_rate_limiter_spaces_attempts() -> None:
+    """
+    Verifies concurrent acquisitions are spaced 1/rate seconds apart.
+    """
+    limiter = RateLimiter(rate=50)
+    stamps = []
+
+    def acquire(_: int) -> None:
+        limiter.acquire()
+        stamps.append(time.monotonic())
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(acquire, range(11)))
+
+    stamps.sort()
+    assert stamps[-1] - stamps[0] >= 10 * 0.02 * 0.9
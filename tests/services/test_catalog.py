@@ -0,0 +1,106 @@
+"""
+Tests for the config catalog service.
+
+Covers:
+  - Recording entries and snapshot/history queries
+  - Syncing with the output directory (add, move into archives, remove)
+  - Recording a run report
+"""
+
+import hashlib
+from datetime import date
+
+from src.config.schema import StorageConfig
+from src.models.run_report import DeviceStatus, RunReport
+from src.services.catalog import CatalogEntry, ConfigCatalog, record_run
+from src.services.retention import compact_output_dir
+from src.utils.file_utils import write_config_to_file
+
+
+def _entry(hostname: str, stamp: str) -> CatalogEntry:
+    return CatalogEntry(
+        hostname, stamp, None, f"hash-{stamp}", 10, f"{hostname}_{stamp}"
+    )
+
+
+def test_snapshot_and_history(tmp_path) -> None:
+    """
+    Verifies snapshots pick each device's newest config on or before the date and
+    histories are newest first.
+    """
+    with ConfigCatalog(str(tmp_path / "catalog.sqlite3")) as catalog:
+        catalog.record(
+            [
+                _entry("r1", "20260215"),
+                _entry("r1", "20260301"),
+                _entry("r1", "20260302"),
+                _entry("r2", "20260220"),
+                _entry("r3", "20260310"),
+            ]
+        )
+
+        snapshot = catalog.snapshot("2026-03-01")
+        assert [(e.hostname, e.date_stamp) for e in snapshot] == [
+            ("r1", "20260301"),
+            ("r2", "20260220"),
+        ]
+        assert [e.hostname for e in catalog.snapshot("20260310", ["r3"])] == ["r3"]
+
+        history = catalog.history("r1", limit=2)
+        assert [e.date_stamp for e in history] == ["20260302", "20260301"]
+        assert catalog.hostnames() == ["r1", "r2", "r3"]
+
+
+def test_sync_tracks_output_dir(tmp_path) -> None:
+    """
+    Verifies sync() catalogs new configs, follows them into monthly archives
+    without re-hashing, and drops configs removed from disk.
+    """
+    output_dir = tmp_path / "configs"
+    for stamp in ("20250110", "20250111", "20250601"):
+        write_config_to_file("r1", f"cfg {stamp}", stamp, str(output_dir))
+
+    with ConfigCatalog(str(tmp_path / "catalog.sqlite3")) as catalog:
+        assert catalog.sync(str(output_dir)) == (3, 0, 0, 0)
+        entry = catalog.history("r1", limit=None)[-2]
+        assert entry.config_hash == hashlib.sha256(b"cfg 20250111").hexdigest()
+        assert entry.size == len("cfg 20250111")
+
+        compact_output_dir(str(output_dir), StorageConfig(), today=date(2025, 6, 2))
+        # January is archived; retention keeps only its newest config.
+        assert catalog.sync(str(output_dir)) == (0, 1, 1, 0)
+        archived = catalog.history("r1", limit=None)[-1]
+        assert "#" in archived.location
+        assert archived.config_hash == entry.config_hash
+
+        (output_dir / "r1_20250601.cfg").unlink()
+        assert catalog.sync(str(output_dir)) == (0, 0, 1, 0)
+        assert catalog.sync(str(output_dir), verify=True) == (0, 0, 0, 1)
+        assert len(catalog) == 1
+
+
+def test_record_run_catalogs_successes(tmp_path) -> None:
+    """
+    Verifies only successful, written configs from a run report are recorded.
+    """
+    report = RunReport("run_1", "2026-03-01T00:00:00+00:00")
+    report.add(
+        "r1",
+        DeviceStatus.SUCCESS,
+        bytes=5,
+        config_hash="abc",
+        output_path="configs/r1_20260301.cfg",
+    )
+    report.add("r2", DeviceStatus.FAILED, error_class="TimeoutError")
+
+    with ConfigCatalog(str(tmp_path / "catalog.sqlite3")) as catalog:
+        assert record_run(catalog, report, "20260301") == 1
+        (entry,) = catalog.snapshot("2026-03-01")
+        assert entry == CatalogEntry(
+            "r1",
+            "20260301",
+            "2026-03-01T00:00:00+00:00",
+            "abc",
+            5,
+            "configs/r1_20260301.cfg",
+        )
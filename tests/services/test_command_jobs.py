@@ -0,0 +1,169 @@
+"""
+Tests for the command jobs service.
+
+Covers:
+  - Per-type command sets run over SSH, with outputs stored and reported
+  - Config snippets sent through an interactive session
+  - Non-zero exit status reported as CommandError
+  - Rejected lines (error patterns) failing the device and the canary
+  - A failed canary stage skips the rest of the fleet
+"""
+
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from src.config.schema import (
+    AppConfig,
+    CollectorConfig,
+    JobsConfig,
+    SSHConfig,
+    StorageConfig,
+)
+from src.models.inventory import Inventory
+from src.services.command_jobs import run_job
+from src.utils.standin_servers import StandinSSHServer
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("SSH_USERNAME", "admin")
+    monkeypatch.setenv("SSH_PASSWORD", "admin")
+    with StandinSSHServer({"show clock": "12:00:00 UTC", "show ver": "v1"}) as server:
+        yield server
+
+
+def _setup(tmp_path, server, job: dict, devices: list):
+    job_file = tmp_path / "job.yaml"
+    job_file.write_text(yaml.safe_dump(job))
+    config = AppConfig(
+        report_dir=str(tmp_path / "reports"),
+        ssh=SSHConfig(port=server.port),
+        collector=CollectorConfig(workers=4, retries=1),
+        storage=StorageConfig(layout="flat"),
+        jobs=JobsConfig(output_dir=str(tmp_path / "jobs")),
+    )
+    inventory = Inventory.from_entries(
+        [{"hostname": h, "ip": "127.0.0.1", "type": t} for h, t in devices]
+    )
+    return (
+        str(job_file),
+        patch("src.services.command_jobs.load_config", return_value=config),
+        patch("src.services.command_jobs.load_inventory", return_value=inventory),
+    )
+
+
+def test_job_runs_command_sets_per_type(tmp_path, server) -> None:
+    """
+    Verifies each type gets its commands, outputs are stored, and failures recorded.
+    """
+    job = {
+        "name": "audit",
+        "default": {"commands": ["show clock"]},
+        "by_type": {
+            "core": {
+                "commands": ["show ver"],
+                "config": ["configure terminal", "ntp server 10.0.0.1", "end"],
+            },
+            "broken": {"commands": ["show clock", "show bogus"]},
+            "ignored": {},
+        },
+    }
+    job_file, config_patch, inventory_patch = _setup(
+        tmp_path,
+        server,
+        job,
+        [("r1", "edge"), ("r2", "core"), ("r3", "broken"), ("r4", "ignored")],
+    )
+    with config_patch, inventory_patch:
+        report = run_job(job_file, "devices.yaml")
+
+    rows = {row["hostname"]: row for row in report.rows()}
+    assert {h: r["status"] for h, r in rows.items()} == {
+        "r1": "success",
+        "r2": "success",
+        "r3": "failed",
+        "r4": "skipped",
+    }
+    assert rows["r3"]["error_class"] == "CommandError"
+    assert report.run_id.startswith("job_audit_")
+
+    r1 = open(rows["r1"]["output_path"]).read()
+    assert r1 == "### show clock (exit 0)\n12:00:00 UTC\n"
+    assert rows["r1"]["output_path"].startswith(str(tmp_path / "jobs" / "audit"))
+    r2 = open(rows["r2"]["output_path"]).read()
+    assert "### show ver (exit 0)\nv1\n### config (exit 0)\n" in r2
+    assert server.shell_lines == [
+        "configure terminal",
+        "ntp server 10.0.0.1",
+        "end",
+        "exit",
+    ]
+    assert "### show bogus (exit 1)" in open(rows["r3"]["output_path"]).read()
+
+
+def test_failed_canary_skips_the_rest(tmp_path, server) -> None:
+    """
+    Verifies the fleet stage does not start when canaries fail, and does when
+    they pass.
+    """
+    job = {
+        "name": "canary",
+        "canary": 2,
+        "default": {"commands": ["show clock"]},
+        "by_type": {"broken": {"commands": ["show bogus"]}},
+    }
+    devices = [("c1", "broken"), ("c2", "edge"), ("r1", "edge"), ("r2", "edge")]
+    job_file, config_patch, inventory_patch = _setup(tmp_path, server, job, devices)
+    with config_patch, inventory_patch:
+        report = run_job(job_file, "devices.yaml")
+
+    assert report.counts() == {"failed": 1, "success": 1, "skipped": 2}
+    skipped = [r for r in report.rows() if r["status"] == "skipped"]
+    assert {r["hostname"] for r in skipped} == {"r1", "r2"}
+    assert {r["error_class"] for r in skipped} == {"CanaryFailed"}
+    connections = server.connections
+
+    job["canary_max_failures"] = 1
+    job_file, config_patch, inventory_patch = _setup(tmp_path, server, job, devices)
+    with config_patch, inventory_patch:
+        report = run_job(job_file, "devices.yaml")
+
+    assert report.counts() == {"failed": 1, "success": 3}
+    assert server.connections == connections + 4
+
+
+def test_rejected_lines_fail_the_canary(tmp_path, monkeypatch) -> None:
+    """
+    Verifies output matching the error patterns fails a device even when its
+    exit status is 0 (exec) or that of a config session, and stops the fleet.
+    """
+    monkeypatch.setenv("SSH_USERNAME", "admin")
+    monkeypatch.setenv("SSH_PASSWORD", "admin")
+    commands = {"show clock": "12:00", "show bad": "% Invalid input detected\n"}
+    job = {
+        "name": "push",
+        "canary": 2,
+        "by_type": {
+            "exec": {"commands": ["show bad"]},
+            "config": {"config": ["conf t", "ntp srv 1.1.1.1", "end"]},
+            "edge": {"commands": ["show clock"]},
+        },
+    }
+    devices = [("c1", "exec"), ("c2", "config"), ("r1", "edge")]
+    with StandinSSHServer(commands, rejected=["ntp srv 1.1.1.1"]) as server:
+        job_file, config_patch, inventory_patch = _setup(tmp_path, server, job, devices)
+        with config_patch, inventory_patch:
+            report = run_job(job_file, "devices.yaml")
+
+        rows = {row["hostname"]: row for row in report.rows()}
+        assert rows["c1"]["error_class"] == "CommandError"
+        assert rows["c2"]["error_class"] == "CommandError"
+        assert rows["r1"]["error_class"] == "CanaryFailed"
+
+        job["error_patterns"] = []
+        job_file, config_patch, inventory_patch = _setup(tmp_path, server, job, devices)
+        with config_patch, inventory_patch:
+            report = run_job(job_file, "devices.yaml")
+        assert report.counts() == {"success": 3}
@@ -0,0 +1,179 @@
+"""
+Tests for the compliance service.
+
+Covers:
+  - Required, forbidden, and per-block rules
+  - Loading rules from YAML
+  - Inline flags scoped to their own rule
+  - Result caching by config hash, capped by least recent use
+  - Parallel evaluation matches serial evaluation
+"""
+
+import hashlib
+
+import pytest
+
+from src.models.compliance_model import ComplianceRule, Violation
+from src.services.compliance import (
+    ComplianceCache,
+    evaluate_configs,
+    load_rules,
+    RuleSet,
+)
+
+CONFIG = """hostname r1
+!
+interface GigabitEthernet0/1
+ description uplink
+ ip address 10.0.0.1 255.255.255.0
+!
+interface GigabitEthernet0/2
+ shutdown
+!
+line vty 0 4
+ transport input ssh telnet
+!
+ip http server
+"""
+
+RULES = [
+    ComplianceRule(id="ntp", kind="required", pattern=r"^ntp server \S+"),
+    ComplianceRule(
+        id="telnet", kind="forbidden", pattern=r"^\s*transport input .*telnet"
+    ),
+    ComplianceRule(
+        id="if-desc",
+        kind="required",
+        block=r"^interface GigabitEthernet",
+        pattern=r"^\s+description ",
+    ),
+    ComplianceRule(
+        id="no-shut-iface",
+        kind="forbidden",
+        block=r"^interface ",
+        pattern=r"^\s+shutdown",
+    ),
+    ComplianceRule(
+        id="http", kind="forbidden", pattern=r"^IP HTTP SERVER", ignore_case=True
+    ),
+]
+
+
+def test_ruleset_reports_all_violation_kinds() -> None:
+    """
+    Verifies each rule kind is evaluated correctly in one pass.
+    """
+    violations = RuleSet(RULES).evaluate(CONFIG)
+
+    assert violations == [
+        Violation("ntp"),
+        Violation("telnet", line=" transport input ssh telnet"),
+        Violation("if-desc", block="interface GigabitEthernet0/2"),
+        Violation(
+            "no-shut-iface", block="interface GigabitEthernet0/2", line=" shutdown"
+        ),
+        Violation("http", line="ip http server"),
+    ]
+
+
+def test_compliant_config_has_no_violations() -> None:
+    """
+    Verifies a config satisfying every rule yields an empty list.
+    """
+    config = "ntp server 10.1.1.1\ninterface GigabitEthernet0/1\n description x\n"
+    assert RuleSet(RULES).evaluate(config) == []
+
+
+def test_inline_flags_apply_to_their_rule_only() -> None:
+    """
+    Verifies a pattern with leading "(?i)" compiles into the combined matcher
+    and does not make other rules case-insensitive.
+    """
+    ruleset = RuleSet(
+        [
+            ComplianceRule(id="http", kind="forbidden", pattern=r"(?i)^ip http server"),
+            ComplianceRule(id="snmp", kind="forbidden", pattern=r"^snmp-server"),
+        ]
+    )
+
+    violations = ruleset.evaluate("IP HTTP SERVER\nSNMP-SERVER community x\n")
+
+    assert violations == [Violation("http", line="IP HTTP SERVER")]
+
+
+def test_load_rules_rejects_duplicate_ids(tmp_path) -> None:
+    """
+    Ensures duplicate rule ids are refused.
+    """
+    rules_file = tmp_path / "rules.yaml"
+    rules_file.write_text(
+        "rules:\n"
+        "  - {id: a, kind: required, pattern: x}\n"
+        "  - {id: a, kind: forbidden, pattern: y}\n"
+    )
+    with pytest.raises(ValueError):
+        load_rules(str(rules_file))
+
+
+def test_load_shipped_rules() -> None:
+    """
+    Verifies the sample rules file in src/config is valid.
+    """
+    assert load_rules("src/config/compliance.yaml")
+
+
+def test_cached_configs_are_not_reread(tmp_path) -> None:
+    """
+    Verifies a second evaluation is served from the cache without reading files.
+    """
+    cfg = tmp_path / "r1.cfg"
+    cfg.write_text(CONFIG)
+    digest = hashlib.sha256(CONFIG.encode()).hexdigest()
+    ruleset = RuleSet(RULES)
+
+    cache = ComplianceCache(str(tmp_path / "cache"), ruleset.fingerprint)
+    first = evaluate_configs(ruleset, [("r1", digest, str(cfg))], cache=cache)
+    cache.save()
+    cfg.unlink()
+
+    reloaded = ComplianceCache(str(tmp_path / "cache"), ruleset.fingerprint)
+    second = evaluate_configs(ruleset, [("r1", digest, str(cfg))], cache=reloaded)
+
+    assert first == second
+
+
+def test_parallel_matches_serial(tmp_path) -> None:
+    """
+    Verifies process-pool evaluation returns the same results as inline evaluation.
+    """
+    items = []
+    for i in range(80):
+        text = CONFIG if i % 2 else "ntp server 1.1.1.1\n"
+        path = tmp_path / f"r{i}.cfg"
+        path.write_text(text)
+        items.append((f"r{i}", f"h{i}", str(path)))
+    ruleset = RuleSet(RULES)
+
+    serial = evaluate_configs(ruleset, items, workers=1)
+    parallel = evaluate_configs(ruleset, items, workers=2)
+
+    assert parallel == serial
+    assert serial["r0"] == []
+
+
+def test_cache_drops_least_recently_used(tmp_path) -> None:
+    """
+    Verifies the cache keeps at most max_entries hashes, evicting the least
+    recently used one.
+    """
+    cache = ComplianceCache(str(tmp_path), "f" * 64, max_entries=2)
+    cache.put("a", [Violation("ntp")])
+    cache.put("b", [])
+    assert cache.get("a") == [Violation("ntp")]
+    cache.put("c", [])
+    cache.save()
+
+    reloaded = ComplianceCache(str(tmp_path), "f" * 64, max_entries=2)
+    assert reloaded.get("b") is None
+    assert reloaded.get("a") == [Violation("ntp")]
+    assert reloaded.get("c") == []
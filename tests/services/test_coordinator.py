@@ -0,0 +1,178 @@
+"""
+Tests for the job coordinator service.
+
+Covers:
+  - Sharing one in-flight fetch between overlapping jobs
+  - Global and per-site caps across jobs
+  - Fair share for a job that starts while another holds every slot
+  - Releasing the slots of a job whose process exited
+  - Failing a device that waits past wait_timeout
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import pytest
+
+from src.models.inventory import DeviceRecord
+from src.services.backends import BackendFetchError, FetchOutcome
+from src.services.coordinator import JobCoordinator
+
+
+class _Tracker:
+    """
+    Fake fetch that records concurrency per site.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.calls: List[str] = []
+        self.peak = 0
+        self.peak_site: Dict[str, int] = {}
+        self._running: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, device: DeviceRecord) -> FetchOutcome:
+        site = device.location or ""
+        with self._lock:
+            self.calls.append(device.hostname)
+            self._running[site] = self._running.get(site, 0) + 1
+            self.peak = max(self.peak, sum(self._running.values()))
+            self.peak_site[site] = max(self.peak_site.get(site, 0), self._running[site])
+        time.sleep(self.seconds)
+        with self._lock:
+            self._running[site] -= 1
+        return FetchOutcome(f"conf-{device.hostname}", 1, "ssh")
+
+
+def _run(coordinator: JobCoordinator, devices, fetch, workers: int = 8):
+    with ThreadPoolExecutor(workers) as pool:
+        return list(
+            pool.map(
+                lambda d: coordinator.fetch(d, "ssh:show run", lambda: fetch(d)),
+                devices,
+            )
+        )
+
+
+def test_overlapping_jobs_share_fetches(tmp_path) -> None:
+    """
+    Verifies a device fetched by one job is served to another job without a
+    second connection.
+    """
+    db = str(tmp_path / "coord.sqlite3")
+    fetch = _Tracker(0.2)
+    devices = [DeviceRecord(f"r{i}", location="DFW") for i in range(4)]
+    with (
+        JobCoordinator(db, "backup", 8, poll_interval=0.01) as backup,
+        JobCoordinator(db, "adhoc", 8, poll_interval=0.01) as adhoc,
+    ):
+        with ThreadPoolExecutor(2) as jobs:
+            first = jobs.submit(_run, backup, devices, fetch)
+            time.sleep(0.05)
+            second = jobs.submit(_run, adhoc, devices, fetch)
+            results = first.result() + second.result()
+
+    assert sorted(fetch.calls) == ["r0", "r1", "r2", "r3"]
+    assert {r.text for r in results} == {f"conf-r{i}" for i in range(4)}
+    assert (backup.fetched, adhoc.shared) == (4, 4)
+    assert all(r.attempts == 0 for r in results[4:])
+
+
+def test_caps_hold_across_jobs(tmp_path) -> None:
+    """
+    Verifies the global and per-site caps bound the sum of all jobs.
+    """
+    db = str(tmp_path / "coord.sqlite3")
+    fetch = _Tracker(0.02)
+    coordinators = [
+        JobCoordinator(db, f"job{j}", 3, max_per_site=2, poll_interval=0.005)
+        for j in range(3)
+    ]
+    with ThreadPoolExecutor(3) as jobs:
+        for j, coordinator in enumerate(coordinators):
+            coordinator.register()
+            devices = [
+                DeviceRecord(f"j{j}-r{i}", location=("DFW", "NYC")[i % 2])
+                for i in range(10)
+            ]
+            jobs.submit(_run, coordinator, devices, fetch)
+    for coordinator in coordinators:
+        coordinator.close()
+
+    assert len(fetch.calls) == 30
+    assert fetch.peak <= 3
+    assert max(fetch.peak_site.values()) <= 2
+
+
+def test_fair_share_for_late_job(tmp_path) -> None:
+    """
+    Verifies a small job started during a large one gets its share of slots
+    instead of queueing behind the large job.
+    """
+    db = str(tmp_path / "coord.sqlite3")
+    fetch = _Tracker(0.05)
+    big = [DeviceRecord(f"big{i}") for i in range(24)]
+    small = [DeviceRecord(f"small{i}") for i in range(4)]
+    finished: Dict[str, float] = {}
+
+    def job(name: str, devices) -> None:
+        with JobCoordinator(db, name, 4, poll_interval=0.005) as coordinator:
+            _run(coordinator, devices, fetch)
+        finished[name] = time.monotonic()
+
+    with ThreadPoolExecutor(2) as jobs:
+        jobs.submit(job, "big", big)
+        time.sleep(0.06)
+        jobs.submit(job, "small", small)
+
+    assert fetch.peak <= 4
+    assert finished["small"] < finished["big"]
+
+
+def test_exited_job_slots_are_released(tmp_path) -> None:
+    """
+    Verifies a slot held by a job whose process is gone does not block others.
+    """
+    db = str(tmp_path / "coord.sqlite3")
+    with JobCoordinator(db, "live", 1, poll_interval=0.005) as coordinator:
+        with coordinator._transaction() as conn:
+            conn.execute("INSERT INTO jobs VALUES ('dead', 999999999, 0, 0)")
+            conn.execute(
+                "INSERT INTO inflight VALUES ('old', 'ssh:show run', 'dead', NULL, 0)"
+            )
+        outcome = coordinator.fetch(
+            DeviceRecord("r1"),
+            "ssh:show run",
+            lambda: FetchOutcome("conf", 1, "ssh"),
+        )
+    assert outcome.text == "conf"
+
+
+def test_wait_timeout_fails_device(tmp_path) -> None:
+    """
+    Verifies a device whose key stays held by another job fails with
+    BackendFetchError once wait_timeout passes, without fetching.
+    """
+    db = str(tmp_path / "coord.sqlite3")
+    kwargs = dict(poll_interval=0.005, wait_timeout=0.05)
+    with JobCoordinator(db, "a", 2, **kwargs) as first:
+        with JobCoordinator(db, "b", 2, **kwargs) as second:
+            with first._transaction() as conn:
+                conn.execute(
+                    "INSERT INTO inflight VALUES (?, ?, ?, NULL, ?)",
+                    ("r1", "ssh:show run", first.job_id, time.time()),
+                )
+            calls: List[str] = []
+            with pytest.raises(BackendFetchError) as info:
+                second.fetch(
+                    DeviceRecord("r1"),
+                    "ssh:show run",
+                    lambda: calls.append("r1") or FetchOutcome("x", 1, "ssh"),
+                )
+    assert info.value.backend == "ssh"
+    assert info.value.attempts == 0
+    assert isinstance(info.value.cause, TimeoutError)
+    assert calls == []
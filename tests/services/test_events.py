@@ -0,0 +1,167 @@
+"""
+Tests for the device events service.
+
+Covers:
+  - Classifying fetched configs against the baseline (collected/unchanged/changed)
+  - Non-blocking publish with a bounded buffer and a paused failing sink
+  - Collector runs emitting one event per device as it completes
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from src.config.schema import (
+    AppConfig,
+    CollectorConfig,
+    EventsConfig,
+    EventSinkConfig,
+    SSHConfig,
+)
+from src.models.inventory import Inventory
+from src.services.events import EventKind, EventStream, summarize_change
+from src.services.ssh_collector import collect_device_configs
+from src.utils.event_sinks import Event, EventSink
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def test_summarize_change(tmp_path) -> None:
+    """
+    Verifies the kind, line counts, and truncated diff for each baseline case.
+    """
+    old = "hostname r1\nntp server 10.0.0.1\nlogging host 10.0.0.9\n"
+    new = "hostname r1\nntp server 10.0.0.2\nlogging host 10.0.0.9\nsnmp-server x\n"
+    stored = tmp_path / "r1_20260301.cfg"
+    stored.write_text(old)
+
+    assert summarize_change(new, _hash(new), None).kind == EventKind.COLLECTED
+
+    same = summarize_change(old, _hash(old), (_hash(old), str(stored)))
+    assert same.kind == EventKind.UNCHANGED
+
+    # Unknown baseline hash (disk scan): compared by content.
+    assert summarize_change(old, _hash(old), (None, str(stored))).kind == (
+        EventKind.UNCHANGED
+    )
+
+    changed = summarize_change(new, _hash(new), (None, str(stored)), diff_lines=2)
+    assert changed.kind == EventKind.CHANGED
+    assert (changed.added, changed.removed) == (2, 1)
+    assert changed.diff == ("-ntp server 10.0.0.1", "+ntp server 10.0.0.2")
+    assert changed.sections == ("ntp server 10.0.0.2", "snmp-server x")
+
+    gone = summarize_change(new, _hash(new), ("abc", str(tmp_path / "missing.cfg")))
+    assert gone.kind == EventKind.CHANGED and gone.diff == ()
+
+
+class _SlowSink(EventSink):
+    name = "slow"
+
+    def __init__(self, release: threading.Event) -> None:
+        super().__init__("slow")
+        self.release = release
+        self.received: List[Event] = []
+
+    def send(self, events: List[Event]) -> None:
+        self.release.wait(5)
+        self.received.extend(events)
+
+
+class _FailingSink(EventSink):
+    name = "failing"
+
+    def __init__(self) -> None:
+        super().__init__("failing")
+        self.calls = 0
+
+    def send(self, events: List[Event]) -> None:
+        self.calls += 1
+        raise OSError("receiver down")
+
+
+def test_stream_never_blocks_on_slow_sinks() -> None:
+    """
+    Verifies publish() drops instead of waiting when the buffer is full, buffered
+    events are flushed on close, and a failing sink is paused, not retried per batch.
+    """
+    release = threading.Event()
+    slow, failing = _SlowSink(release), _FailingSink()
+    stream = EventStream([slow, failing], buffer_size=4, batch_size=2)
+    stream.start()
+
+    started = time.perf_counter()
+    accepted = [stream.publish({"seq": i}) for i in range(50)]
+    assert time.perf_counter() - started < 0.5
+    assert stream.dropped == accepted.count(False) > 0
+
+    release.set()
+    stream.close()
+
+    assert [event["seq"] for event in slow.received] == [
+        i for i, ok in enumerate(accepted) if ok
+    ]
+    assert failing.calls == 1
+    assert stream.failed["failing"] == stream.published
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch) -> None:
+    monkeypatch.setenv("SSH_USERNAME", "admin")
+    monkeypatch.setenv("SSH_PASSWORD", "secret")
+
+
+@patch("src.services.backends.SSHBackend.fetch_once")
+@patch("src.services.ssh_collector.load_config")
+@patch("src.services.ssh_collector.load_inventory")
+def test_collector_emits_events(
+    mock_load_devices, mock_load_config, mock_fetch, tmp_path
+) -> None:
+    """
+    Verifies a rerun reports unchanged, changed (with diff), and failed devices.
+    """
+    events_file = tmp_path / "events.jsonl"
+    mock_load_devices.return_value = Inventory.from_entries(
+        [{"hostname": "r1"}, {"hostname": "r2"}, {"hostname": "r3"}]
+    )
+    mock_load_config.return_value = AppConfig(
+        output_dir=str(tmp_path / "configs"),
+        report_dir=str(tmp_path / "reports"),
+        ssh=SSHConfig(),
+        collector=CollectorConfig(retries=1),
+        events=EventsConfig(
+            enabled=True,
+            parse_cache_dir=str(tmp_path / "parse"),
+            sinks=[EventSinkConfig(type="jsonl", target=str(events_file))],
+        ),
+    )
+    configs = {"r1": "hostname r1\n", "r2": "hostname r2\n", "r3": "hostname r3\n"}
+    mock_fetch.side_effect = lambda target: configs[target]
+    collect_device_configs("devices.yaml")
+
+    configs["r2"] = "hostname r2\nntp server 10.0.0.1\n"
+    del configs["r3"]
+    collect_device_configs("devices.yaml")
+
+    events = [json.loads(line) for line in events_file.read_text().splitlines()]
+    assert len(events) == 6
+    assert {e["event"] for e in events[:3]} == {"collected"}
+    rerun = {e["hostname"]: e for e in events[3:]}
+    assert rerun["r1"]["event"] == "unchanged"
+    assert rerun["r2"]["event"] == "changed"
+    assert rerun["r2"]["diff"] == {
+        "added": 1,
+        "removed": 0,
+        "lines": ["+ntp server 10.0.0.1"],
+        "sections": ["ntp server 10.0.0.1"],
+    }
+    assert rerun["r2"]["config_hash"] == _hash(configs["r2"])
+    assert rerun["r3"]["event"] == "failed"
+    assert rerun["r3"]["error_class"] == "KeyError"
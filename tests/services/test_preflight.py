@@ -0,0 +1,227 @@
+"""
+Tests for the pre-flight service.
+
+Covers:
+  - Banner-only probe against a local listener
+  - Probing the device's IP when set, and HTTP devices stopping after tcp
+  - DNS and TCP failures stop at the failing stage
+  - Hung DNS lookups and auth exchanges bounded by the stage timeout
+  - Key exchange and the auth-only probe against a local SSH server
+  - An unexpected probe error fails only that device
+"""
+
+import socket
+import threading
+import time
+from unittest.mock import patch
+
+import paramiko
+import pytest
+
+from src.config.schema import AppConfig, PreflightConfig, SSHConfig
+from src.models.inventory import DeviceRecord, Inventory
+from src.models.readiness_report import DeviceReadiness, ProbeStage
+from src.services.preflight import probe_device, run_preflight
+
+
+def _listen() -> socket.socket:
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    return server
+
+
+@pytest.fixture
+def banner_server():
+    """
+    Listener that sends a pre-banner line and an SSH banner to each client.
+    """
+    server = _listen()
+
+    def serve() -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                conn.sendall(b"Authorized use only\r\nSSH-2.0-Standin_1.0\r\n")
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield server.getsockname()[1]
+    server.close()
+
+
+class _PasswordServer(paramiko.ServerInterface):
+    def check_auth_password(self, username: str, password: str) -> int:
+        if password == "tarpit":
+            time.sleep(3)
+        if (username, password) == ("admin", "secret"):
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def get_allowed_auths(self, username: str) -> str:
+        return "password"
+
+
+@pytest.fixture(scope="module")
+def ssh_server():
+    """
+    Minimal paramiko SSH server accepting admin/secret.
+    """
+    host_key = paramiko.RSAKey.generate(1024)
+    server = _listen()
+
+    def handle(conn: socket.socket) -> None:
+        transport = paramiko.Transport(conn)
+        transport.add_server_key(host_key)
+        try:
+            transport.start_server(server=_PasswordServer())
+            transport.join(5)
+        except (paramiko.SSHException, EOFError, OSError):
+            pass
+        finally:
+            transport.close()
+
+    def serve() -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield server.getsockname()[1]
+    server.close()
+
+
+DEVICE = DeviceRecord("127.0.0.1", location="lab", type="router")
+
+
+def test_banner_probe_reads_identification(banner_server) -> None:
+    """
+    Verifies the banner stage skips pre-banner lines and records the banner.
+    """
+    result = probe_device(DEVICE, PreflightConfig(port=banner_server, kex=False))
+
+    assert result.ready
+    assert result.address == "127.0.0.1"
+    assert result.banner == "SSH-2.0-Standin_1.0"
+
+
+def test_probe_uses_ip_and_skips_ssh_for_http(banner_server) -> None:
+    """
+    Verifies the probe connects to `ip` rather than resolving the hostname, and
+    that ssh=False ends the probe after tcp.
+    """
+    device = DeviceRecord("unresolvable.invalid", ip="127.0.0.1")
+
+    result = probe_device(device, PreflightConfig(kex=False), port=banner_server)
+    assert result.ready and result.banner == "SSH-2.0-Standin_1.0"
+
+    http = probe_device(device, PreflightConfig(), port=banner_server, ssh=False)
+    assert http.ready and http.banner is None and http.tcp_ms > 0
+
+
+def test_probe_stops_at_tcp_failure() -> None:
+    """
+    Verifies a closed port fails the tcp stage.
+    """
+    closed = _listen()
+    port = closed.getsockname()[1]
+    closed.close()
+
+    result = probe_device(DEVICE, PreflightConfig(port=port, kex=False))
+
+    assert result.failed_stage == ProbeStage.TCP
+    assert "ConnectionRefusedError" in result.error
+
+
+def test_probe_stops_at_dns_failure(monkeypatch) -> None:
+    """
+    Verifies a resolution error fails the dns stage without connecting.
+    """
+
+    def fail(*args, **kwargs):
+        raise socket.gaierror(-2, "Name or service not known")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fail)
+
+    result = probe_device(DeviceRecord("nowhere.example"), PreflightConfig())
+
+    assert result.failed_stage == ProbeStage.DNS
+    assert result.address is None
+
+
+def test_hung_dns_and_auth_are_bounded(ssh_server, monkeypatch) -> None:
+    """
+    Verifies a lookup or an auth exchange that hangs fails its stage once the
+    stage timeout passes.
+    """
+    settings = PreflightConfig(port=ssh_server, timeout=1.0)
+
+    started = time.perf_counter()
+    tarpit = probe_device(DEVICE, settings, ("admin", "tarpit"))
+    assert tarpit.failed_stage == ProbeStage.AUTH
+    assert time.perf_counter() - started < 2.5
+
+    def hang(*args, **kwargs):
+        time.sleep(3)
+        raise socket.gaierror(-2, "Name or service not known")
+
+    monkeypatch.setattr(socket, "getaddrinfo", hang)
+    started = time.perf_counter()
+    result = probe_device(DeviceRecord("slow.example"), settings)
+    assert result.failed_stage == ProbeStage.DNS
+    assert "TimeoutError" in result.error
+    assert time.perf_counter() - started < 2.5
+
+
+def test_kex_and_auth_probe(ssh_server) -> None:
+    """
+    Verifies key exchange records the host key, and the auth probe separates
+    good and bad credentials.
+    """
+    settings = PreflightConfig(port=ssh_server, timeout=5)
+
+    kex_only = probe_device(DEVICE, settings)
+    assert kex_only.ready
+    assert kex_only.host_key == "ssh-rsa"
+    assert kex_only.banner.startswith("SSH-2.0-")
+
+    assert probe_device(DEVICE, settings, ("admin", "secret")).ready
+    denied = probe_device(DEVICE, settings, ("admin", "wrong"))
+    assert denied.failed_stage == ProbeStage.AUTH
+    assert "AuthenticationException" in denied.error
+
+
+@patch("src.services.preflight.probe_device")
+@patch("src.services.preflight.load_inventory")
+@patch("src.services.preflight.load_config")
+def test_unexpected_probe_error_fails_one_device(
+    mock_load_config, mock_load_inventory, mock_probe, tmp_path
+) -> None:
+    """
+    Verifies a probe that raises is reported as a failed device, and the rest
+    of the inventory still gets its rows.
+    """
+    mock_load_config.return_value = AppConfig(
+        output_dir=str(tmp_path), report_dir=str(tmp_path), ssh=SSHConfig()
+    )
+    mock_load_inventory.return_value = Inventory.from_entries(
+        [{"hostname": "r1"}, {"hostname": "r2"}]
+    )
+
+    def probe(device, settings, credentials, port, ssh):
+        if device.hostname == "r1":
+            raise RuntimeError("probe bug")
+        return DeviceReadiness(device.hostname, device.location, device.type)
+
+    mock_probe.side_effect = probe
+
+    report = run_preflight("devices.yaml")
+
+    assert report.counts() == {"ready": 1, ProbeStage.PROBE: 1}
+    (failed,) = report.not_ready()
+    assert (failed.hostname, failed.error) == ("r1", "RuntimeError: probe bug")
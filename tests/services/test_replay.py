@@ -0,0 +1,168 @@
+"""
+Tests for session record/replay.
+
+Covers:
+  - Recording a live run and replaying it offline with matching results
+  - Replaying at recorded timing, including recorded start offsets
+  - Replays bypassing the job coordinator and (by default) event sinks
+  - Devices missing from the capture
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.config.schema import AppConfig, SSHConfig
+from src.models.inventory import DeviceRecord, Inventory
+from src.services.backends import BackendFetchError
+from src.services.replay import ReplayEngine
+from src.services.ssh_collector import collect_device_configs
+from src.utils.capture import CaptureRecord, CaptureWriter
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch) -> None:
+    monkeypatch.setenv("SSH_USERNAME", "admin")
+    monkeypatch.setenv("SSH_PASSWORD", "secret")
+
+
+def _config(tmp_path, name: str) -> AppConfig:
+    return AppConfig(
+        output_dir=str(tmp_path / name),
+        report_dir=str(tmp_path / "reports"),
+        ssh=SSHConfig(),
+        collector={"retries": 1},
+    )
+
+
+@patch("src.services.backends.SSHBackend.fetch_once")
+@patch("src.services.ssh_collector.load_config")
+@patch("src.services.ssh_collector.load_inventory")
+def test_record_then_replay_matches(
+    mock_load_devices, mock_load_config, mock_fetch, tmp_path
+) -> None:
+    """
+    Verifies a replay reproduces the recorded run's results and stored configs
+    without contacting any device or needing the inventory.
+    """
+
+    def fetch(target: str) -> str:
+        if target == "bad":
+            raise OSError("unreachable")
+        return f"hostname {target}\n"
+
+    mock_load_devices.return_value = Inventory.from_entries(
+        [
+            {"hostname": "r1", "location": "DFW", "type": "ios"},
+            {"hostname": "bad", "location": "NYC"},
+            {"hostname": "r2", "location": "NYC"},
+        ]
+    )
+    mock_fetch.side_effect = fetch
+    capture = str(tmp_path / "run.capture.gz")
+
+    mock_load_config.return_value = _config(tmp_path, "live")
+    live = collect_device_configs("devices.yaml", record=capture)
+
+    mock_fetch.side_effect = AssertionError("replay must not connect")
+    mock_load_config.return_value = _config(tmp_path, "replayed")
+    replayed = collect_device_configs(None, replay=capture)
+
+    def summary(report):
+        return sorted(
+            (r["hostname"], r["location"], r["status"], r["error_class"])
+            + (r["config_hash"], r["attempts"])
+            for r in report.rows()
+        )
+
+    assert summary(replayed) == summary(live)
+    assert sorted(p.name for p in (tmp_path / "replayed").glob("*.cfg")) == sorted(
+        p.name for p in (tmp_path / "live").glob("*.cfg")
+    )
+
+
+def test_replay_at_recorded_timing(tmp_path) -> None:
+    """
+    Verifies speed 1.0 waits each recorded fetch duration and None does not.
+    """
+    records = [CaptureRecord("r1", None, None, None, "ssh", 1, 0.0, 0.2, text="x")]
+    config = _config(tmp_path, "out")
+    device = DeviceRecord("r1")
+
+    started = time.perf_counter()
+    ReplayEngine(config, records).fetch(device)
+    assert time.perf_counter() - started < 0.1
+
+    started = time.perf_counter()
+    outcome = ReplayEngine(config, records, speed=1.0).fetch(device)
+    assert time.perf_counter() - started >= 0.2
+    assert outcome.text == "x"
+
+
+def test_replay_honors_recorded_offsets(tmp_path) -> None:
+    """
+    Verifies a timed replay starts each fetch no earlier than its recorded
+    offset, scaled by the speed.
+    """
+    records = [
+        CaptureRecord("r1", None, None, None, "ssh", 1, 0.0, 0.0, text="1"),
+        CaptureRecord("r2", None, None, None, "ssh", 1, 0.3, 0.0, text="2"),
+    ]
+    config = _config(tmp_path, "out")
+    for speed, expected in ((1.0, 0.3), (2.0, 0.15)):
+        engine = ReplayEngine(config, records, speed=speed)
+        started = time.perf_counter()
+        engine.fetch(DeviceRecord("r1"))
+        assert time.perf_counter() - started < expected
+        engine.fetch(DeviceRecord("r2"))
+        assert time.perf_counter() - started >= expected
+
+
+@patch("src.services.ssh_collector._open_coordinator")
+@patch("src.services.ssh_collector.load_config")
+def test_replay_bypasses_coordinator_and_events(
+    mock_load_config, mock_open_coordinator, tmp_path
+) -> None:
+    """
+    Verifies replayed configs never reach the shared coordinator, and events
+    are published only with `events.on_replay`.
+    """
+    capture = str(tmp_path / "run.capture.gz")
+    with CaptureWriter(capture, {"run_id": "run_x"}) as writer:
+        writer.add(CaptureRecord("r1", None, None, None, "ssh", 1, 0.0, 0.0, "x"))
+    events = tmp_path / "events.jsonl"
+
+    def config(on_replay: bool) -> AppConfig:
+        return AppConfig(
+            output_dir=str(tmp_path / "out"),
+            report_dir=str(tmp_path / "reports"),
+            ssh=SSHConfig(),
+            coordinator={"enabled": True, "path": str(tmp_path / "coord.db")},
+            events={
+                "enabled": True,
+                "on_replay": on_replay,
+                "parse_cache_dir": None,
+                "sinks": [{"type": "jsonl", "target": str(events)}],
+            },
+        )
+
+    mock_load_config.return_value = config(False)
+    report = collect_device_configs(None, replay=capture)
+    assert report.column("status") == ["success"]
+    assert not events.exists()
+
+    mock_load_config.return_value = config(True)
+    collect_device_configs(None, replay=capture)
+    assert events.read_text().count("\n") == 1
+    mock_open_coordinator.assert_not_called()
+
+
+def test_replay_missing_device(tmp_path) -> None:
+    """
+    Verifies a device absent from the capture fails as NotInCapture.
+    """
+    engine = ReplayEngine(_config(tmp_path, "out"), [])
+    with pytest.raises(BackendFetchError) as exc_info:
+        engine.fetch(DeviceRecord("r9"))
+    assert type(exc_info.value.cause).__name__ == "NotInCapture"
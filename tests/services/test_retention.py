@@ -0,0 +1,116 @@
+"""
+Tests for the retention service.
+
+Covers:
+  - Daily/weekly/monthly retention selection
+  - Archiving closed months, pruning, and reading archived configs back
+  - Idempotent re-runs and bounded (max_months) passes
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.config.schema import RetentionConfig, StorageConfig
+from src.services.retention import compact_output_dir, select_retained
+from src.utils.file_utils import iter_stored_configs, read_config, write_config_to_file
+
+TODAY = date(2025, 6, 15)
+
+
+def _stamps(start: date, days: int):
+    return [(start + timedelta(days=i)).strftime("%Y%m%d") for i in range(days)]
+
+
+def test_select_retained_applies_windows() -> None:
+    """
+    Verifies daily, weekly, and monthly windows keep the expected stamps.
+    """
+    policy = RetentionConfig(
+        keep_daily_days=7, keep_weekly_weeks=4, keep_monthly_months=6
+    )
+    stamps = _stamps(date(2024, 10, 1), (TODAY - date(2024, 10, 1)).days + 1)
+
+    kept = select_retained(stamps, TODAY, policy)
+
+    # Every day of the last week.
+    assert set(_stamps(TODAY - timedelta(days=6), 7)) <= kept
+    # One per ISO week inside the weekly window (Sundays are the newest day).
+    assert {"20250608", "20250601", "20250525"} <= kept
+    assert "20250524" not in kept
+    # One per month inside the monthly window, none beyond it.
+    assert "20250131" in kept and "20250130" not in kept
+    assert not any(s.startswith("2024") for s in kept)
+
+
+def _populate(output_dir: Path, layout: str) -> None:
+    for stamp in _stamps(date(2025, 3, 1), (TODAY - date(2025, 3, 1)).days + 1):
+        for host in ("r1", "r2"):
+            write_config_to_file(
+                host, f"{host} {stamp}", stamp, str(output_dir), layout=layout
+            )
+
+
+def test_compaction_archives_prunes_and_stays_readable(tmp_path) -> None:
+    """
+    Verifies closed months are archived, retention is applied, and every kept
+    config remains readable through read_config().
+    """
+    storage = StorageConfig(
+        layout="date",
+        retention=RetentionConfig(keep_daily_days=14, keep_weekly_weeks=8),
+    )
+    _populate(tmp_path, storage.layout)
+
+    result = compact_output_dir(str(tmp_path), storage, today=TODAY)
+
+    assert result.archives_written == 3  # March to May; June is still open
+    assert (tmp_path / "archive" / "2025" / "2025-03.zip").exists()
+    assert (tmp_path / "archive" / "2025" / "2025-05.zip.index.json").exists()
+    assert not (tmp_path / "2025" / "05").exists()
+    assert (tmp_path / "2025" / "06" / "15" / "r1_20250615.cfg").exists()
+
+    stored = list(iter_stored_configs(str(tmp_path)))
+    for host in ("r1", "r2"):
+        kept = sorted(s.date_stamp for s in stored if s.hostname == host)
+        policy_kept = select_retained(
+            _stamps(date(2025, 3, 1), 107), TODAY, storage.retention
+        )
+        assert kept == sorted(policy_kept)
+    for item in stored:
+        assert read_config(item.location) == f"{item.hostname} {item.date_stamp}"
+    assert result.pruned == 2 * 107 - len(stored)
+
+
+def test_compaction_is_idempotent_and_bounded(tmp_path) -> None:
+    """
+    Verifies max_months bounds a pass and re-running changes nothing once done.
+    """
+    storage = StorageConfig(layout="host")
+    _populate(tmp_path, storage.layout)
+
+    first = compact_output_dir(str(tmp_path), storage, today=TODAY, max_months=1)
+    assert first.archives_written == 1
+    assert first.months_pending == 1
+
+    second = compact_output_dir(str(tmp_path), storage, today=TODAY)
+    assert second.archives_written == 1
+    assert second.months_pending == 0
+
+    before = sorted(s.location for s in iter_stored_configs(str(tmp_path)))
+    third = compact_output_dir(str(tmp_path), storage, today=TODAY)
+    assert third == (0, 0, 0, 0)
+    assert sorted(s.location for s in iter_stored_configs(str(tmp_path))) == before
+
+
+def test_compaction_dry_run_changes_nothing(tmp_path) -> None:
+    """
+    Verifies dry-run reports the plan without touching the output directory.
+    """
+    storage = StorageConfig()
+    _populate(tmp_path, storage.layout)
+    before = sorted(p for p in tmp_path.rglob("*"))
+
+    result = compact_output_dir(str(tmp_path), storage, today=TODAY, dry_run=True)
+
+    assert result.archived > 0
+    assert sorted(p for p in tmp_path.rglob("*")) == before
@@ -6,40 +6,134 @@ Covers:
   - Triggers config collection
   - Handles dry-run mode
   - Logs errors on failure but continues
+  - Setup and writer errors fail single devices, not the run
+  - Returns and saves a RunReport
+  - Reuses another job's fetch through the job coordinator
 """
 
-from unittest.mock import ANY, MagicMock, patch
+from unittest.mock import patch
 
+import pytest
+
+from src.config.schema import (
+    AppConfig,
+    CollectorConfig,
+    CoordinatorConfig,
+    SSHConfig,
+)
+from src.models.inventory import Inventory
+from src.models.run_report import RunReport
 from src.services.ssh_collector import collect_device_configs
 
 
-@patch("src.services.ssh_collector.fetch_running_config")
-@patch("src.services.ssh_collector.write_config_to_file")
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch) -> None:
+    monkeypatch.setenv("SSH_USERNAME", "admin")
+    monkeypatch.setenv("SSH_PASSWORD", "secret")
+
+
+@patch("src.services.backends.SSHBackend.fetch_once")
 @patch("src.services.ssh_collector.load_config")
-@patch("src.services.ssh_collector.load_device_list")
+@patch("src.services.ssh_collector.load_inventory")
 def test_collect_device_configs_success(
-    mock_load_devices, mock_load_config, mock_write, mock_fetch
+    mock_load_devices, mock_load_config, mock_fetch, tmp_path
 ) -> None:
     """
     Verifies that configs are fetched and written when devices load successfully.
     """
-    mock_load_devices.return_value = [
-        MagicMock(hostname="router1"),
-        MagicMock(hostname="router2"),
-    ]
-    mock_load_config.return_value.output_dir = "/tmp"
-    mock_fetch.side_effect = ["conf1", "conf2"]
+    mock_load_devices.return_value = Inventory.from_entries(
+        [
+            {"hostname": "router1", "location": "DFW"},
+            {"hostname": "router2", "location": "NYC"},
+        ]
+    )
+    mock_load_config.return_value = AppConfig(
+        output_dir=str(tmp_path), report_dir=str(tmp_path / "reports"), ssh=SSHConfig()
+    )
+    mock_fetch.side_effect = lambda target: f"conf-{target}"
+
+    report = collect_device_configs("devices.yaml")
+
+    written = sorted(p.name for p in tmp_path.glob("*.cfg"))
+    assert len(written) == 2
+    assert written[0].startswith("router1_")
+    assert (tmp_path / written[0]).read_text() == "conf-router1"
+    assert (tmp_path / written[1]).read_text() == "conf-router2"
+    assert report.counts() == {"success": 2}
+    assert RunReport.load(str(tmp_path / "reports" / f"{report.run_id}.json.gz"))
+
+
+@patch("src.services.backends.SSHBackend.fetch_once")
+@patch("src.services.ssh_collector.load_config")
+@patch("src.services.ssh_collector.load_inventory")
+def test_collect_continues_after_failure(
+    mock_load_devices, mock_load_config, mock_fetch, tmp_path, caplog
+) -> None:
+    """
+    Verifies that one failing device is logged and the rest are still written.
+    """
+
+    def fetch(target: str) -> str:
+        if target == "bad":
+            raise OSError("unreachable")
+        return "ok"
+
+    mock_load_devices.return_value = Inventory.from_entries(
+        [{"hostname": "bad"}, {"hostname": "good"}]
+    )
+    mock_load_config.return_value = AppConfig(
+        output_dir=str(tmp_path),
+        report_dir=str(tmp_path / "reports"),
+        ssh=SSHConfig(),
+        collector=CollectorConfig(retry_wait_min=0, retry_wait_max=0),
+    )
+    mock_fetch.side_effect = fetch
+
+    report = collect_device_configs("devices.yaml")
+
+    assert [p.name.split("_")[0] for p in tmp_path.glob("*.cfg")] == ["good"]
+    assert "Failed to fetch config from bad" in caplog.text
+    assert report.failed_hosts() == ["bad"]
+    row = next(r for r in report.rows() if r["hostname"] == "bad")
+    assert row["error_class"] == "OSError"
+    assert row["attempts"] == 3
+    assert row["backend"] == "ssh"
+
+
+@patch("src.services.ssh_collector.ConfigWriter.submit")
+@patch("src.services.ssh_collector.load_config")
+@patch("src.services.ssh_collector.load_inventory")
+def test_device_errors_do_not_abort_the_run(
+    mock_load_devices, mock_load_config, mock_submit, tmp_path, monkeypatch
+) -> None:
+    """
+    Verifies missing credentials and a failing writer each become FAILED rows.
+    """
+    mock_load_devices.return_value = Inventory.from_entries(
+        [{"hostname": "r1"}, {"hostname": "r2"}]
+    )
+    mock_load_config.return_value = AppConfig(
+        output_dir=str(tmp_path), report_dir=str(tmp_path / "reports"), ssh=SSHConfig()
+    )
 
-    collect_device_configs("devices.yaml")
+    monkeypatch.delenv("SSH_PASSWORD")
+    report = collect_device_configs("devices.yaml")
+    assert report.column("error_class") == ["OSError", "OSError"]
+    assert report.column("attempts") == [0, 0]
 
-    assert mock_write.call_count == 2
-    mock_write.assert_any_call("router1", "conf1", ANY, "/tmp")
-    mock_write.assert_any_call("router2", "conf2", ANY, "/tmp")
+    monkeypatch.setenv("SSH_PASSWORD", "secret")
+    mock_submit.side_effect = RuntimeError("ConfigWriter thread failed")
+    with patch("src.services.backends.SSHBackend.fetch_once", return_value="cfg"):
+        report = collect_device_configs("devices.yaml")
+    assert sorted(report.failed_hosts()) == ["r1", "r2"]
+    assert report.column("error_class") == ["RuntimeError", "RuntimeError"]
 
 
-@patch("src.services.ssh_collector.load_device_list")
+@patch("src.services.ssh_collector.load_inventory")
 @patch("src.services.ssh_collector.load_config")
-def test_dry_run_skips_execution(mock_load_config, mock_load_devices, caplog) -> None:
+def test_dry_run_skips_execution(
+    mock_load_config, mock_load_devices, caplog, tmp_path
+) -> None:
     """
     Validates that dry-run mode logs the expected messages and skips SSH and file writes.
     """
@@ -47,13 +141,49 @@ def test_dry_run_skips_execution(mock_load_config, mock_load_devices, caplog) ->
 
     caplog.set_level(logging.INFO)
 
-    mock_load_devices.return_value = [
-        MagicMock(hostname="router1", ip="10.0.0.1"),
-        MagicMock(hostname="router2", ip="10.0.0.2"),
-    ]
-    mock_load_config.return_value.output_dir = "/dryrun"
+    mock_load_devices.return_value = Inventory.from_entries(
+        [
+            {"hostname": "router1", "ip": "10.0.0.1"},
+            {"hostname": "router2", "ip": "10.0.0.2"},
+        ]
+    )
+    mock_load_config.return_value = AppConfig(
+        output_dir="/dryrun", report_dir=str(tmp_path), ssh=SSHConfig()
+    )
 
-    collect_device_configs("devices.yaml", dry_run=True)
+    report = collect_device_configs("devices.yaml", dry_run=True)
 
     assert "Would connect to router1" in caplog.text
     assert "Would write config to /dryrun/router1" in caplog.text
+    assert report.counts() == {"skipped": 2}
+
+
+@patch("src.services.backends.SSHBackend.fetch_once")
+@patch("src.services.ssh_collector.load_config")
+@patch("src.services.ssh_collector.load_inventory")
+def test_coordinated_run_reuses_recent_fetch(
+    mock_load_devices, mock_load_config, mock_fetch, tmp_path
+) -> None:
+    """
+    Verifies that with the coordinator enabled, a run started within
+    `share_seconds` of another reuses its configs instead of reconnecting.
+    """
+    mock_load_devices.return_value = Inventory.from_entries([{"hostname": "r1"}])
+    mock_load_config.return_value = AppConfig(
+        output_dir=str(tmp_path),
+        report_dir=str(tmp_path / "reports"),
+        ssh=SSHConfig(),
+        coordinator=CoordinatorConfig(
+            enabled=True, path=str(tmp_path / "coordinator.sqlite3")
+        ),
+    )
+    mock_fetch.return_value = "hostname r1"
+
+    first = collect_device_configs("devices.yaml")
+    second = collect_device_configs("devices.yaml")
+
+    assert mock_fetch.call_count == 1
+    assert second.counts() == {"success": 1}
+    assert first.column("attempts") == [1]
+    assert second.column("attempts") == [0]
+    assert second.column("config_hash") == first.column("config_hash")
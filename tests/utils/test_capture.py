@@ -0,0 +1,62 @@
+"""
+Tests for the capture file utility.
+
+Covers:
+  - Writing and reading records (successes and failures) in start order
+  - Reading a capture cut short mid-record
+  - Rejecting files that are not captures
+"""
+
+import gzip
+
+import pytest
+
+from src.utils.capture import CaptureRecord, CaptureWriter, read_capture
+
+
+def _record(hostname: str, offset: float, **fields) -> CaptureRecord:
+    return CaptureRecord(hostname, None, "DFW", "ios", "ssh", 1, offset, 0.5, **fields)
+
+
+def test_capture_round_trip(tmp_path) -> None:
+    """
+    Verifies records come back intact and sorted by fetch start.
+    """
+    path = str(tmp_path / "run.capture.gz")
+    with CaptureWriter(path, {"run_id": "run_1"}) as capture:
+        capture.add(_record("r2", 0.2, text="hostname r2\n"))
+        capture.add(_record("r1", 0.1, error_class="OSError", error="unreachable"))
+
+    header, records = read_capture(path)
+    assert header["run_id"] == "run_1"
+    assert [r.hostname for r in records] == ["r1", "r2"]
+    assert records[0].text is None and records[0].error_class == "OSError"
+    assert records[1].text == "hostname r2\n"
+    assert capture.count == 2
+
+
+def test_truncated_capture_keeps_complete_records(tmp_path) -> None:
+    """
+    Verifies a capture cut short mid-record still yields the records before it.
+    """
+    path = tmp_path / "run.capture.gz"
+    with CaptureWriter(str(path), {}) as capture:
+        capture.add(_record("r1", 0.0, text="a" * 1000))
+        capture.add(_record("r2", 0.1, text="b" * 1000))
+    data = gzip.decompress(path.read_bytes())
+    path.write_bytes(gzip.compress(data[:-100])[:-8])
+
+    _, records = read_capture(str(path))
+    assert [r.hostname for r in records] == ["r1"]
+
+
+def test_read_capture_rejects_other_files(tmp_path) -> None:
+    """
+    Verifies non-capture files raise ValueError and missing ones FileNotFoundError.
+    """
+    path = tmp_path / "report.json.gz"
+    path.write_bytes(gzip.compress(b'{"run_id": "run_1"}\n'))
+    with pytest.raises(ValueError):
+        read_capture(str(path))
+    with pytest.raises(FileNotFoundError):
+        read_capture(str(tmp_path / "missing.gz"))
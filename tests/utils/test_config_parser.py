@@ -0,0 +1,115 @@
+"""
+Tests for config_parser.
+
+Covers:
+  - Indentation-based block tree construction
+  - Path queries across nested blocks
+  - Parse cache hits by config hash without reading the config
+  - Changed top-level sections between two configs
+"""
+
+import hashlib
+
+from src.utils.config_parser import (
+    changed_sections,
+    load_tree,
+    parse_config,
+    ParseCache,
+)
+
+CONFIG = """hostname r1
+!
+interface GigabitEthernet0/1
+ description uplink
+ ip address 10.0.0.1 255.255.255.0
+!
+interface GigabitEthernet0/2
+ shutdown
+!
+router bgp 65000
+ neighbor 10.0.0.2 remote-as 65001
+ address-family ipv4
+  neighbor 10.0.0.2 activate
+ exit-address-family
+"""
+
+
+def test_parse_builds_hierarchy() -> None:
+    """
+    Verifies parent/child structure and that separators are dropped.
+    """
+    tree = parse_config(CONFIG)
+
+    assert [n.text for n in tree.roots] == [
+        "hostname r1",
+        "interface GigabitEthernet0/1",
+        "interface GigabitEthernet0/2",
+        "router bgp 65000",
+    ]
+    bgp = tree.section(r"router bgp")
+    assert bgp is not None
+    assert [c.text for c in bgp.children] == [
+        "neighbor 10.0.0.2 remote-as 65001",
+        "address-family ipv4",
+        "exit-address-family",
+    ]
+    activate = tree.query(r"router bgp", r"address-family", r"neighbor")[0]
+    assert activate.path == [
+        "router bgp 65000",
+        "address-family ipv4",
+        "neighbor 10.0.0.2 activate",
+    ]
+    assert activate.depth == 2
+
+
+def test_query_filters_blocks_by_child() -> None:
+    """
+    Verifies path queries select children only under matching parents.
+    """
+    tree = parse_config(CONFIG)
+
+    shut = tree.query(r"interface ", r"shutdown$")
+    assert [n.parent.text for n in shut] == ["interface GigabitEthernet0/2"]
+    assert tree.query(r"interface ", r"description") == tree.roots[1].query(
+        r"description"
+    )
+    assert list(tree.roots[1].lines()) == [
+        "interface GigabitEthernet0/1",
+        " description uplink",
+        " ip address 10.0.0.1 255.255.255.0",
+    ]
+
+
+def test_load_tree_uses_cache_by_hash(tmp_path) -> None:
+    """
+    Verifies a cached tree is returned without reading the stored config.
+    """
+    cfg = tmp_path / "r1.cfg"
+    cfg.write_text(CONFIG)
+    digest = hashlib.sha256(CONFIG.encode()).hexdigest()
+    cache = ParseCache(str(tmp_path / "cache"))
+
+    first = load_tree(str(cfg), config_hash=digest, cache=cache)
+    cfg.unlink()
+    second = load_tree(str(cfg), config_hash=digest, cache=cache)
+
+    assert second.lines == first.lines
+    assert second.parents == first.parents
+    assert second.depths == first.depths
+
+
+def test_changed_sections() -> None:
+    """
+    Verifies modified, added, and removed top-level blocks are reported once each.
+    """
+    new = (
+        CONFIG.replace(" shutdown\n", " no shutdown\n").replace(
+            "hostname r1\n", "hostname r1\nntp server 10.0.0.9\n"
+        )
+    ).split("router bgp")[0]
+
+    assert changed_sections(parse_config(CONFIG), parse_config(new)) == [
+        "ntp server 10.0.0.9",
+        "interface GigabitEthernet0/2",
+        "router bgp 65000",
+    ]
@@ -0,0 +1,97 @@
+"""
+Tests for event_sinks.
+
+Covers:
+  - JSON Lines file sink appends one object per line
+  - Unix socket sink streams JSON lines to a listening receiver
+  - Webhook sink POSTs batches as JSON arrays; non-2xx raise HTTPStatusError
+"""
+
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from src.utils.event_sinks import JSONLinesSink, UnixSocketSink, WebhookSink
+from src.utils.http_utils import HTTPStatusError
+
+
+def test_jsonl_sink_appends(tmp_path) -> None:
+    """
+    Verifies batches are appended across sends and reopenings.
+    """
+    path = tmp_path / "events" / "events.jsonl"
+    sink = JSONLinesSink(str(path))
+    sink.send([{"hostname": "r1"}, {"hostname": "r2"}])
+    sink.close()
+    sink.send([{"hostname": "r3"}])
+    sink.close()
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["hostname"] for line in lines] == ["r1", "r2", "r3"]
+
+
+def test_unix_socket_sink(tmp_path) -> None:
+    """
+    Verifies events arrive as JSON lines and a missing receiver raises OSError.
+    """
+    path = str(tmp_path / "events.sock")
+    sink = UnixSocketSink(path, timeout=1)
+    with pytest.raises(OSError):
+        sink.send([{"hostname": "r0"}])
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+    received = []
+
+    def receive() -> None:
+        conn, _ = server.accept()
+        with conn, conn.makefile("rb") as reader:
+            received.extend(json.loads(line) for line in reader)
+
+    thread = threading.Thread(target=receive)
+    thread.start()
+    sink.send([{"hostname": "r1"}])
+    sink.send([{"hostname": "r2"}])
+    sink.close()
+    thread.join(5)
+    server.close()
+
+    assert [event["hostname"] for event in received] == ["r1", "r2"]
+
+
+def test_webhook_sink() -> None:
+    """
+    Verifies each batch is one POST with a JSON array body.
+    """
+    batches = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802 (http.server API)
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            if self.path == "/events":
+                batches.append(json.loads(body))
+                self.send_response(204)
+            else:
+                self.send_response(404)
+            self.end_headers()
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        WebhookSink(f"{base}/events").send([{"hostname": "r1"}, {"hostname": "r2"}])
+        with pytest.raises(HTTPStatusError) as info:
+            WebhookSink(f"{base}/missing").send([{"hostname": "r3"}])
+        assert info.value.status == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert batches == [[{"hostname": "r1"}, {"hostname": "r2"}]]
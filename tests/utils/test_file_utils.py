@@ -4,9 +4,32 @@ Tests for file_utils.
 Covers:
   - Successful config file creation
   - File content correctness
+  - Atomic replacement without leftover temp files
+  - ConfigWriter batching, error propagation, and tar/zip bundles
+  - Zip reads that do not trust an index of another archive version
+  - ConfigWriter failing fast when its thread dies, also for blocked producers
+  - Sharded layouts and discovery of stored configs
 """
 
-from src.utils.file_utils import write_config_to_file
+import json
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src.utils.file_utils import (
+    config_subdir,
+    ConfigWriter,
+    iter_stored_configs,
+    read_config,
+    replace_archive,
+    write_config_to_file,
+    write_index,
+    zip_index_entry,
+)
 
 
 def test_write_config_creates_expected_file(tmp_path) -> None:
@@ -24,3 +47,187 @@ def test_write_config_creates_expected_file(tmp_path) -> None:
 
     assert expected_file.exists()
     assert expected_file.read_text() == content
+
+
+def test_write_config_leaves_no_temp_files(tmp_path) -> None:
+    """
+    Verifies that overwriting a config is atomic and leaves no temporary files.
+    """
+    write_config_to_file("r1", "old", "20250518", output_dir=str(tmp_path))
+    write_config_to_file("r1", "new", "20250518", output_dir=str(tmp_path), fsync=True)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["r1_20250518.cfg"]
+    assert (tmp_path / "r1_20250518.cfg").read_text() == "new"
+
+
+def test_config_writer_writes_submitted_configs(tmp_path) -> None:
+    """
+    Verifies that ConfigWriter resolves futures to the written file paths.
+    """
+    with ConfigWriter(str(tmp_path), batch_size=2) as writer:
+        futures = [writer.submit(f"r{i}", f"cfg{i}", "20250518") for i in range(5)]
+
+    for i, future in enumerate(futures):
+        path = Path(future.result())
+        assert path == tmp_path / f"r{i}_20250518.cfg"
+        assert path.read_text() == f"cfg{i}"
+
+
+def test_config_writer_reports_write_errors(tmp_path) -> None:
+    """
+    Verifies that a failed write is surfaced on the future, not swallowed.
+    """
+    (tmp_path / "r1_20250518.cfg").mkdir()  # rename onto a directory fails
+
+    with ConfigWriter(str(tmp_path)) as writer:
+        future = writer.submit("r1", "cfg", "20250518")
+
+    with pytest.raises(OSError):
+        future.result()
+
+
+@pytest.mark.parametrize("bundle", ["tar", "zip"])
+def test_config_writer_bundles_run_with_index(tmp_path, bundle) -> None:
+    """
+    Verifies that bundle mode writes one archive plus an offset index, and that
+    member locations resolve only once the archive is in place.
+    """
+    with ConfigWriter(str(tmp_path), bundle=bundle, run_name="run1") as writer:
+        first = writer.submit("r1", "hostname r1", "20250518")
+        writer.submit("r2", "hostname r2", "20250518")
+        time.sleep(0.05)
+        assert not first.done()  # the archive is not in place yet
+
+    archive = tmp_path / f"run1.{bundle}"
+    assert first.result() == f"{archive}#r1_20250518.cfg"
+    assert not list(tmp_path.glob("*.cfg"))
+
+    index = json.loads((tmp_path / f"run1.{bundle}.index.json").read_text())
+    assert set(index["members"]) == {"r1_20250518.cfg", "r2_20250518.cfg"}
+
+    if bundle == "tar":
+        entry = index["members"]["r2_20250518.cfg"]
+        with archive.open("rb") as f:
+            f.seek(entry["offset"])
+            assert f.read(entry["size"]) == b"hostname r2"
+    else:
+        with zipfile.ZipFile(archive) as zf:
+            assert zf.read("r2_20250518.cfg") == b"hostname r2"
+
+
+def test_read_config_ignores_index_of_other_archive_version(tmp_path) -> None:
+    """
+    Verifies that a zip member is never read through an index written for a
+    different version of the archive, and that replace_archive() swaps both.
+    """
+
+    def build(path, names):
+        index = {}
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for name in names:
+                zf.writestr(name, f"config {name}")
+                index[name] = zip_index_entry(zf.getinfo(name))
+        return index
+
+    archive = tmp_path / "2025-01.zip"
+    write_index(archive, "zip", build(archive, ["a_1.cfg", "b_1.cfg"]), False)
+    build(archive, ["b_1.cfg"])  # rewritten in place, old index left behind
+
+    assert read_config(f"{archive}#b_1.cfg") == "config b_1.cfg"
+    with pytest.raises(KeyError):
+        read_config(f"{archive}#a_1.cfg")
+
+    tmp = tmp_path / ".2025-01.zip.tmp"
+    replace_archive(tmp, archive, "zip", build(tmp, ["c_1.cfg"]), False)
+    index = json.loads((tmp_path / "2025-01.zip.index.json").read_text())
+    assert list(index["members"]) == ["c_1.cfg"]
+    assert read_config(f"{archive}#c_1.cfg") == "config c_1.cfg"
+
+
+@pytest.mark.parametrize("layout", ["date", "host"])
+def test_config_writer_shards_by_layout(tmp_path, layout) -> None:
+    """
+    Verifies sharded layouts place configs in subdirectories that
+    iter_stored_configs() discovers.
+    """
+    with ConfigWriter(str(tmp_path), fsync=False, layout=layout) as writer:
+        futures = [writer.submit(h, f"{h} cfg", "20250518") for h in ("r1", "r2")]
+    paths = [Path(f.result()) for f in futures]
+
+    for hostname, path in zip(("r1", "r2"), paths):
+        assert path.parent == tmp_path / config_subdir(hostname, "20250518", layout)
+    assert config_subdir("r1", "20250518", "date") == "2025/05/18"
+
+    stored = sorted(iter_stored_configs(str(tmp_path)))
+    assert [(s.hostname, s.date_stamp) for s in stored] == [
+        ("r1", "20250518"),
+        ("r2", "20250518"),
+    ]
+    assert read_config(stored[0].location) == "r1 cfg"
+
+
+def test_config_writer_fails_fast_when_thread_dies(tmp_path, monkeypatch) -> None:
+    """
+    Verifies that a dead writer thread fails pending futures and later submits
+    instead of blocking on a full queue.
+    """
+    gate = threading.Event()
+
+    def broken_batch(self, batch) -> None:
+        gate.wait()
+        raise MemoryError("writer bug")
+
+    monkeypatch.setattr(ConfigWriter, "_write_batch", broken_batch)
+    writer = ConfigWriter(str(tmp_path), batch_size=1, queue_size=1)
+    first = writer.submit("r1", "cfg", "20250518")
+    queued = writer.submit("r2", "cfg", "20250518")
+    gate.set()
+
+    with pytest.raises(MemoryError):
+        first.result(timeout=5)
+    with pytest.raises(MemoryError):
+        queued.result(timeout=5)
+    with pytest.raises(RuntimeError):
+        writer.submit("r3", "cfg", "20250518")
+    with pytest.raises(RuntimeError):
+        writer.close()
+
+
+def test_config_writer_unblocks_waiting_producer_on_failure(
+    tmp_path, monkeypatch
+) -> None:
+    """
+    Verifies that a producer already blocked on a full queue gets RuntimeError
+    when the writer thread dies, instead of deadlocking.
+    """
+    gate = threading.Event()
+
+    def broken_batch(self, batch) -> None:
+        gate.wait()
+        raise MemoryError("writer bug")
+
+    monkeypatch.setattr(ConfigWriter, "_write_batch", broken_batch)
+    writer = ConfigWriter(str(tmp_path), batch_size=1, queue_size=1)
+    writer.submit("r1", "cfg", "20250518")  # taken by the writer thread
+    queued = writer.submit("r2", "cfg", "20250518")  # fills the queue
+    outcome: List[BaseException] = []
+
+    def produce() -> None:
+        try:
+            writer.submit("r3", "cfg", "20250518")
+        except BaseException as exc:
+            outcome.append(exc)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    time.sleep(0.05)
+    assert producer.is_alive()  # blocked in submit()
+    gate.set()
+    producer.join(timeout=5)
+
+    assert not producer.is_alive()
+    assert isinstance(outcome[0], RuntimeError)
+    with pytest.raises(MemoryError):
+        queued.result(timeout=5)
+    with pytest.raises(RuntimeError):
+        writer.close()
@@ -0,0 +1,39 @@
+"""
+Tests for http_utils.
+
+Covers:
+  - URL construction (including IPv6 literals)
+  - Authenticated GET against a stand-in server
+  - Non-2xx responses raise HTTPStatusError with the status
+"""
+
+import pytest
+
+from src.utils.http_utils import build_url, get_config, HTTPStatusError
+from src.utils.standin_servers import StandinHTTPServer
+
+
+def test_build_url_brackets_ipv6() -> None:
+    """
+    Verifies IPv6 literals are bracketed and default ports are omitted.
+    """
+    assert (
+        build_url("2001:db8::1", "https", 8443, "/x") == "https://[2001:db8::1]:8443/x"
+    )
+    assert build_url("r1", path="/restconf/data") == "https://r1/restconf/data"
+
+
+def test_get_config_with_basic_auth() -> None:
+    """
+    Verifies the body is returned for valid credentials and 401/404 raise.
+    """
+    with StandinHTTPServer({"/restconf/data": '{"ok": true}'}) as server:
+        url = build_url("127.0.0.1", "http", server.port, "/restconf/data")
+
+        assert get_config(url, username="admin", password="admin") == '{"ok": true}'
+        with pytest.raises(HTTPStatusError) as info:
+            get_config(url, username="admin", password="bad")
+        assert info.value.status == 401
+        with pytest.raises(HTTPStatusError) as info:
+            get_config(url + "/missing", username="admin", password="admin")
+        assert info.value.status == 404
@@ -0,0 +1,67 @@
+"""
+Tests for netconf_utils.
+
+Covers:
+  - base:1.0 and base:1.1 message framing
+  - <rpc-error> replies raise NetconfError
+"""
+
+import pytest
+
+from src.utils.netconf_utils import NetconfError, NetconfSession
+
+
+class _Channel:
+    """
+    In-memory channel that returns scripted bytes in small pieces.
+    """
+
+    def __init__(self, incoming: bytes) -> None:
+        self.incoming = incoming
+        self.sent = b""
+
+    def recv(self, size: int) -> bytes:
+        data, self.incoming = self.incoming[:7], self.incoming[7:]
+        return data
+
+    def sendall(self, data: bytes) -> None:
+        self.sent += data
+
+
+def test_end_of_message_framing() -> None:
+    """
+    Verifies base:1.0 messages are split on the ]]>]]> delimiter.
+    """
+    session = NetconfSession(_Channel(b"<a/>]]>]]><b/>]]>]]>"))
+    session.send("<hello/>")
+
+    assert session.read() == "<a/>"
+    assert session.read() == "<b/>"
+    assert session.channel.sent == b"<hello/>]]>]]>"
+
+
+def test_chunked_framing() -> None:
+    """
+    Verifies base:1.1 messages are reassembled from multiple chunks.
+    """
+    session = NetconfSession(_Channel(b"\n#4\n<rpc\n#8\n-reply/>\n##\n"))
+    session.chunked = True
+    session.send("<x/>")
+
+    assert session.read() == "<rpc-reply/>"
+    assert session.channel.sent == b"\n#4\n<x/>\n##\n"
+
+
+def test_rpc_error_raises() -> None:
+    """
+    Verifies an <rpc-error> reply raises with the device's error message.
+    """
+    reply = (
+        b'<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">'
+        b"<rpc-error><error-message>access denied</error-message></rpc-error>"
+        b"</rpc-reply>]]>]]>"
+    )
+    session = NetconfSession(_Channel(reply))
+
+    with pytest.raises(NetconfError, match="access denied"):
+        session.rpc("<get-config/>", 1)
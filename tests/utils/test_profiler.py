@@ -0,0 +1,83 @@
+"""
+Tests for the profiler utility.
+
+Covers:
+  - Thread group names strip pool indexes
+  - Sample and trace runs write pstats, per-thread files, and collapsed stacks
+  - Comparing two profiles ranks functions by change in self time
+"""
+
+import pstats
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.utils.profiler import compare_profiles, RunProfiler, thread_group
+
+
+def _busy(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+def _workload(seconds: float) -> None:
+    with ThreadPoolExecutor(2, thread_name_prefix="collector") as pool:
+        list(pool.map(_busy, [seconds, seconds]))
+
+
+def test_thread_group() -> None:
+    """
+    Verifies pool indexes are stripped and unnamed threads use their target.
+    """
+    assert thread_group(threading.Thread(name="collector_12")) == "collector"
+    assert thread_group(threading.Thread(name="config-writer")) == "config-writer"
+    assert thread_group(threading.Thread(target=_busy)) == "_busy"
+
+
+@pytest.mark.parametrize("mode", ["sample", "trace"])
+def test_profile_attributes_worker_threads(mode, tmp_path) -> None:
+    """
+    Verifies the busy function is attributed to the collector thread group.
+    """
+    with RunProfiler(mode, interval=0.002) as profiler:
+        _workload(0.2)
+    directory = profiler.save(tmp_path / "run.profile")
+
+    assert (directory / "profile.json").is_file()
+    assert profiler.sampler.groups()["collector"] > 0
+    collapsed = (directory / "stacks.collapsed").read_text().splitlines()
+    assert any(
+        line.startswith("collector;") and "test_profiler.py:_busy" in line
+        for line in collapsed
+    )
+
+    worker = pstats.Stats(str(directory / "thread-collector.pstats")).stats
+    busy = [v for k, v in worker.items() if k[2] == "_busy"]
+    assert busy and busy[0][3] > 0.1
+    overall = pstats.Stats(str(directory / "all.pstats")).stats
+    assert any(k[2] == "_busy" for k in overall)
+
+
+def test_compare_profiles(tmp_path) -> None:
+    """
+    Verifies rows are ranked by change in self time and the slowed-down function
+    shows the increase (other threads alive in the process are sampled too).
+    """
+    with RunProfiler("sample", interval=0.002) as before:
+        _workload(0.05)
+    with RunProfiler("sample", interval=0.002) as after:
+        _workload(0.3)
+    before.save(tmp_path / "before")
+    after.save(tmp_path / "after")
+
+    rows = compare_profiles(str(tmp_path / "before"), str(tmp_path / "after"), 1000)
+    deltas = [abs(row.delta_s) for row in rows]
+    assert deltas == sorted(deltas, reverse=True)
+    busy = next(row for row in rows if row.function.endswith("test_profiler.py:_busy"))
+    assert busy.delta_s > 0.2
+    assert busy.after.self_s > busy.before.self_s